@@ -0,0 +1,130 @@
+"""증분 지표(IndicatorBook)와 배치 계산(get_stock_data / pandas rolling) 일치 확인 (오프라인 픽스처)
+
+배치 초기화 직후에는 get_stock_data 결과와, 마지막 STEPS개 봉을 하나씩 붙이는 동안에는
+봉마다 같은 구간의 pandas 계산과 비교한다 (봉마다 장중 값을 먼저 넣고 확정 값으로 교체).
+값은 상대 오차 RTOL 이내여야 하고, 화면 기준값(하락률 구간 / 물타기 1단계 / 이동평균 위아래 /
+RSI 표시값)의 어느 쪽인지가 하나라도 달라지면 종료 코드 1.
+
+    python -m bench.check --sizes 10 100
+"""
+import argparse, datetime, math, sys
+
+import pandas as pd
+
+from bench import fixtures, stubs
+from bench.run import universe
+
+# 증분 / 배치 값 허용 오차 (상대, 합산 순서 차이 수준)
+RTOL = 1e-9
+
+# 증분 반영으로 확인하는 마지막 봉 수
+STEPS = 20
+
+# 하락률 구간 경계 (US Stocks 표 색 구간, %)
+DD_LEVELS = (-5.0, -10.0, -15.0)
+
+FIELDS = ("close", "high_window", "drawdown_pct", "rsi", "ma5", "ma20")
+
+def _nan(x) -> bool:
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+def batch(df: pd.DataFrame, now: datetime.datetime) -> dict:
+    """get_stock_data와 같은 pandas 계산 (종가 / 90일 고가 / 하락률 / RSI / 이동평균)"""
+    from fearindex import sources
+    close = df["Close"].astype(float)
+    high = df["High"].astype(float)[df.index >= pd.Timestamp(now - datetime.timedelta(days=90))].max()
+    ma5, ma20 = sources.ma_daily(df)
+    return {"close": close.iloc[-1], "high_window": high, "drawdown_pct": (close.iloc[-1] - high) / high * 100,
+            "rsi": sources.calculate_rsi(close, 14).iloc[-1], "ma5": ma5, "ma20": ma20}
+
+def reference(ticker: str, df: pd.DataFrame) -> dict | None:
+    """get_stock_data 결과 (+ 같은 구간 이동평균)"""
+    from fearindex import sources
+    d = sources.get_stock_data(ticker)
+    if d is None:
+        return None
+    ma5, ma20 = sources.ma_daily(df)
+    return {"close": d["current_price"], "high_window": d["ath_90d"], "drawdown_pct": d["drawdown"],
+            "rsi": d["rsi"], "ma5": ma5, "ma20": ma20}
+
+def compare(where: str, inc: dict, ref: dict, step1: float | None, worst: dict) -> list[str]:
+    """값 / 기준값 판정 비교 -> 문제 목록 (worst에 필드별 최대 상대 오차 누적)"""
+    problems = []
+    for k in FIELDS:
+        a, b = inc[k], ref[k]
+        if _nan(a) or _nan(b):
+            if _nan(a) != _nan(b):
+                problems.append(f"{where} {k}: {a!r} != {b!r}")
+            continue
+        rel = abs(a - b) / abs(b) if b else abs(a)
+        worst[k] = max(worst.get(k, 0.0), rel)
+        if rel > RTOL:
+            problems.append(f"{where} {k}: {a!r} != {b!r} (상대 오차 {rel:.1e})")
+    dd_a, dd_b = inc["drawdown_pct"], ref["drawdown_pct"]
+    for level in DD_LEVELS + ((step1,) if step1 is not None else ()):
+        if (dd_a <= level) != (dd_b <= level):
+            problems.append(f"{where} 하락률 {level:g}% 기준 판정 다름 ({dd_a!r} / {dd_b!r})")
+    for k in ("ma5", "ma20"):
+        if not (_nan(inc[k]) or _nan(ref[k])) and (inc["close"] >= inc[k]) != (ref["close"] >= ref[k]):
+            problems.append(f"{where} 종가-{k} 위아래 판정 다름")
+    if not (_nan(inc["rsi"]) or _nan(ref["rsi"])) and f"{inc['rsi']:.0f}" != f"{ref['rsi']:.0f}":
+        problems.append(f"{where} RSI 표시값 다름 ({inc['rsi']!r} / {ref['rsi']!r})")
+    return problems
+
+def check(n: int) -> tuple[dict, dict, list[str]]:
+    """n개 티커 -> (배치 직후 최대 오차, 증분 반영 최대 오차, 문제 목록)"""
+    from fearindex import config, indicators, precompute
+    now = datetime.datetime.now()
+    start = pd.Timestamp((now - datetime.timedelta(days=120)).date())
+    tickers = universe(n)
+    step1 = config.load().step1
+    bars = {t: fixtures.bars("yahoo", t) for t in tickers}
+    bars = {t: df[df.index >= start] for t, df in bars.items()}
+    problems: list[str] = []
+
+    # 배치 초기화 직후 (get_stocks_data 경로) ↔ get_stock_data
+    built: dict = {}
+    book = indicators.IndicatorBook(rsi_period=14, high_days=90)
+    for t, state in book.sync_many(bars, precompute.init_states).items():
+        ref = reference(t, bars[t])
+        if ref is None:
+            problems.append(f"batch {t}: get_stock_data 결과 없음")
+            continue
+        problems += compare(f"batch {t}", state.values(now), ref, step1.get(t), built)
+
+    # 마지막 STEPS개 봉을 빼고 초기화한 뒤 한 봉씩 반영
+    appended: dict = {}
+    book = indicators.IndicatorBook(rsi_period=14, high_days=90)
+    book.sync_many({t: df.iloc[:-STEPS] for t, df in bars.items()}, precompute.init_states)
+    for k in range(STEPS - 1, -1, -1):
+        for t, df in bars.items():
+            cur = df.iloc[:len(df) - k]
+            intraday = cur.copy()
+            intraday.iloc[-1, intraday.columns.get_loc("Close")] *= 1.01
+            book.sync(t, intraday)
+            state = book.sync(t, cur)
+            when = (cur.index[-1] + pd.Timedelta(hours=16)).to_pydatetime()
+            problems += compare(f"append {t} {cur.index[-1]:%Y-%m-%d}", state.values(when), batch(cur, when),
+                                step1.get(t), appended)
+    return built, appended, problems
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.check", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100])
+    args = parser.parse_args(argv)
+
+    failed = False
+    with stubs.offline():
+        for n in args.sizes:
+            built, appended, problems = check(n)
+            for phase, worst in (("batch", built), ("append", appended)):
+                print(f"{n:>5} {phase:<6} " + "  ".join(f"{k} {worst.get(k, 0.0):.1e}" for k in FIELDS), flush=True)
+            for p in problems[:20]:
+                print(f"      ! {p}")
+            if len(problems) > 20:
+                print(f"      ! ... 외 {len(problems) - 20}건")
+            failed |= bool(problems)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
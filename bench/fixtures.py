@@ -0,0 +1,118 @@
+"""벤치마크용 오프라인 픽스처 (Yahoo / KRX 일봉, feargreedmeter HTML·JSON)
+
+기본 세트(설정 파일의 지수 / ETF / 종목 + FGI 페이지)는 bench/fixtures/ 아래에 기록한 실제 응답을 쓴다.
+bench.run은 기본 세트가 기록돼 있지 않으면 --synthetic 없이는 실행하지 않는다.
+규모 측정용 추가 티커(B0000 ...)와 --synthetic 실행은 티커 이름으로 시드를 고정한
+합성 일봉을 만든다 (실행마다 같은 값).
+
+    python -m bench.fixtures record               # 기본 세트 기록 (네트워크 필요)
+    python -m bench.fixtures record QQQM 379810   # 지정 티커만
+"""
+import argparse, functools, json, pathlib, zlib
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+# 합성 일봉 길이 (영업일)
+SYNTHETIC_DAYS = 1500
+
+def _path(kind: str, name: str) -> pathlib.Path:
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+    return FIXTURE_DIR / kind / f"{safe}.parquet"
+
+@functools.lru_cache(maxsize=8)
+def _bdays(end: pd.Timestamp, days: int) -> pd.DatetimeIndex:
+    return pd.bdate_range(end=end, periods=days)
+
+def synthetic_bars(ticker: str, days: int = SYNTHETIC_DAYS, price: float = 100.0,
+                   end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """티커별 고정 시드 일봉 (OHLCV, 오늘까지 영업일)"""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    idx = _bdays(end or pd.Timestamp.today().normalize(), days)
+    close = price * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+    spread = np.abs(rng.normal(0, 0.01, days))
+    return pd.DataFrame({
+        "Open": close * (1 - spread / 2), "High": close * (1 + spread), "Low": close * (1 - spread),
+        "Close": close, "Adj Close": close, "Volume": rng.integers(100_000, 5_000_000, days),
+    }, index=idx)
+
+@functools.lru_cache(maxsize=None)
+def bars(kind: str, ticker: str) -> pd.DataFrame:
+    """기록된 일봉(kind: yahoo / krx) 또는 합성 일봉 (같은 프레임을 재사용하므로 수정하지 말 것)"""
+    p = _path(kind, ticker)
+    if p.exists():
+        return pd.read_parquet(p)
+    return synthetic_bars(ticker, price=10_000.0 if kind == "krx" else 100.0)
+
+def fgi_page() -> str:
+    """feargreedmeter 페이지 HTML (buildId 포함)"""
+    p = FIXTURE_DIR / "fgi" / "page.html"
+    if p.exists():
+        return p.read_text()
+    return '<html><script id="__NEXT_DATA__">{"buildId":"bench-build"}</script></html>'
+
+@functools.lru_cache(maxsize=1)
+def fgi_json() -> bytes:
+    """Next.js 데이터 JSON (fgiData.fgi 일별 목록)"""
+    p = FIXTURE_DIR / "fgi" / "data.json"
+    if p.exists():
+        return p.read_bytes()
+    rng = np.random.default_rng(7)
+    days = _bdays(pd.Timestamp.today().normalize(), SYNTHETIC_DAYS)
+    values = np.clip(50 + np.cumsum(rng.normal(0, 4, len(days))) % 100, 0, 100).astype(int)
+    rows = [{"date": f"{d:%Y-%m-%d}T00:00:00", "now": int(v)} for d, v in zip(days, values)]
+    return json.dumps({"pageProps": {"data": {"fgiData": {"fgi": rows}}}}).encode()
+
+def default_set() -> list[str]:
+    """기본 기록 대상 (설정 파일의 지수 / ETF / 종목)"""
+    from fearindex import config
+    cfg = config.load()
+    return [cfg.qqq, cfg.vix, *(code for code, _ in cfg.etfs), *cfg.tickers]
+
+def _kind(ticker: str) -> str:
+    """6자리 숫자는 KRX, 그 외 Yahoo"""
+    return "krx" if ticker.isdigit() else "yahoo"
+
+def missing(tickers: list[str] | None = None) -> list[pathlib.Path]:
+    """기록되지 않은 픽스처 파일 (기본: 기본 세트 + FGI 페이지)"""
+    paths = [_path(_kind(t), t) for t in (tickers or default_set())]
+    paths += [FIXTURE_DIR / "fgi" / "page.html", FIXTURE_DIR / "fgi" / "data.json"]
+    return [p for p in paths if not p.exists()]
+
+def record(tickers: list[str] | None = None, start: str = "2018-01-01") -> None:
+    """실제 응답을 bench/fixtures/에 기록 (기본: 기본 세트)"""
+    import FinanceDataReader as fdr
+    import yfinance as yf
+    from fearindex import http_client, sources
+
+    for t in tickers or default_set():
+        kind = _kind(t)
+        if kind == "krx":
+            df = fdr.DataReader(t, start=start)
+        else:
+            df = sources._flatten_columns(yf.download(tickers=t, start=start, interval="1d", progress=False,
+                                                      threads=False, auto_adjust=False), t)
+        p = _path(kind, t)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(p)
+        print(kind, t, len(df))
+
+    (FIXTURE_DIR / "fgi").mkdir(parents=True, exist_ok=True)
+    page = http_client.request(sources.ROOT + sources.PATH, headers=sources.UA).text
+    (FIXTURE_DIR / "fgi" / "page.html").write_text(page)
+    (FIXTURE_DIR / "fgi" / "data.json").write_bytes(sources._fetch_fgi_json(sources._get_build_id()))
+    print("fgi", len(page))
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.fixtures", description="벤치마크 픽스처 기록")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("record")
+    r.add_argument("tickers", nargs="*", help="기본: 설정 파일의 지수 / ETF / 종목")
+    r.add_argument("--start", default="2018-01-01")
+    args = parser.parse_args(argv)
+    record(args.tickers, args.start)
+
+if __name__ == "__main__":
+    main()
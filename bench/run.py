@@ -0,0 +1,295 @@
+"""오프라인 벤치마크 (조회 함수 / FGI 파싱 / 지표 계산 / 표 렌더링 / 페이지 빌드)
+
+모든 업스트림 호출은 bench.stubs 대역이 픽스처로 응답한다 (기본 세트는 기록된 실제 응답, bench.fixtures 참고).
+cold는 캐시(일봉 Parquet, 시계열 DB, 지표 상태, 표 HTML, 조건부 요청 검증자)를 비운 직후,
+warm은 같은 호출을 바로 한 번 더 한 경우다. 결과는 JSON으로 저장해 버전 간 비교한다.
+
+    python -m bench.run --sizes 10 100 1000 --out bench/results/local.json
+    python -m bench.run --compare bench/results/base.json --fail-over 1.25
+    python -m bench.run --only workers --sizes 500
+"""
+import argparse, datetime, json, os, pathlib, platform, statistics, subprocess, sys, tempfile, time, tracemalloc
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from bench import fixtures, stubs
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "bench" / "results"
+SIZES = (10, 100, 1000)
+KINDS = ("fetch", "decode", "indicators", "render", "backtest", "memory", "page", "workers")
+# 작업 프로세스 수별 지표 초기화는 풀 생성이 느려 요청할 때만 (--only workers)
+DEFAULT_KINDS = tuple(k for k in KINDS if k != "workers")
+WORKERS = (1, 2, 4, 8)
+
+def universe(n: int) -> tuple[str, ...]:
+    """설정 파일 종목 + 합성 티커로 n개"""
+    from fearindex import config
+    base = list(config.load().tickers)
+    return tuple((base + [f"B{i:04d}" for i in range(max(0, n - len(base)))])[:n])
+
+class ColdState:
+    """캐시/상태 초기화 (cold 실행마다 새 임시 경로)"""
+
+    def __init__(self, tmp: pathlib.Path):
+        self.tmp, self.n = tmp, 0
+
+    def reset(self) -> None:
+        from fearindex import bar_cache, http_client, indicators, sources, tables, timeseries
+        self.n += 1
+        bar_cache.CACHE_DIR = self.tmp / f"bars-{self.n}"
+        timeseries._store = timeseries.TimeSeriesStore(self.tmp / f"ts-{self.n}.db")
+        sources._build_id = None
+        sources._STOCK_BOOK = indicators.IndicatorBook(rsi_period=14, high_days=90)
+        http_client._validators.clear()
+        tables._cache.clear()
+
+def _measure(fn: Callable[[], object], setup: Callable[[], None] | None, repeat: int,
+             calls: stubs.Calls | None = None) -> dict:
+    """repeat회 실행 시간 + 마지막 1회 tracemalloc 최대 할당량 / 업스트림 호출 수"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    if setup:
+        setup()
+    before = sum(calls.counts.values()) if calls else 0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    upstream = sum(calls.counts.values()) - before if calls else 0
+    return {"median_s": statistics.median(times), "min_s": min(times), "runs": repeat,
+            "peak_bytes": peak, "upstream_calls": upstream}
+
+def _record(out: list, kind: str, name: str, size: int | None, phase: str, m: dict) -> None:
+    out.append({"kind": kind, "name": name, "size": size, "phase": phase, **m})
+    print(f"{kind:<10} {name:<22} {str(size or ''):>5} {phase:<5} {m['median_s'] * 1000:10.1f} ms "
+          f"{m['peak_bytes'] / 2**20:8.1f} MiB {m['upstream_calls']:5d} calls", flush=True)
+
+def bench_fetch(out, cold: ColdState, calls, sizes, repeat) -> None:
+    from fearindex import sources
+    cases = [
+        ("fetch_fgi_history", None, sources.fetch_fgi_history),
+        ("fetch_history", None, lambda: sources.fetch_history("QQQM")),
+        ("fetch_etf_data", None, lambda: sources.fetch_etf_data("379810", n=20)),
+    ] + [("fetch_stocks", n, (lambda t: lambda: sources.fetch_stocks(t))(universe(n))) for n in sizes]
+    for name, size, fn in cases:
+        _record(out, "fetch", name, size, "cold", _measure(fn, cold.reset, repeat, calls))
+        _record(out, "fetch", name, size, "warm", _measure(fn, None, repeat, calls))
+
+def _decode_legacy(body: bytes) -> pd.DataFrame:
+    """이전 FGI 파싱 경로 (전체 JSON -> 행마다 dict -> 문자열 날짜 정렬)"""
+    rows = json.loads(body)["pageProps"]["data"]["fgiData"]["fgi"]
+    out = [{"날짜": str(r["date"])[:10], "FGI": int(r["now"])} for r in rows if isinstance(r.get("now"), (int, float))]
+    return pd.DataFrame(out).sort_values("날짜")
+
+def bench_decode(out, cold: ColdState, calls, sizes, repeat) -> None:
+    """FGI 데이터 JSON 전체 히스토리 파싱 (이전 경로 대비)"""
+    from bench import fixtures
+    from fearindex import fgi
+    body = fixtures.fgi_json()
+    days, _ = fgi.decode(body)
+    print(f"{'':<10} fgi {len(days)} rows, {len(body) / 2**10:,.1f} KiB body", flush=True)
+    _record(out, "decode", "fgi_legacy", None, "warm", _measure(lambda: _decode_legacy(body), None, repeat))
+    _record(out, "decode", "fgi_decode", None, "warm", _measure(lambda: fgi.decode(body), None, repeat))
+
+def bench_indicators(out, cold: ColdState, calls, sizes, repeat) -> None:
+    from bench import fixtures
+    from fearindex import indicators, precompute, sources
+    for n in sizes:
+        bars = {t: fixtures.bars("yahoo", t).iloc[-90:] for t in universe(n)}
+        book = indicators.IndicatorBook(rsi_period=14, high_days=90)
+
+        def seed():
+            book._states.clear()
+        _record(out, "indicators", "sync_many", n, "cold",
+                _measure(lambda: book.sync_many(bars, precompute.init_states), seed, repeat))
+        # 새 봉 1개 추가 후 증분 반영
+        book.sync_many(bars, precompute.init_states)
+        nxt = {t: pd.concat([df, df.iloc[[-1]].set_axis([df.index[-1] + pd.Timedelta(days=1)])]) for t, df in bars.items()}
+        _record(out, "indicators", "sync_many", n, "warm",
+                _measure(lambda: book.sync_many(nxt, precompute.init_states), None, repeat))
+
+    hist = fixtures.bars("yahoo", "QQQM")
+    for name, fn in [("last20_daily", sources.last20_daily), ("last20_vix", sources.last20_vix),
+                     ("ma_daily", sources.ma_daily)]:
+        _record(out, "indicators", name, None, "warm", _measure(lambda: fn(hist), None, repeat))
+
+def bench_workers(out, cold: ColdState, calls, sizes, repeat) -> None:
+    """지표 상태 배치 초기화 (precompute.init_states): 작업 프로세스 수별, cold는 풀 생성 포함 (1은 현재 프로세스)"""
+    from bench import fixtures
+    from fearindex import precompute
+    kwargs = {"rsi_period": 14, "high_days": 90}
+
+    def new_pool():
+        if precompute._pool is not None:
+            precompute._pool.shutdown()
+            precompute._pool = None
+    saved = precompute.WORKERS, precompute.PARALLEL_MIN
+    try:
+        for n in sizes:
+            bars = {t: fixtures.bars("yahoo", t).iloc[-90:] for t in universe(n)}
+            for w in WORKERS:
+                precompute.WORKERS, precompute.PARALLEL_MIN = w, 0
+                fn = lambda: precompute.init_states(bars, kwargs)
+                _record(out, "workers", f"init_states_w{w}", n, "cold", _measure(fn, new_pool, 1))
+                _record(out, "workers", f"init_states_w{w}", n, "warm", _measure(fn, None, repeat))
+    finally:
+        new_pool()
+        precompute.WORKERS, precompute.PARALLEL_MIN = saved
+
+def bench_render(out, cold: ColdState, calls, sizes, repeat) -> None:
+    from fearindex import cells, tables
+    cols = ["티커", "NOW", "ATH", "DD", "STEP1", "RSI"]
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        tickers = universe(n)
+        df = pd.DataFrame({"ticker": tickers, "current_price": rng.uniform(10, 500, n),
+                           "ath_90d": rng.uniform(10, 600, n), "drawdown": rng.uniform(-40, 0, n),
+                           "rsi": rng.uniform(10, 90, n)})
+        rules = {t: ("-10%", "-15%") for t in tickers}
+        fn = lambda: tables.cached_table("US Stocks", cols, df, cells.stock_cells, rules)
+        _record(out, "render", "stock_table", n, "cold", _measure(fn, tables._cache.clear, repeat))
+        _record(out, "render", "stock_table", n, "warm", _measure(fn, None, repeat))
+
+def bench_backtest(out, cold: ColdState, calls, sizes, repeat) -> None:
+    from bench import fixtures
+    from fearindex import backtest
+    pairs = backtest.default_grid()
+    for n in sizes:
+        bars = {t: fixtures.bars("yahoo", t).iloc[-1250:] for t in universe(n)}
+        _record(out, "backtest", "sweep", n, "warm", _measure(lambda: backtest.sweep(bars, pairs), None, repeat))
+
+def bench_memory(out, cold: ColdState, calls, sizes, repeat) -> None:
+    """모든 탭 작업을 선조회한 뒤 스냅샷 항목 메모리 / 직렬화 크기 / 프로세스 상주 메모리"""
+    from fearindex import compact, config, jobs, prefetch
+    base = config.load()
+    for n in sizes:
+        cold.reset()
+        cfg = config.Config(base.qqq, base.vix, base.etfs, {t: ("-10%", "-15%") for t in universe(n)})
+        p = prefetch.Prefetcher()
+        keys = jobs.register_all(p, cfg)
+        rss0, before = compact.rss_bytes(), sum(calls.counts.values())
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        p.refresh_many(keys)
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        m = {"median_s": elapsed, "min_s": elapsed, "runs": 1, "peak_bytes": peak,
+             "upstream_calls": sum(calls.counts.values()) - before}
+        report = compact.memory_report(p.snapshot())
+        rss = compact.rss_bytes()
+        m.update({"entry_bytes": int(report["bytes"].sum()), "pickled_bytes": int(report["pickled"].sum()),
+                  "rss_bytes": rss, "rss_delta_bytes": rss - rss0 if rss and rss0 else None})
+        _record(out, "memory", "snapshot", n, "cold", m)
+        print(f"{'':<10} {'':<22} {'':>5} {'':<5} entries {m['entry_bytes'] / 2**10:8.1f} KiB  "
+              f"pickled {m['pickled_bytes'] / 2**10:8.1f} KiB  rss {(rss or 0) / 2**20:7.1f} MiB", flush=True)
+
+def bench_page(out, cold: ColdState, calls, sizes, repeat) -> None:
+    """Streamlit AppTest로 탭별 스크립트 전체 실행 (탭 전환 포함)"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from fearindex import config
+
+    script = str(ROOT / "Fear Index.py")
+    saved = config.CONFIG_PATH
+    etfs = "".join(f'"{code}" = "{name}"\n' for code, name in config.load().etfs)
+    lists = {n: universe(n) for n in sizes}
+    try:
+        for n in sizes:
+            path = cold.tmp / f"watchlists-{n}.toml"
+            stocks = "".join(f'"{t}" = ["-10%", "-15%"]\n' for t in lists[n])
+            path.write_text(f"[etfs]\n{etfs}\n[stocks]\n{stocks}")
+            config.CONFIG_PATH = path
+            for tab in ("Fear", "Target", "AI전력"):
+                at = None
+
+                def setup():
+                    nonlocal at
+                    cold.reset()
+                    st.cache_resource.clear()
+                    at = AppTest.from_file(script, default_timeout=120)
+                    at.session_state["tab"] = tab
+
+                def run():
+                    at.run()
+                    if at.exception:
+                        raise RuntimeError(at.exception[0].message)
+                _record(out, "page", f"tab:{tab}", n, "cold", _measure(run, setup, repeat, calls))
+                _record(out, "page", f"tab:{tab}", n, "warm", _measure(run, None, repeat, calls))
+    finally:
+        config.CONFIG_PATH = saved
+
+def _meta(args, recorded: bool) -> dict:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ""
+    return {
+        "git": rev, "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+        "platform": platform.platform(), "cpus": os.cpu_count(),
+        "sizes": args.sizes, "repeat": args.repeat, "latency": args.latency,
+        "fixtures": "recorded" if recorded else "synthetic",
+    }
+
+def compare(results: list[dict], base_path: pathlib.Path, fail_over: float | None) -> int:
+    """기준 결과 대비 배율 출력 (fail_over 배 이상 느려진 항목이 있으면 1)"""
+    key = lambda r: (r["kind"], r["name"], r["size"], r["phase"])
+    base = {key(r): r for r in json.loads(base_path.read_text())["results"]}
+    worst = 0.0
+    print(f"\nvs {base_path.name}")
+    for r in results:
+        b = base.get(key(r))
+        if b is None or not b["median_s"]:
+            continue
+        ratio = r["median_s"] / b["median_s"]
+        mem = r["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] else float("nan")
+        worst = max(worst, ratio)
+        flag = " !" if fail_over and ratio >= fail_over else ""
+        print(f"{r['kind']:<10} {r['name']:<22} {str(r['size'] or ''):>5} {r['phase']:<5} time x{ratio:5.2f}  mem x{mem:5.2f}{flag}")
+    return 1 if fail_over and worst >= fail_over else 0
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=KINDS, default=list(DEFAULT_KINDS))
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 호출마다 추가 지연 (초)")
+    parser.add_argument("--out", type=pathlib.Path, default=None)
+    parser.add_argument("--compare", type=pathlib.Path, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--fail-over", type=float, default=None, help="이 배율 이상 느려지면 종료 코드 1")
+    parser.add_argument("--synthetic", action="store_true", help="기록된 픽스처 없이 합성 일봉으로 실행")
+    args = parser.parse_args(argv)
+
+    missing = fixtures.missing()
+    if missing and not args.synthetic:
+        print(f"기록된 픽스처 없음 ({len(missing)}개, 예: {missing[0].relative_to(ROOT)}): "
+              "python -m bench.fixtures record 로 기록하거나 --synthetic 으로 실행", file=sys.stderr)
+        return 2
+
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory(prefix="fearindex-bench-") as tmp, stubs.offline(args.latency) as calls:
+        cold = ColdState(pathlib.Path(tmp))
+        cold.reset()
+        runners = {"fetch": bench_fetch, "decode": bench_decode, "indicators": bench_indicators, "render": bench_render,
+                   "backtest": bench_backtest, "memory": bench_memory, "page": bench_page, "workers": bench_workers}
+        for kind in args.only:
+            runners[kind](results, cold, calls, args.sizes, args.repeat)
+
+    meta = _meta(args, not missing)
+    out = args.out or RESULTS_DIR / f"{meta['git'] or 'local'}-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"meta": meta, "results": results}, ensure_ascii=False, indent=1))
+    print(f"\n-> {out}")
+    return compare(results, args.compare, args.fail_over) if args.compare else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
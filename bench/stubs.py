@@ -0,0 +1,84 @@
+"""업스트림 대역 (yf.download / yf.Ticker / fdr.DataReader / HTTP 세션을 픽스처로 대체)"""
+import contextlib, re, time, zlib
+
+import pandas as pd
+import requests
+
+from bench import fixtures
+
+class Calls:
+    """대역 호출 횟수 (소스별)"""
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+def _since(df: pd.DataFrame, start) -> pd.DataFrame:
+    if start is None:
+        return df
+    start = pd.Timestamp(start)
+    if start.tzinfo is not None:
+        start = start.tz_localize(None)
+    return df[df.index >= start]
+
+@contextlib.contextmanager
+def offline(latency: float = 0.0):
+    """픽스처 대역 설치 (latency: 호출마다 추가 지연, 초) -> Calls"""
+    import FinanceDataReader as fdr
+    import yfinance as yf
+    from fearindex import http_client, ratelimit
+
+    calls = Calls()
+
+    def download(tickers=None, start=None, **kw):
+        calls.add("yf.download")
+        time.sleep(latency)
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {t: _since(fixtures.bars("yahoo", t), start) for t in symbols}
+        df = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+        df.columns.names = ["Price", "Ticker"]
+        return df
+
+    class Ticker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, start=None, end=None, **kw):
+            calls.add("yf.Ticker.history")
+            time.sleep(latency)
+            return _since(fixtures.bars("yahoo", self.ticker), start).tz_localize("America/New_York")
+
+    def data_reader(ticker, start=None, end=None):
+        calls.add("fdr.DataReader")
+        time.sleep(latency)
+        return _since(fixtures.bars("krx", ticker), start)
+
+    def session_get(url, headers=None, timeout=None, **kw):
+        calls.add("http")
+        time.sleep(latency)
+        resp = requests.Response()
+        resp.url, resp.status_code = url, 200
+        if re.search(r"/_next/data/", url):
+            body = fixtures.fgi_json()
+            resp.headers["Content-Type"] = "application/json"
+            # 내용 해시 ETag (같으면 304)
+            etag = f'"{zlib.crc32(body):08x}"'
+            resp.headers["ETag"] = etag
+            if (headers or {}).get("If-None-Match") == etag:
+                resp.status_code, body = 304, b""
+        else:
+            body = fixtures.fgi_page().encode()
+            resp.headers["Content-Type"] = "text/html"
+        resp._content = body
+        return resp
+
+    saved = (yf.download, yf.Ticker, fdr.DataReader, http_client._session.get, ratelimit.ENABLED)
+    yf.download, yf.Ticker, fdr.DataReader = download, Ticker, data_reader
+    http_client._session.get = session_get
+    # 대역은 호출 한도 대기 없이 (측정 대상은 코드 경로)
+    ratelimit.ENABLED = False
+    try:
+        yield calls
+    finally:
+        yf.download, yf.Ticker, fdr.DataReader, http_client._session.get, ratelimit.ENABLED = saved
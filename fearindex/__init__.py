@@ -0,0 +1 @@
+"""공포 지표 대시보드 데이터 모듈"""
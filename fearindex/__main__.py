@@ -0,0 +1,82 @@
+"""헤드리스 조회: 대시보드 지표를 JSON / Parquet으로 출력 (Streamlit 불필요)
+
+    python -m fearindex                          # 전체 섹션 JSON (stdout)
+    python -m fearindex fear stocks --indent 2
+    python -m fearindex --format parquet --out out/
+
+조회 결과는 스냅샷 DB(--cache, 기본 FEAR_INDEX_SNAPSHOT 또는 저장소 .cache/snapshot.db)에 남겨
+정책상 아직 유효한 항목은 다음 실행에서 다시 조회하지 않는다. 생산자가 같은 DB를 갱신 중이면
+--snapshot으로 읽기만 할 수 있다. 데이터가 빠진 섹션이 있으면 종료 코드 2.
+"""
+import argparse, sys
+
+from fearindex import config, orchestrator, prefetch, report, snapshot_store
+
+def open_source(cache: str | None, read_only: bool):
+    """조회 소스: 읽기 전용 스냅샷 / 스냅샷 캐시를 쓰는 Prefetcher / 캐시 없는 Prefetcher"""
+    if read_only:
+        return snapshot_store.SnapshotReader(snapshot_store.SnapshotStore(cache))
+    if cache is None:
+        return prefetch.Prefetcher()
+    store = snapshot_store.SnapshotStore(cache)
+    return _CachedPrefetcher(store)
+
+class _CachedPrefetcher(prefetch.Prefetcher):
+    """등록 시 스냅샷 DB의 항목을 먼저 채우고, 새로 조회한 항목은 DB에 기록"""
+
+    def __init__(self, store: snapshot_store.SnapshotStore):
+        super().__init__(on_update=store.write, idle_ttl=None)
+        self._store = store
+
+    def register(self, key, fetch, policy, default=None, timeout=orchestrator.DEFAULT_TIMEOUT) -> None:
+        super().register(key, fetch, policy, default, timeout)
+        row = self._store.read(key)
+        if row is not None:
+            self.restore(key, row[1])
+
+    def ensure(self, keys=None):
+        # 없는 항목 + 정책상 만료된 항목 (refresh는 유효한 항목을 그대로 돌려준다)
+        return self.refresh_many(list(self._jobs) if keys is None else keys)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m fearindex", description=__doc__.splitlines()[0])
+    parser.add_argument("sections", nargs="*", metavar="section", help=f"{' / '.join(report.SECTIONS)} (기본: 전체)")
+    parser.add_argument("--format", choices=("json", "parquet"), default="json")
+    parser.add_argument("--out", default=None, help="JSON 파일 또는 Parquet 디렉터리 (JSON 기본 stdout)")
+    parser.add_argument("--indent", type=int, default=None)
+    parser.add_argument("--config", default=None, help="watchlists.toml 경로")
+    parser.add_argument("--cache", default=snapshot_store.DEFAULT_PATH, help="스냅샷 DB 경로")
+    parser.add_argument("--no-cache", action="store_true", help="스냅샷 DB 없이 매번 조회")
+    parser.add_argument("--snapshot", action="store_true", help="스냅샷 DB 읽기만 (생산자 실행 중일 때)")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.sections) - set(report.SECTIONS))
+    if unknown:
+        parser.error(f"알 수 없는 섹션: {', '.join(unknown)}")
+    if args.format == "parquet" and not args.out:
+        parser.error("--format parquet에는 --out 디렉터리가 필요합니다")
+
+    cfg = config.load(args.config)
+    source = open_source(None if args.no_cache else args.cache, args.snapshot)
+    result = report.collect(source, cfg, tuple(args.sections) or report.SECTIONS)
+
+    if args.format == "parquet":
+        for path in report.to_parquet(result, args.out):
+            print(path, file=sys.stderr)
+    else:
+        text = report.to_json(result, args.indent)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+
+    return 2 if any(_empty(body) for body in result.values()) else 0
+
+def _empty(body: dict) -> bool:
+    """섹션 데이터 누락 여부 (표가 비었거나 카드 값이 없음)"""
+    if "table" in body:
+        return body["table"].empty
+    return any(v.get("value", v.get("price")) is None for v in body.values() if isinstance(v, dict))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""임계값 알림 (갱신마다 바뀐 입력의 규칙만 평가, 단계가 올라갈 때만 기록)
+
+규칙 (대시보드 표시와 같은 기준)
+- fgi: FGI가 Extreme Fear(≤24)에 진입
+- etf:{코드}: 최신 MDD가 -5/-10/-15% 구간(Target 탭 카드 배경색)을 더 깊게 넘어감
+- step1:{티커}: 90일 고점 대비 하락률이 물타기 1단계 기준 이하 (AI전력 탭 "충족" 배지)
+
+규칙별 마지막 단계와 입력값을 SQLite에 보관한다. 입력값이 그대로인 규칙은 건너뛰고,
+같은 단계가 이어지는 동안은 다시 울리지 않으며, 조건이 풀리면 단계만 조용히 낮춘다.
+갱신된 항목의 마지막 값만 보므로 평가 비용은 갱신된 항목의 행 수에만 비례한다.
+
+    python -m fearindex.producer --alerts .cache/alerts.db --alert-jsonl .cache/alerts.jsonl
+    python -m fearindex.alerts --db .cache/alerts.db     # 최근 이벤트
+"""
+import argparse, datetime, json, logging, math, os, sqlite3, threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import pandas as pd
+
+from fearindex import config, http_client, prefetch
+from fearindex.sources import fgi_label
+
+ALERTS_PATH = os.environ.get("FEAR_INDEX_ALERTS", os.path.join(Path(__file__).resolve().parent.parent, ".cache", "alerts.db"))
+
+# Target 탭 카드 배경색 구간 (MDD 절대값 %)
+MDD_LEVELS = (5, 10, 15)
+
+log = logging.getLogger("fearindex.alerts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rule_state (
+    rule TEXT PRIMARY KEY,
+    level INTEGER NOT NULL,
+    value REAL,
+    updated TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    at TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    value REAL,
+    message TEXT NOT NULL
+);
+"""
+
+@dataclass
+class Event:
+    at: str          # 발생 시각 (UTC, ISO)
+    rule: str
+    level: int
+    value: float | None
+    message: str
+
+class Sink(Protocol):
+    def emit(self, events: list[Event]) -> None: ...
+
+class JsonlSink:
+    """이벤트를 JSON Lines 파일에 덧붙임"""
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+
+    def emit(self, events: list[Event]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for e in events:
+                f.write(json.dumps(asdict(e), ensure_ascii=False) + "\n")
+
+class WebhookSink:
+    """이벤트 묶음을 웹훅 URL로 POST ({"events": [...]})"""
+    def __init__(self, url: str, timeout: float = 5):
+        self.url, self.timeout = url, timeout
+
+    def emit(self, events: list[Event]) -> None:
+        http_client.post_json(self.url, {"events": [asdict(e) for e in events]}, timeout=self.timeout)
+
+class LogSink:
+    def emit(self, events: list[Event]) -> None:
+        for e in events:
+            log.warning("%s %s", e.rule, e.message)
+
+def mdd_level(mdd: float) -> int:
+    """MDD(%) -> 0 (> -5%) / 1 / 2 / 3 (≤ -15%)"""
+    return sum(-mdd >= t for t in MDD_LEVELS)
+
+def _same(a: float | None, b: float | None) -> bool:
+    if a is None or b is None:
+        return a is b
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+class AlertEngine:
+    def __init__(self, path: str | os.PathLike = ALERTS_PATH, cfg: config.Config | None = None,
+                 sinks: list[Sink] | None = None):
+        if str(path) != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            # 규칙 -> (단계, 마지막 입력값)
+            self._state: dict[str, tuple[int, float | None]] = {
+                r: (lv, v) for r, lv, v in self._conn.execute("SELECT rule, level, value FROM rule_state")}
+        self._sinks = list(sinks or [])
+        self._seen: dict[str, datetime.datetime] = {}  # 키 -> 마지막으로 평가한 항목 as_of
+        self._cfg: config.Config | None = None
+        self._step1: dict[str, float] = {}
+        self._etf_names: dict[str, str] = {}
+        if cfg is not None:
+            self.set_config(cfg)
+
+    def set_config(self, cfg: config.Config) -> None:
+        """규칙 기준 교체 (기준이 바뀐 항목은 다음 갱신 때 다시 평가)"""
+        with self._lock:
+            if cfg is self._cfg:
+                return
+            step1 = cfg.step1
+            changed = {t for t in step1.keys() | self._step1.keys() if step1.get(t) != self._step1.get(t)}
+            self._cfg, self._step1, self._etf_names = cfg, step1, dict(cfg.etfs)
+            for t in changed:
+                # 기준이 바뀌면 입력값 비교를 무효화
+                if f"step1:{t}" in self._state:
+                    lv, _ = self._state[f"step1:{t}"]
+                    self._state[f"step1:{t}"] = (lv, None)
+            if changed:
+                self._seen = {k: v for k, v in self._seen.items() if not k.startswith("stocks:")}
+
+    def _inputs(self, key: str, value: Any) -> dict[str, tuple[int, float | None, str]]:
+        """갱신된 항목 -> {규칙: (단계, 입력값, 메시지)}"""
+        if key == "fgi":
+            v = float(value["FGI"].iloc[-1])
+            label = fgi_label(int(v))
+            return {"fgi": (int(label == "Extreme Fear"), v, f"FGI {v:.0f} ({label})")}
+        if key.startswith("etf:"):
+            code = key.split(":", 1)[1]
+            mdd = float(value[0]["MDD_%"].iloc[-1])
+            lv = mdd_level(mdd)
+            name = self._etf_names.get(code, code)
+            return {f"etf:{code}": (lv, mdd, f"{name} MDD {mdd:.2f}% (≤ -{MDD_LEVELS[lv - 1]}%)" if lv else f"{name} MDD {mdd:.2f}%")}
+        if key.startswith("stocks:"):
+            df = value[value["ticker"].isin(self._step1.keys())]
+            if "stale" in df:
+                # 조회 실패 행은 판정하지 않음 (빈 값으로 발생 중인 알림이 해제되지 않도록)
+                df = df[~df["stale"].fillna(False).astype(bool)]
+            th = df["ticker"].map(self._step1).astype(float)
+            dd = df["drawdown"].astype(float)
+            hit = (dd <= th).to_numpy()
+            return {f"step1:{t}": (int(h), float(d), f"{t} 하락률 {d:.1f}% ≤ 1단계 {s:g}%")
+                    for t, d, s, h in zip(df["ticker"], dd, th, hit)}
+        return {}
+
+    def on_update(self, key: str, entry: prefetch.Entry) -> list[Event]:
+        """Prefetcher on_update 콜백 -> 새로 발생한 이벤트"""
+        if entry.stale or entry.error or prefetch.is_empty(entry.value):
+            return []
+        with self._lock:
+            if self._seen.get(key) == entry.as_of:
+                return []
+            self._seen[key] = entry.as_of
+        try:
+            inputs = self._inputs(key, entry.value)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            log.warning("%s: 알림 입력 해석 실패 (%s)", key, type(e).__name__)
+            return []
+
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        events, rows = [], []
+        with self._lock:
+            for rule, (level, value, message) in inputs.items():
+                prev_level, prev_value = self._state.get(rule, (0, None))
+                if level == prev_level and _same(value, prev_value):
+                    continue
+                self._state[rule] = (level, value)
+                rows.append((rule, level, value, now))
+                if level > prev_level:
+                    events.append(Event(now, rule, level, value, message))
+            if rows:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        "INSERT INTO rule_state (rule, level, value, updated) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(rule) DO UPDATE SET level=excluded.level, value=excluded.value, updated=excluded.updated",
+                        rows)
+                    self._conn.executemany("INSERT INTO events (at, rule, level, value, message) VALUES (?, ?, ?, ?, ?)",
+                                           [(e.at, e.rule, e.level, e.value, e.message) for e in events])
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        if events:
+            for sink in self._sinks:
+                try:
+                    sink.emit(events)
+                except Exception as e:
+                    # 외부 전송 실패는 기록만 (이벤트는 SQLite에 남아 있음)
+                    log.warning("%s: 알림 전송 실패 (%s)", type(sink).__name__, type(e).__name__)
+        return events
+
+    def events(self, limit: int = 50) -> pd.DataFrame:
+        """최근 이벤트 (최신 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT at, rule, level, value, message FROM events ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return pd.DataFrame(rows, columns=["at", "rule", "level", "value", "message"])
+
+    def state(self) -> pd.DataFrame:
+        """규칙별 현재 단계"""
+        with self._lock:
+            rows = self._conn.execute("SELECT rule, level, value, updated FROM rule_state ORDER BY rule").fetchall()
+        return pd.DataFrame(rows, columns=["rule", "level", "value", "updated"])
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.alerts", description="알림 이벤트 / 규칙 상태 조회")
+    parser.add_argument("--db", default=ALERTS_PATH)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--state", action="store_true", help="규칙별 현재 단계")
+    args = parser.parse_args(argv)
+
+    engine = AlertEngine(args.db)
+    pd.set_option("display.width", 200)
+    print((engine.state() if args.state else engine.events(args.limit)).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""물타기 기준(dca_rules) 백테스트 (티커 × 기준 쌍 전체를 배열 연산으로)
+
+get_stock_data와 같은 정의로 날마다 '최근 90일 고가 최댓값 대비 종가 하락률'을 구하고,
+하락률이 기준선을 새로 밑도는 날(전날은 기준선 위)마다 그날 종가로 같은 금액을 매수한 것으로 본다.
+1단계/2단계 기준은 서로 독립적으로 체결된다.
+
+기준값마다 체결 수 / 1÷체결가 합 / 선행 수익률 합을 한 번에 구해 두고,
+기준 쌍의 결과는 두 기준값의 합계를 더해서 만든다 (쌍 수와 무관하게 기준값 수만큼만 계산).
+티커가 많으면 티커 묶음별로 프로세스 풀에 나눠 계산한다.
+
+    python -m fearindex.backtest --years 5
+"""
+import argparse, datetime, multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# get_stock_data와 같은 고점 구간 (달력일)
+HIGH_DAYS = 90
+
+# 체결 후 수익률 구간 (거래일)
+HORIZONS = (20, 60, 120)
+
+# 프로세스 하나가 맡는 티커 수
+CHUNK = 50
+
+def parse_rule(rule: str) -> float:
+    """'-10%' -> -10.0"""
+    return float(str(rule).strip().rstrip("%"))
+
+def default_grid(step1=range(-5, -31, -1), gap=range(2, 21, 2)) -> list[tuple[float, float]]:
+    """(1단계, 2단계) 기준 쌍 격자 (2단계 = 1단계 - 간격)"""
+    return [(float(a), float(a - g)) for a in step1 for g in gap]
+
+def drawdown(close: pd.DataFrame, high: pd.DataFrame, days: int = HIGH_DAYS) -> pd.DataFrame:
+    """날짜 × 티커 하락률(%) (직전 days일 구간 고가 최댓값 기준, 당일 포함)"""
+    peak = high.rolling(f"{days}D").max()
+    return (close - peak) / peak * 100
+
+def level_stats(close: np.ndarray, dd: np.ndarray, levels: np.ndarray,
+                horizons: tuple[int, ...] = HORIZONS) -> dict[str, np.ndarray]:
+    """기준값별 합계 (배열 모양: 기준값 K × 티커 N, 선행 수익률은 구간 H × K × N)
+
+    close, dd: 날짜 T × 티커 N
+    """
+    below = dd[None, :, :] <= levels[:, None, None]  # NaN은 False
+    fills = below.copy()
+    fills[:, 1:] &= ~below[:, :-1]
+
+    inv_price = np.where(np.isnan(close), 0.0, 1.0 / np.where(close == 0, np.nan, close))
+    fwd_sum, fwd_n = [], []
+    for h in horizons:
+        fwd = np.full_like(close, np.nan)
+        fwd[:-h] = (close[h:] / close[:-h] - 1) * 100
+        ok = fills & ~np.isnan(fwd)[None]
+        fwd_sum.append(np.where(ok, fwd[None], 0.0).sum(axis=1))
+        fwd_n.append(ok.sum(axis=1))
+    return {
+        "count": fills.sum(axis=1),
+        "inv_price": np.where(fills, inv_price[None], 0.0).sum(axis=1),
+        "fwd_sum": np.array(fwd_sum),
+        "fwd_n": np.array(fwd_n),
+    }
+
+def _sweep_chunk(close: pd.DataFrame, high: pd.DataFrame, pairs: list[tuple[float, float]],
+                 horizons: tuple[int, ...]) -> pd.DataFrame:
+    """티커 묶음 하나의 기준 쌍 전체 결과 (프로세스 풀 작업 단위)"""
+    levels = np.unique(np.array(pairs, dtype=float).ravel())
+    pos = {v: i for i, v in enumerate(levels)}
+    i1 = np.array([pos[a] for a, _ in pairs])
+    i2 = np.array([pos[b] for _, b in pairs])
+
+    c = close.to_numpy(dtype=float)
+    stats = level_stats(c, drawdown(close, high).to_numpy(dtype=float), levels, horizons)
+
+    # 기준 쌍 = 두 기준값 합계의 합 (P × N)
+    n1, n2 = stats["count"][i1], stats["count"][i2]
+    fills = n1 + n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 같은 금액 매수 -> 평균 단가는 체결가의 조화평균
+        avg_cost = fills / (stats["inv_price"][i1] + stats["inv_price"][i2])
+        fwd = (stats["fwd_sum"][:, i1] + stats["fwd_sum"][:, i2]) / (stats["fwd_n"][:, i1] + stats["fwd_n"][:, i2])
+    last = close.ffill().iloc[-1].to_numpy(dtype=float) if len(close) else np.full(close.shape[1], np.nan)
+
+    P, N = fills.shape
+    out = pd.DataFrame({
+        "ticker": np.tile(close.columns.to_numpy(), P),
+        "step1": np.repeat([a for a, _ in pairs], N),
+        "step2": np.repeat([b for _, b in pairs], N),
+        "fills1": n1.ravel(),
+        "fills2": n2.ravel(),
+        "fills": fills.ravel(),
+        "avg_cost": np.where(fills > 0, avg_cost, np.nan).ravel(),
+        "last": np.tile(last, P),
+    })
+    out["pnl_%"] = (out["last"] / out["avg_cost"] - 1) * 100
+    for k, h in enumerate(horizons):
+        out[f"{h}d_%"] = fwd[k].ravel()
+    return out
+
+def _frames(bars: dict[str, pd.DataFrame]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """{티커: 일봉} -> (종가, 고가) 날짜 × 티커 프레임"""
+    close = pd.DataFrame({t: df["Close"] for t, df in bars.items() if not df.empty}).sort_index()
+    high = pd.DataFrame({t: df["High"] if "High" in df.columns else df["Close"]
+                         for t, df in bars.items() if not df.empty}).sort_index()
+    return close.astype(float), high.reindex_like(close).astype(float)
+
+def sweep(bars: dict[str, pd.DataFrame], pairs: list[tuple[float, float]] | None = None,
+          horizons: tuple[int, ...] = HORIZONS, workers: int | None = None) -> pd.DataFrame:
+    """티커 × 기준 쌍 백테스트 (티커가 CHUNK개를 넘으면 프로세스 풀로 분산)
+
+    반환 컬럼: ticker, step1, step2, fills1, fills2, fills, avg_cost, last, pnl_%, {h}d_%
+    """
+    pairs = pairs or default_grid()
+    close, high = _frames(bars)
+    if close.empty:
+        return pd.DataFrame()
+    chunks = [list(close.columns[i:i + CHUNK]) for i in range(0, close.shape[1], CHUNK)]
+    if len(chunks) == 1 or workers == 1:
+        parts = [_sweep_chunk(close[c], high[c], pairs, horizons) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or min(len(chunks), os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(_sweep_chunk, [close[c] for c in chunks], [high[c] for c in chunks],
+                                  [pairs] * len(chunks), [horizons] * len(chunks)))
+    return pd.concat(parts, ignore_index=True)
+
+def evaluate_rules(result: pd.DataFrame, dca_rules: dict[str, tuple[str, ...]]) -> pd.DataFrame:
+    """sweep 결과에서 현재 설정된 기준 쌍 행만"""
+    rules = {t: (parse_rule(r[0]), parse_rule(r[1])) for t, r in dca_rules.items() if len(r) >= 2}
+    key = pd.Series(list(zip(result["step1"], result["step2"])), index=result.index)
+    return result[result["ticker"].map(rules).eq(key)].reset_index(drop=True)
+
+def main(argv: list[str] | None = None) -> None:
+    from fearindex import config, sources
+
+    parser = argparse.ArgumentParser(prog="python -m fearindex.backtest", description="물타기 기준 백테스트")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10, help="티커 평균 선행 수익률 상위 기준 쌍 수")
+    args = parser.parse_args(argv)
+
+    cfg = config.load()
+    start = (pd.Timestamp.today() - pd.DateOffset(years=args.years)).date()
+    bars = sources.fetch_adjusted_bars(cfg.tickers, start)
+    pairs = sorted(set(default_grid()) | {(parse_rule(r[0]), parse_rule(r[1]))
+                                          for r in cfg.dca_rules.values() if len(r) >= 2})
+    t0 = datetime.datetime.now()
+    result = sweep(bars, pairs, workers=args.workers)
+    elapsed = (datetime.datetime.now() - t0).total_seconds()
+
+    pd.set_option("display.width", 200)
+    print(f"{len(bars)} tickers × {len(pairs)} pairs: {elapsed:.2f}s\n")
+    print("현재 기준")
+    print(evaluate_rules(result, cfg.dca_rules).round(2).to_string(index=False))
+    print(f"\n기준 쌍별 티커 평균 (상위 {args.top})")
+    grid = result.groupby(["step1", "step2"])[["fills", "pnl_%"] + [f"{h}d_%" for h in HORIZONS]].mean()
+    print(grid.sort_values(f"{HORIZONS[1]}d_%", ascending=False).head(args.top).round(2).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""일봉 OHLCV 로컬 캐시 (티커별 Parquet 파일, 증분 갱신)
+
+캐시된 마지막 날짜 이후 구간만 업스트림에 요청해 덧붙인다.
+마지막 OVERLAP_DAYS 구간은 항상 다시 받아 늦은 수정을 반영하고,
+겹치는 과거 봉 값이 달라졌으면(분할/배당 조정 등) 전체를 다시 받는다.
+장이 닫혀 있고 마지막 조회가 직전 마감(+확정 대기) 이후면 조회 없이 캐시를 그대로 쓰며,
+읽은 캐시는 파일 수정 시각이 같으면 메모리에서 재사용한다.
+"""
+import os, re, datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from fearindex import market_hours, metrics
+
+CACHE_DIR = Path(os.environ.get("FEAR_INDEX_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache" / "bars"))
+
+# 늦은 수정 반영을 위해 다시 받는 구간 (달력일)
+OVERLAP_DAYS = 7
+
+# 겹치는 구간 값 비교 허용 오차 (상대)
+REVISION_TOL = 1e-6
+
+# 소스별 시장 (마지막 조회 이후 새 봉이 있을 수 있는지 판단)
+MARKETS = {"yahoo": "us", "yahoo_adj": "us", "krx": "krx"}
+
+# 경로 -> (파일 수정 시각, 정규화된 프레임)
+_memo: dict[Path, tuple[int, pd.DataFrame]] = {}
+
+def _path(source: str, ticker: str) -> Path:
+    name = re.sub(r"[^A-Za-z0-9_\-]", "_", ticker)
+    return CACHE_DIR / source / f"{name}.parquet"
+
+def read_bars(source: str, ticker: str) -> pd.DataFrame:
+    """캐시 파일 읽기 (없거나 읽기 실패 시 빈 프레임)"""
+    p = _path(source, ticker)
+    if not p.exists():
+        return pd.DataFrame()
+    try:
+        return pd.read_parquet(p)
+    except Exception as e:
+        return pd.DataFrame()
+
+def write_bars(source: str, ticker: str, df: pd.DataFrame) -> None:
+    """캐시 파일 쓰기 (임시 파일 후 교체, 실패해도 무시)"""
+    p = _path(source, ticker)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, p)
+        _memo[p] = (p.stat().st_mtime_ns, df)
+    except Exception as e:
+        pass
+
+def _read_cached(source: str, ticker: str) -> pd.DataFrame:
+    """정규화된 캐시 (파일이 그대로면 메모리 사본, 반환 프레임은 수정하지 말 것)"""
+    p = _path(source, ticker)
+    try:
+        mtime = p.stat().st_mtime_ns
+    except OSError:
+        _memo.pop(p, None)
+        return pd.DataFrame()
+    hit = _memo.get(p)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    df = _normalize(read_bars(source, ticker))
+    _memo[p] = (mtime, df)
+    return df
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        # 거래일 날짜 기준으로 비교하도록 tz 제거
+        df = df.tz_localize(None)
+    if not df.index.is_unique:
+        df = df[~df.index.duplicated(keep="last")]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    if "Close" in df.columns:
+        ok = df["Close"].notna().to_numpy()
+        if not ok.all():
+            df = df[ok]
+    return df
+
+def _revised(cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+    """겹치는 과거 봉(캐시 마지막 봉 제외)의 종가가 달라졌는지"""
+    if "Close" not in cached.columns or "Close" not in fresh.columns:
+        return False
+    pos = cached.index.get_indexer(fresh.index)
+    common = (pos >= 0) & (fresh.index < cached.index[-1])
+    if not common.any():
+        return False
+    a = cached["Close"].to_numpy(dtype=float)[pos[common]]
+    b = fresh["Close"].to_numpy(dtype=float)[common]
+    return bool((np.abs(a - b) > REVISION_TOL * np.abs(a)).any())
+
+def _covered_from(cached: pd.DataFrame) -> datetime.date:
+    """캐시가 전체 조회로 채워진 시작일 (상장일이 그 이후면 첫 봉보다 이르다)"""
+    start = cached.attrs.get("start")
+    return datetime.date.fromisoformat(start) if start else cached.index[0].date()
+
+def _since(cached: pd.DataFrame, start: datetime.date | None) -> datetime.date | None:
+    """증분 조회 시작일 (None이면 전체 조회 필요)"""
+    if cached.empty:
+        return None
+    if start is not None and _covered_from(cached) > start:
+        # 요청 구간이 캐시보다 과거로 넓어진 경우
+        return None
+    return cached.index[-1].date() - datetime.timedelta(days=OVERLAP_DAYS)
+
+def _current(source: str, cached: pd.DataFrame, now: datetime.datetime) -> bool:
+    """마지막 조회 이후 새 봉이 없는지 (장중이 아니고 일봉 정책상 아직 유효)"""
+    fetched = cached.attrs.get("fetched")
+    market = MARKETS.get(source)
+    if not fetched or market is None or market_hours.is_open(market, now):
+        return False
+    policy = market_hours.Policy(market)
+    return now < market_hours.valid_until(policy, datetime.datetime.fromisoformat(fetched))
+
+def _fetched_attr(source: str, cached: pd.DataFrame, fetched: datetime.datetime | None) -> str | None:
+    """기록할 조회 시각 (유효기간이 이전 조회와 같으면 이전 값 유지: 내용이 같으면 다시 쓰지 않도록)"""
+    old = cached.attrs.get("fetched")
+    if fetched is None:
+        return old
+    market = MARKETS.get(source)
+    if old and market is not None:
+        policy = market_hours.Policy(market)
+        if market_hours.valid_until(policy, datetime.datetime.fromisoformat(old)) == market_hours.valid_until(policy, fetched):
+            return old
+    return fetched.isoformat()
+
+def merge_bars(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """신규 봉 병합 (겹치는 날짜는 신규 값 우선)"""
+    if cached.empty:
+        return _normalize(fresh)
+    fresh = _normalize(fresh)
+    if fresh.empty:
+        return cached
+    # 신규 구간에 없는 캐시 봉 + 신규 봉 (둘 다 정규화돼 있어 중복 없음)
+    keep = cached[~cached.index.isin(fresh.index)]
+    merged = pd.concat([keep, fresh])
+    if len(keep) and keep.index[-1] > fresh.index[0]:
+        merged = merged.sort_index()
+    return merged
+
+def _trim(df: pd.DataFrame, start: datetime.date | None) -> pd.DataFrame:
+    if df.empty or start is None:
+        return df
+    return df[df.index >= pd.Timestamp(start)]
+
+def _store(source: str, ticker: str, cached: pd.DataFrame, merged: pd.DataFrame,
+           covered: datetime.date | None, fetched: datetime.datetime | None) -> None:
+    """변경된 경우에만 캐시 파일 갱신 (fetched: 새 봉을 받은 조회 시각, None이면 이전 값 유지)"""
+    attrs = {"start": str(covered or merged.index[0].date())}
+    fetched_attr = _fetched_attr(source, cached, fetched)
+    if fetched_attr:
+        attrs["fetched"] = fetched_attr
+    if merged.equals(cached) and attrs == cached.attrs:
+        return
+    if merged is cached:
+        merged = cached.copy(deep=False)
+    merged.attrs = attrs
+    write_bars(source, ticker, merged)
+
+def load_bars(source: str, ticker: str, fetch: Callable[[datetime.date | None], pd.DataFrame],
+              start: datetime.date | None = None) -> pd.DataFrame:
+    """캐시 + 증분 조회로 일봉 반환
+
+    fetch(since)는 since 이후(since=None이면 start 이후 전체) 일봉을 반환한다.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cached = _read_cached(source, ticker)
+    since = _since(cached, start)
+    if since is not None and _current(source, cached, now):
+        metrics.note(cache="hit", nbytes=0)
+        return _trim(cached, start)
+    covered, fetched = start, now
+    if since is None:
+        merged = _normalize(fetch(start))
+        metrics.note(cache="miss", nbytes=metrics.frame_bytes(merged))
+    else:
+        fresh = _normalize(fetch(since))
+        metrics.note(cache="hit", nbytes=metrics.frame_bytes(fresh))
+        if not fresh.empty and _revised(cached, fresh):
+            merged = _normalize(fetch(start))
+            metrics.note(cache="miss", nbytes=metrics.frame_bytes(merged))
+        else:
+            merged = merge_bars(cached, fresh)
+            covered = _covered_from(cached)
+            if fresh.empty:
+                # 빈 응답은 조회 실패일 수 있어 조회 시각을 남기지 않는다
+                fetched = None
+
+    if merged.empty:
+        # 업스트림 실패 시 기존 캐시라도 반환
+        return _trim(cached, start)
+    _store(source, ticker, cached, merged, covered, fetched)
+    return _trim(merged, start)
+
+def load_bars_many(source: str, tickers: list[str], fetch_many: Callable[[list[str], datetime.date | None], dict],
+                   start: datetime.date | None = None) -> dict[str, pd.DataFrame]:
+    """여러 티커 캐시 + 일괄 증분 조회
+
+    fetch_many(tickers, since)는 {티커: 일봉 프레임}을 반환한다.
+    증분 조회 가능한 티커는 가장 이른 since로 한 번에, 나머지는 start부터 한 번에 받는다.
+    마지막 조회 이후 새 봉이 없는 티커는 조회하지 않는다.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cached = {t: _read_cached(source, t) for t in tickers}
+    sinces = {t: _since(cached[t], start) for t in tickers}
+    current = {t for t in tickers if sinces[t] is not None and _current(source, cached[t], now)}
+
+    fresh: dict[str, pd.DataFrame] = {}
+    delta = [t for t in tickers if sinces[t] is not None and t not in current]
+    full = [t for t in tickers if sinces[t] is None]
+    if delta:
+        fresh.update({t: _normalize(df) for t, df in fetch_many(delta, min(sinces[t] for t in delta)).items()})
+        revised = [t for t in delta if t in fresh and not fresh[t].empty and _revised(cached[t], fresh[t])]
+        full += revised
+        for t in revised:
+            fresh.pop(t, None)
+    if full:
+        fresh.update({t: _normalize(df) for t, df in fetch_many(full, start).items()})
+    # 한 티커라도 전체 조회했으면 miss
+    metrics.note(cache="miss" if full else "hit", nbytes=sum(metrics.frame_bytes(df) for df in fresh.values()))
+
+    out = {}
+    for t in tickers:
+        if t in current:
+            out[t] = _trim(cached[t], start)
+            continue
+        base = pd.DataFrame() if t in full else cached[t]
+        got = fresh.get(t, pd.DataFrame())
+        merged = merge_bars(base, got)
+        if merged.empty:
+            if not cached[t].empty:
+                out[t] = _trim(cached[t], start)
+            continue
+        _store(source, t, cached[t], merged, start if t in full else _covered_from(cached[t]),
+               None if got.empty else now)
+        out[t] = _trim(merged, start)
+    return out
@@ -0,0 +1,64 @@
+"""대시보드 표 셀 컬럼 생성 (tables.cached_table의 build 함수)"""
+import numpy as np
+import pandas as pd
+
+from fearindex import tables
+
+FGI_CLASS = {"Extreme Greed": "fgi-eg", "Greed": "fgi-g", "Neutral": "fgi-n", "Fear": "fgi-f", "Extreme Fear": "fgi-ef"}
+
+def fgi_cells(df):
+    """FGI 표 셀 (fgi_label 구간을 컬럼 단위로 적용)"""
+    label = pd.cut(df["FGI"].astype(int), [-np.inf, 24, 44, 55, 75, np.inf],
+                   labels=["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+    # 범주 5개만 문자열로 만들고 행은 코드로 참조
+    badge = label.cat.rename_categories(lambda c: f"<span class='pill {FGI_CLASS[c]}'>{c}</span>").astype(str)
+    return [tables.td(tables.fmt_date(df["날짜"], "%Y-%m-%d")), tables.td(tables.fmt_num(df["FGI"].astype(int), "d")),
+            tables.td(badge)]
+
+def price_cells(df, highlight_date, price_fmt):
+    """가격 표 셀 (highlight_date 행 날짜 음영)"""
+    hl = np.where(df["Date"] == highlight_date, "hl", "") if highlight_date is not None else None
+    return [
+        tables.td(tables.fmt_date(df["Date"]), "c", hl),
+        tables.td(tables.fmt_num(df["Close"], price_fmt), "r"),
+        tables.td(tables.span_signed_pct(df["DoD_%"]), "r"),
+        tables.td(tables.span_mdd(df["MDD_%"]), "r"),
+    ]
+
+def vix_cells(df):
+    return [
+        tables.td(tables.fmt_date(df["Date"])),
+        tables.td(tables.fmt_num(df["Close"]), "r"),
+        tables.td(tables.span_signed_pct(df["DoD"]), "r"),
+        tables.td(tables.span_signed_pct(df["WoW"]), "r"),
+    ]
+
+def stock_cells(df, dca_rules):
+    """US Stocks 표 셀 (하락률 구간 색, 물타기 1단계 충족 배지, 조회 실패 표시)"""
+    dd = df["drawdown"]
+    # 하락률 셀은 모두 굵게(dd), 폰트 색상은 -5% 이하부터 10/15% 구간별
+    dd_cls = np.select([dd.isna() | (dd > -5), dd.abs() < 10, dd.abs() < 15], ["dd", "dd dd1", "dd dd2"], "dd dd3")
+    dca1 = df["ticker"].map({t: r[0] for t, r in dca_rules.items() if r}).fillna("-")
+    dca1_threshold = pd.to_numeric(dca1.str.rstrip("%"), errors="coerce")
+    hit = dca1_threshold.notna() & (dd <= dca1_threshold)
+    badge = "<span class='badge-inline hit'>충족</span><span class='badge-block hit'>충족</span>"
+    # 조회 실패 티커: 이전 값이 있으면 '이전 값', 없으면 '조회 실패' 표시
+    stale = df["stale"].fillna(False).astype(bool) if "stale" in df else pd.Series(False, index=df.index)
+    note = np.select([stale & df["current_price"].notna(), stale], ["<span class='stale'>이전 값</span>", "<span class='stale'>조회 실패</span>"], "")
+    return [
+        tables.td("<b>" + df["ticker"] + "</b>" + note),
+        tables.td(tables.fmt_num(df["current_price"], ".0f"), "r"),
+        tables.td(tables.fmt_num(df["ath_90d"], ".0f"), "r"),
+        tables.td(tables.fmt_num(dd, ".1f"), "r", dd_cls),
+        tables.td(dca1 + np.where(hit, badge, "")),
+        tables.td(tables.fmt_num(df["rsi"], ".0f"), "r"),
+    ]
+
+def fwd_cells(df):
+    return [
+        tables.td(df["구간"]),
+        tables.td(tables.fmt_num(df["횟수"], "d"), "r"),
+        tables.td(tables.span_signed_pct(df["평균"]), "r"),
+        tables.td(tables.span_signed_pct(df["중앙값"]), "r"),
+        tables.td(tables.fmt_num(df["상승"], ".0f") + "%", "r"),
+    ]
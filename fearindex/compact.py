@@ -0,0 +1,76 @@
+"""캐시 항목 메모리 절약 (float32 가격, 작은 정수, 범주형 문자열) 및 메모리 측정
+
+선조회 스냅샷은 화면이 닫혀 있어도 프로세스마다 계속 들고 있으므로,
+조회 함수는 화면에 필요한 구간만 남기고 shrink()로 줄인 프레임을 반환한다.
+
+날짜는 문자열 대신 datetime64 그대로 둔다. 값당 8바이트로 int64 epoch-day와 크기가 같고
+(문자열 "YYYY-MM-DD"는 약 2배), 표시/기간 계산(rolling("365D"), 날짜 포맷)이 디코딩 없이 동작한다.
+반복되는 라벨 문자열은 category로 바꾸고, 행마다 다른 값(티커 등)은 그대로 둔다.
+"""
+import os, pickle, sys
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# float32로 바꿔도 되는 최대 상대 오차 (가격 표시는 소수 둘째 자리)
+FLOAT32_RTOL = 1e-6
+
+# 고유값 비율이 이 이하인 문자열 컬럼은 범주형으로
+CATEGORY_RATIO = 0.5
+
+def _float32_ok(s: pd.Series) -> bool:
+    v = s.to_numpy(dtype=float)
+    f = v.astype(np.float32).astype(float)
+    ok = np.isfinite(v)
+    return bool(np.all(np.abs(f[ok] - v[ok]) <= FLOAT32_RTOL * np.abs(v[ok])))
+
+def shrink(df: pd.DataFrame) -> pd.DataFrame:
+    """컬럼 자료형 축소 (float64 -> float32, 정수 -> 가장 작은 정수형, 반복 문자열 -> category)"""
+    if df is None or df.empty:
+        return df
+    out = {}
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_float_dtype(s) and s.dtype != np.float32 and _float32_ok(s):
+            s = s.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            s = pd.to_numeric(s, downcast="unsigned" if len(s) and s.min() >= 0 else "integer")
+        elif s.dtype == object and len(s) and s.nunique() <= CATEGORY_RATIO * len(s):
+            s = s.astype("category")
+        out[c] = s
+    return pd.DataFrame(out, index=df.index)
+
+def nbytes(value: Any) -> int:
+    """캐시 값 메모리 크기 (프레임/Series는 deep, 튜플/dict는 원소 합)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(k) + nbytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+def pickled_bytes(value: Any) -> int:
+    """스냅샷 저장소에 기록되는 크기"""
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+def rss_bytes() -> int | None:
+    """현재 프로세스 상주 메모리 (리눅스 /proc, 그 외 최대 상주량)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+def memory_report(entries: dict[str, Any]) -> pd.DataFrame:
+    """스냅샷 항목별 메모리 / 직렬화 크기 (entries: 키 -> Entry)"""
+    rows = [{"key": k, "bytes": nbytes(e.value), "pickled": pickled_bytes(e.value)} for k, e in entries.items()]
+    return pd.DataFrame(rows, columns=["key", "bytes", "pickled"])
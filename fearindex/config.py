@@ -0,0 +1,59 @@
+"""관심 종목 / 물타기 기준 설정 (watchlists.toml)
+
+파일이 바뀌면(mtime) 다음 로드 때 다시 읽는다.
+"""
+import os, pathlib, threading, tomllib
+from dataclasses import dataclass, field
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+CONFIG_PATH = pathlib.Path(os.environ.get("FEAR_INDEX_CONFIG", ROOT / "watchlists.toml"))
+
+@dataclass(frozen=True)
+class Config:
+    qqq: str = "QQQM"
+    vix: str = "^VIX"
+    etfs: tuple[tuple[str, str], ...] = ()                     # (종목코드, 이름)
+    dca_rules: dict[str, tuple[str, ...]] = field(default_factory=dict)  # 티커 -> (1단계, 2단계)
+
+    @property
+    def tickers(self) -> tuple[str, ...]:
+        return tuple(self.dca_rules)
+
+    @property
+    def step1(self) -> dict[str, float]:
+        """티커 -> 물타기 1단계 하락률 기준 (%, 해석할 수 없는 기준은 제외)"""
+        out = {}
+        for t, r in self.dca_rules.items():
+            try:
+                out[t] = float(str(r[0]).strip().rstrip("%"))
+            except (IndexError, ValueError):
+                continue
+        return out
+
+def parse(data: dict) -> Config:
+    """TOML 내용 -> Config (형식 오류는 ValueError)"""
+    fear = data.get("fear", {})
+    etfs = tuple((str(code), str(name)) for code, name in data.get("etfs", {}).items())
+    rules = {}
+    for ticker, steps in data.get("stocks", {}).items():
+        if not isinstance(steps, list) or not all(isinstance(s, str) for s in steps):
+            raise ValueError(f"stocks.{ticker}: 물타기 기준은 문자열 목록이어야 합니다 (예: [\"-10%\", \"-15%\"])")
+        rules[ticker.upper()] = tuple(steps)
+    return Config(str(fear.get("qqq", "QQQM")), str(fear.get("vix", "^VIX")), etfs, rules)
+
+_cache: dict[pathlib.Path, tuple[float, Config]] = {}
+_lock = threading.Lock()
+
+def load(path: str | os.PathLike | None = None) -> Config:
+    """설정 로드 (파일 수정 시각이 같으면 이전 결과 재사용)"""
+    path = pathlib.Path(path or CONFIG_PATH)
+    mtime = path.stat().st_mtime
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with path.open("rb") as f:
+        cfg = parse(tomllib.load(f))
+    with _lock:
+        _cache[path] = (mtime, cfg)
+    return cfg
@@ -0,0 +1,84 @@
+"""FGI 데이터 JSON 디코더 (pageProps.data.fgiData.fgi 배열만 골라 열 단위로 변환)
+
+Next.js 데이터 JSON 전체를 객체로 만들지 않고 본문에서 fgi 배열 구간만 잘라 파싱한 뒤,
+행을 정렬된 epoch-day(int32) / uint8 배열로 바로 바꾼다. 구간을 찾지 못하면 전체를 파싱해
+경로를 따라가고, 경로/필드/값이 맞지 않으면 SchemaError를 낸다 (빈 응답과 구분).
+"""
+import json, re
+
+import numpy as np
+
+# 데이터 JSON 안 fgi 배열 경로
+PATH = ("pageProps", "data", "fgiData", "fgi")
+
+_KEY = re.compile(rb'"fgi"\s*:\s*\[')
+_NUMBER = {int, float, type(None)}
+
+class SchemaError(ValueError):
+    """FGI 응답 형식 변경 (경로 / 필드 / 값 범위)"""
+
+def _slice(body: bytes) -> list | None:
+    """fgiData 뒤 "fgi": [ ... ] 구간만 파싱 (행 안에 배열/"]"가 있으면 잘못 잘려 None)"""
+    i = body.find(b'"fgiData"')
+    m = _KEY.search(body, i) if i >= 0 else None
+    if m is None:
+        return None
+    end = body.find(b"]", m.end())
+    if end < 0:
+        return None
+    try:
+        return json.loads(body[m.end() - 1:end + 1])
+    except ValueError:
+        return None
+
+def _walk(body: bytes) -> list:
+    """전체 JSON 파싱 후 PATH 따라가기"""
+    try:
+        node = json.loads(body)
+    except ValueError as e:
+        raise SchemaError(f"JSON 파싱 실패 ({e})") from None
+    for k in PATH:
+        if not isinstance(node, dict) or k not in node:
+            raise SchemaError(f"경로 없음: {'.'.join(PATH)} ({k})")
+        node = node[k]
+    return node
+
+def decode(body: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """데이터 JSON 본문 -> (epoch-day int32, FGI uint8) 날짜 순 배열 (now가 없거나 null인 날 제외)
+
+    형식이 맞지 않으면 SchemaError.
+    """
+    rows = _slice(body)
+    if rows is None:
+        rows = _walk(body)
+    if not isinstance(rows, list):
+        raise SchemaError(f"{'.'.join(PATH)}가 배열이 아님 ({type(rows).__name__})")
+    try:
+        dates = [r["date"] for r in rows]
+        # now가 없는 행은 null과 같이 제외
+        values = [r.get("now") for r in rows]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise SchemaError(f"fgi 행 형식 오류 ({type(e).__name__}: {e})") from None
+    if not {type(d) for d in dates} <= {str}:
+        raise SchemaError("fgi.date가 문자열이 아님")
+    if not {type(v) for v in values} <= _NUMBER:
+        raise SchemaError("fgi.now가 숫자가 아님")
+
+    v = np.array(values, dtype=float)
+    ok = ~np.isnan(v)
+    if np.any((v[ok] < 0) | (v[ok] > 100)):
+        raise SchemaError("fgi.now 값이 0~100 범위를 벗어남")
+    try:
+        # "YYYY-MM-DDT00:00:00" -> 앞 10자 날짜
+        days = np.array(dates, dtype="U10").astype("datetime64[D]").astype(np.int32)
+    except ValueError as e:
+        raise SchemaError(f"fgi.date 형식 오류 ({e})") from None
+    days, v = days[ok], v[ok]
+    if len(days) > 1 and np.any(np.diff(days) <= 0):
+        # 날짜 순 정렬, 같은 날짜는 마지막 값
+        order = np.argsort(days, kind="stable")
+        days, v = days[order], v[order]
+        last = np.append(days[1:] != days[:-1], True)
+        days, v = days[last], v[last]
+    # 기존 int(now)와 같이 소수점 버림 (저장된 이력 / 구간 경계 유지)
+    return days, np.trunc(v).astype(np.uint8)
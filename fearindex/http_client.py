@@ -0,0 +1,97 @@
+"""공용 HTTP 클라이언트 (keep-alive 연결 재사용, 지터 재시도, 조건부 요청)"""
+import random, threading, time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+from fearindex import metrics, ratelimit
+
+# 재시도 횟수와 지수 백오프 기준 (초)
+RETRIES = 3
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 호스트 호출 한도를 낮추는 응답 (ratelimit)
+THROTTLE_STATUS = {429, 503}
+
+# 프로세스 공용 세션 (호스트별 연결 풀 재사용)
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# 조건부 요청용 URL별 검증자/본문: url -> (ETag, Last-Modified, 본문)
+_validators: dict[str, tuple[str | None, str | None, bytes]] = {}
+_lock = threading.Lock()
+
+def _retry_after(resp: requests.Response | None) -> float | None:
+    value = resp.headers.get("Retry-After", "") if resp is not None else ""
+    return float(value) if value.isdigit() else None
+
+def _sleep_before_retry(attempt: int, resp: requests.Response | None) -> None:
+    """지수 백오프 + full jitter (429/503의 Retry-After 우선)"""
+    delay = random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** attempt))
+    retry_after = _retry_after(resp)
+    if retry_after is not None:
+        delay = min(MAX_BACKOFF, retry_after)
+    time.sleep(delay)
+
+def _request(host: str, url: str, headers: dict | None, timeout: float) -> requests.Response:
+    for attempt in range(RETRIES + 1):
+        resp = None
+        ratelimit.acquire(host)
+        try:
+            resp = _session.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == RETRIES:
+                raise
+        else:
+            throttled = resp.status_code in THROTTLE_STATUS
+            ratelimit.feedback(host, "throttled" if throttled else "ok", _retry_after(resp) if throttled else None)
+            if resp.status_code not in RETRY_STATUS or attempt == RETRIES:
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                metrics.note(nbytes=len(resp.content))
+                return resp
+        _sleep_before_retry(attempt, resp)
+    raise RuntimeError("unreachable")
+
+def request(url: str, headers: dict | None = None, timeout: float = 10) -> requests.Response:
+    """GET (호스트 호출 한도, 같은 요청 합치기, 연결 오류/시간 초과/일시적 상태 코드는 재시도, 그 외 4xx/5xx는 HTTPError)"""
+    host = urlsplit(url).hostname or url
+    key = (host, url, tuple(sorted((headers or {}).items())))
+    return ratelimit.coalesce(key, lambda: _request(host, url, headers, timeout))
+
+def get_conditional(url: str, headers: dict | None = None, timeout: float = 10) -> tuple[bytes, bool]:
+    """조건부 GET (ETag/Last-Modified) -> (본문, 변경 없음 여부)
+
+    304 응답이면 직전에 받은 본문을 그대로 돌려준다.
+    """
+    with _lock:
+        cached = _validators.get(url)
+    h = dict(headers or {})
+    if cached is not None:
+        etag, modified, _ = cached
+        if etag:
+            h["If-None-Match"] = etag
+        if modified:
+            h["If-Modified-Since"] = modified
+    resp = request(url, headers=h, timeout=timeout)
+    if resp.status_code == 304 and cached is not None:
+        metrics.note(cache="hit")
+        return cached[2], True
+    metrics.note(cache="miss")
+
+    etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    with _lock:
+        if etag or modified:
+            _validators[url] = (etag, modified, resp.content)
+        else:
+            _validators.pop(url, None)
+    return resp.content, False
+
+def post_json(url: str, payload, timeout: float = 10) -> requests.Response:
+    """JSON POST (웹훅 등, 재시도 없음, 4xx/5xx는 HTTPError)"""
+    resp = _session.post(url, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    return resp
@@ -0,0 +1,244 @@
+"""증분 지표 엔진 (이동평균 / RSI / 누적 고점·MDD / 기간 고가)
+
+티커별 상태(윈도 버퍼, 누적 고점, 평균 상승·하락폭)를 들고 있다가
+새 일봉이 붙으면 봉 하나만 반영한다. 봉당 비용은 히스토리 길이와 무관하다.
+초기화(init)는 기존 pandas 계산(rolling/cummax/calculate_rsi)으로 마지막 값을 구하고
+그 꼬리 구간으로 상태를 채우므로 배치 결과와 같다. 이동평균은 합산 순서가 pandas와 달라
+마지막 자리(ulp)까지 같지는 않으므로 tests/test_indicators.py와 python -m bench.check로 오차와 기준값 판정을 확인한다.
+"""
+import datetime, math
+from collections import deque
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+class RollingMean:
+    """고정 윈도 단순 이동평균 (pandas rolling(window).mean()과 동일한 NaN 규칙, 값은 ulp 차이 이내)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf: deque[float] = deque(maxlen=window)
+
+    def update(self, x: float) -> float:
+        self._buf.append(x)
+        return self.value
+
+    def clone(self) -> "RollingMean":
+        c = RollingMean(self.window)
+        c._buf.extend(self._buf)
+        return c
+
+    @property
+    def value(self) -> float:
+        if len(self._buf) < self.window or any(math.isnan(v) for v in self._buf):
+            return math.nan
+        return math.fsum(self._buf) / self.window
+
+class RSI:
+    """calculate_rsi(SMA 방식)와 같은 정의의 RSI"""
+
+    def __init__(self, period: int = 14):
+        self.gain = RollingMean(period)
+        self.loss = RollingMean(period)
+
+    def clone(self) -> "RSI":
+        c = RSI.__new__(RSI)
+        c.gain, c.loss = self.gain.clone(), self.loss.clone()
+        return c
+
+    def update(self, delta: float) -> float:
+        # calculate_rsi는 첫 봉(delta NaN)을 상승/하락 0으로 본다
+        self.gain.update(delta if delta > 0 else 0.0)
+        self.loss.update(-delta if delta < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        g, l = self.gain.value, self.loss.value
+        if math.isnan(g) or math.isnan(l) or (g == 0 and l == 0):
+            return math.nan
+        if l == 0:
+            return 100.0
+        return 100 - 100 / (1 + g / l)
+
+class WindowMax:
+    """최근 days일 최댓값 (단조 덱, 봉당 상각 O(1))"""
+
+    def __init__(self, days: int):
+        self.days = days
+        self._dq: deque[tuple[pd.Timestamp, float]] = deque()
+
+    def update(self, date: pd.Timestamp, x: float) -> None:
+        if math.isnan(x):
+            return
+        while self._dq and self._dq[-1][1] <= x:
+            self._dq.pop()
+        self._dq.append((date, x))
+
+    def clone(self) -> "WindowMax":
+        c = WindowMax(self.days)
+        c._dq.extend(self._dq)
+        return c
+
+    def value(self, since: pd.Timestamp) -> float:
+        """since 이후 구간 최댓값"""
+        while self._dq and self._dq[0][0] < since:
+            self._dq.popleft()
+        return self._dq[0][1] if self._dq else math.nan
+
+class TickerState:
+    """티커 하나의 증분 지표 상태"""
+
+    def __init__(self, ma_windows: tuple[int, ...] = (5, 20), rsi_period: int = 14, high_days: int = 90):
+        self._reset(ma_windows, rsi_period, high_days)
+
+    def _reset(self, ma_windows: tuple[int, ...], rsi_period: int, high_days: int) -> None:
+        self.last_date: pd.Timestamp | None = None
+        self.last_close = math.nan
+        self.prev_close = math.nan
+        self.ath = math.nan
+        self.mas = {w: RollingMean(w) for w in ma_windows}
+        self.rsi = RSI(rsi_period)
+        self.high = WindowMax(high_days)
+        # 마지막 봉이 장중에 다시 오면 되돌리기 위한 직전 상태
+        self._before_last: "TickerState | None" = None
+
+    def update(self, date: pd.Timestamp, close: float, high: float | None = None) -> None:
+        """일봉 하나 반영 (마지막 봉과 같은 날짜면 그 봉을 교체)"""
+        if self.last_date is not None and date == self.last_date and self._before_last is not None:
+            restored = self._before_last
+            self.__dict__.update(restored.__dict__)
+        self._before_last = self._clone()
+
+        delta = close - self.last_close if not math.isnan(self.last_close) else math.nan
+        self.prev_close = self.last_close
+        self.last_close = close
+        self.last_date = date
+        self.ath = close if math.isnan(self.ath) else max(self.ath, close)
+        for m in self.mas.values():
+            m.update(close)
+        self.rsi.update(delta)
+        self.high.update(date, close if high is None else high)
+
+    def _clone(self) -> "TickerState":
+        """직전 상태 보관용 사본 (윈도 버퍼만 복사, 원소는 불변 값)"""
+        c = TickerState.__new__(TickerState)
+        c.__dict__.update(self.__dict__)
+        c.mas = {w: m.clone() for w, m in self.mas.items()}
+        c.rsi = self.rsi.clone()
+        c.high = self.high.clone()
+        c._before_last = None
+        return c
+
+    def init(self, df: pd.DataFrame) -> None:
+        """pandas 일봉 프레임으로 상태 초기화 (Close 필수, High 선택)"""
+        close = df["Close"].astype(float).dropna()
+        if close.empty:
+            return
+        high = df["High"].astype(float).reindex(close.index) if "High" in df.columns else close
+        self.init_arrays(close.index.to_numpy(dtype="datetime64[ns]"), close.to_numpy(), high.to_numpy())
+
+    def init_arrays(self, dates: np.ndarray, close: np.ndarray, high: np.ndarray,
+                    _with_before: bool = True) -> None:
+        """배열(날짜 오름차순, 종가에 NaN 없음)로 상태 초기화
+
+        pandas 배치 계산(rolling/cummax/calculate_rsi)의 마지막 값과 같아지도록
+        꼬리 구간만으로 윈도 버퍼를 채운다.
+        """
+        if len(close) == 0:
+            return
+        n = self.rsi.gain.window
+        self._reset(tuple(self.mas), n, self.high.days)
+
+        for w, m in self.mas.items():
+            m._buf.extend(close[-w:].tolist())
+        # calculate_rsi와 같이 첫 봉은 상승/하락 0
+        delta = np.diff(close[-(n + 1):], prepend=np.nan) if len(close) > n else np.diff(close, prepend=np.nan)
+        self.rsi.gain._buf.extend(np.where(delta > 0, delta, 0.0).tolist())
+        self.rsi.loss._buf.extend(np.where(delta < 0, -delta, 0.0).tolist())
+
+        last = pd.Timestamp(dates[-1])
+        recent = dates >= (last - pd.Timedelta(days=self.high.days)).to_datetime64()
+        for d, h in zip(pd.DatetimeIndex(dates[recent]), high[recent].tolist()):
+            self.high.update(d, h)
+
+        self.ath = float(close.max())
+        self.last_date = last
+        self.last_close = float(close[-1])
+        self.prev_close = float(close[-2]) if len(close) >= 2 else math.nan
+
+        # 마지막 봉 교체용 직전 상태 (한 봉 짧은 배열로 초기화)
+        if _with_before and len(close) >= 2:
+            before = TickerState(tuple(self.mas), n, self.high.days)
+            before.init_arrays(dates[:-1], close[:-1], high[:-1], _with_before=False)
+            self._before_last = before
+
+    def values(self, now: datetime.datetime | None = None) -> dict:
+        """현재 지표 값 (기간 고가는 now 기준 high_days일)"""
+        now = pd.Timestamp(now or datetime.datetime.now())
+        high = self.high.value(now - pd.Timedelta(days=self.high.days))
+        dd = (self.last_close - high) / high * 100 if high and not math.isnan(high) else math.nan
+        return {
+            "date": self.last_date,
+            "close": self.last_close,
+            "dod_pct": (self.last_close / self.prev_close - 1) * 100 if self.prev_close else math.nan,
+            "ath": self.ath,
+            "mdd_pct": (self.last_close / self.ath - 1) * 100 if self.ath else math.nan,
+            "high_window": high,
+            "drawdown_pct": dd,
+            "rsi": self.rsi.value,
+            **{f"ma{w}": m.value for w, m in self.mas.items()},
+        }
+
+class IndicatorBook:
+    """티커별 증분 지표 상태 모음"""
+
+    def __init__(self, **state_kwargs):
+        self._states: dict[str, TickerState] = {}
+        self._kwargs = state_kwargs
+
+    def needs_init(self, ticker: str, df: pd.DataFrame) -> bool:
+        """상태가 없거나 이미 반영한 봉이 바뀌어 배치 초기화가 필요한지"""
+        state = self._states.get(ticker)
+        return state is None or state.last_date is None or state.last_date not in df.index \
+            or (state._before_last is not None and state._before_last.last_date is not None
+                and state._before_last.last_date in df.index
+                and df.at[state._before_last.last_date, "Close"] != state._before_last.last_close)
+
+    def sync(self, ticker: str, df: pd.DataFrame) -> TickerState | None:
+        """일봉 프레임의 새 봉만 반영 (과거 봉이 바뀌었으면 다시 초기화)"""
+        if df is None or df.empty:
+            return self._states.get(ticker)
+        if self.needs_init(ticker, df):
+            state = TickerState(**self._kwargs)
+            state.init(df)
+            self._states[ticker] = state
+            return state
+        return self._advance(self._states[ticker], df)
+
+    def sync_many(self, bars: dict[str, pd.DataFrame],
+                  init_many: Callable[[dict[str, pd.DataFrame], dict], dict[str, TickerState]] | None = None,
+                  ) -> dict[str, TickerState]:
+        """여러 티커 동기화 (초기화가 필요한 티커는 init_many로 한 번에, 예: 프로세스 풀)"""
+        bars = {t: df for t, df in bars.items() if df is not None and not df.empty}
+        cold = {t: df for t, df in bars.items() if self.needs_init(t, df)} if init_many is not None else {}
+        done = init_many(cold, self._kwargs) if cold else {}
+        self._states.update(done)
+        for t, df in bars.items():
+            if t not in done:
+                self.sync(t, df)
+        return {t: self._states[t] for t in bars if t in self._states}
+
+    def _advance(self, state: TickerState, df: pd.DataFrame) -> TickerState:
+        i = df.index.searchsorted(state.last_date)
+        close = df["Close"].to_numpy(dtype=float)[i:]
+        high = df["High"].to_numpy(dtype=float)[i:] if "High" in df.columns else None
+        for k, d in enumerate(df.index[i:]):
+            if d == state.last_date and close[k] == state.last_close:
+                continue
+            state.update(d, float(close[k]), None if high is None else float(high[k]))
+        return state
+
+    def get(self, ticker: str) -> TickerState | None:
+        return self._states.get(ticker)
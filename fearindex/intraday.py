@@ -0,0 +1,86 @@
+"""장중 실시간 모드 (1분봉 증분 조회로 일봉 종가 시계열의 당일 값 갱신)
+
+심볼마다 마지막으로 본 분봉 시각 이후만 요청하고(작은 요청 1회), 마지막 분봉 종가를
+일봉 스냅샷의 당일 종가로 덮어써 카드 값 / 전일 대비 / 이동평균 이격도가 따라 움직이게 한다.
+같은 프로세스의 여러 세션이 같은 심볼을 보고 있어도 POLL_INTERVAL 안에는 한 번만 요청하고,
+미국 정규장이 아니면 요청하지 않는다.
+"""
+import datetime, threading
+from typing import Callable
+
+import pandas as pd
+
+from fearindex import market_hours, ratelimit, sources
+
+# 분봉 증분 조회 간격
+POLL_INTERVAL = datetime.timedelta(seconds=30)
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+class Tracker:
+    """심볼 하나의 마지막 분봉 (시각, 종가)"""
+
+    def __init__(self, ticker: str, fetch: Callable[[str, pd.Timestamp | None], pd.DataFrame] | None = None,
+                 interval: datetime.timedelta = POLL_INTERVAL):
+        self.ticker = ticker
+        # 카드 값 갱신이라 업스트림 호출 우선
+        self._fetch = fetch or ratelimit.prioritized(ratelimit.CARDS, sources.fetch_minute_bars)
+        self._interval = interval
+        self._lock = threading.Lock()
+        self.last_ts: pd.Timestamp | None = None  # 마지막 분봉 시각 (US Eastern)
+        self.last_close: float | None = None
+        self.polled_at: datetime.datetime | None = None
+
+    def poll(self, now: datetime.datetime | None = None) -> pd.Timestamp | None:
+        """정규장이고 간격이 지났으면 마지막 분봉 이후만 조회 -> 마지막 분봉 시각"""
+        now = now or _utcnow()
+        with self._lock:
+            if not market_hours.is_open("us", now):
+                return self.last_ts
+            if self.polled_at is not None and now - self.polled_at < self._interval:
+                return self.last_ts
+            self.polled_at = now
+            # 이전 세션 분봉이면 당일 세션 처음부터
+            today = now.astimezone(market_hours.ET).date()
+            since = self.last_ts if self.last_ts is not None and self.last_ts.date() == today else None
+            bars = self._fetch(self.ticker, since)
+            if bars is not None and not bars.empty:
+                idx = bars.index if bars.index.tz is not None else bars.index.tz_localize(market_hours.ET)
+                self.last_ts = idx[-1].tz_convert(market_hours.ET)
+                self.last_close = float(bars["Close"].iloc[-1])
+            return self.last_ts
+
+    def merge(self, hist: pd.DataFrame, now: datetime.datetime | None = None) -> pd.DataFrame:
+        """일봉 종가 프레임에 마지막 분봉 종가를 당일 값으로 반영 (원본은 그대로, 새 프레임 반환)
+
+        장 마감 후 일봉에 당일 확정치가 들어오면 분봉 값으로 덮어쓰지 않는다.
+        """
+        with self._lock:
+            ts, close = self.last_ts, self.last_close
+        if ts is None or hist is None or hist.empty:
+            return hist
+        day = pd.Timestamp(ts.date())
+        last_day = hist.index[-1]
+        if last_day > day or (last_day == day and not market_hours.is_open("us", now)):
+            return hist
+        out = hist.copy()
+        out.loc[day, "Close"] = close
+        return out.astype(hist.dtypes.to_dict())
+
+_trackers: dict[str, Tracker] = {}
+_lock = threading.Lock()
+
+def tracker(ticker: str) -> Tracker:
+    """프로세스 공용 심볼별 추적기"""
+    with _lock:
+        t = _trackers.get(ticker)
+        if t is None:
+            t = _trackers[ticker] = Tracker(ticker)
+        return t
+
+def live(ticker: str, hist: pd.DataFrame) -> pd.DataFrame:
+    """분봉 증분 조회 후 당일 값을 반영한 일봉 종가 프레임"""
+    t = tracker(ticker)
+    t.poll()
+    return t.merge(hist)
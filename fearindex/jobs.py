@@ -0,0 +1,52 @@
+"""탭별 조회 작업 정의 (대시보드와 스냅샷 생산자가 같은 키/정책을 쓰도록 한곳에 둔다)"""
+from functools import partial
+
+import pandas as pd
+
+from fearindex import config, market_hours, ratelimit, sources
+
+# AI전력 탭 한 페이지 종목 수 (페이지 단위로 조회)
+STOCK_PAGE = 50
+
+def fear_keys(cfg: config.Config) -> list[str]:
+    return ["fgi", f"hist:{cfg.qqq}", f"hist:{cfg.vix}"]
+
+def etf_key(code: str) -> str:
+    return f"etf:{code}"
+
+def stock_pages(cfg: config.Config) -> list[tuple[str, ...]]:
+    tickers = cfg.tickers
+    return [tickers[i:i + STOCK_PAGE] for i in range(0, len(tickers), STOCK_PAGE)] or [()]
+
+def stock_key(page_tickers: tuple[str, ...]) -> str:
+    return "stocks:" + ",".join(page_tickers)
+
+def register_fear(p, cfg: config.Config) -> list[str]:
+    """Fear 탭 (FGI / QQQ / VIX, 첫 화면 카드라 업스트림 호출 우선)"""
+    fgi, qqq, vix = fear_keys(cfg)
+    cards = partial(ratelimit.prioritized, ratelimit.CARDS)
+    p.register(fgi, cards(sources.fetch_fgi_history), market_hours.FGI, default=pd.DataFrame(), timeout=25)
+    p.register(qqq, cards(partial(sources.fetch_history, cfg.qqq)), market_hours.DAILY_US)
+    p.register(vix, cards(partial(sources.fetch_history, cfg.vix)), market_hours.DAILY_US)
+    return [fgi, qqq, vix]
+
+def register_etfs(p, cfg: config.Config) -> list[str]:
+    """Target 탭 (국내 ETF 카드)"""
+    keys = []
+    for code, _ in cfg.etfs:
+        p.register(etf_key(code), ratelimit.prioritized(ratelimit.CARDS, partial(sources.fetch_etf_data, code, n=20)),
+                   market_hours.DAILY_KRX)
+        keys.append(etf_key(code))
+    return keys
+
+def register_stocks(p, page_tickers: tuple[str, ...]) -> str:
+    """AI전력 탭 한 페이지 (장중 5분 간격, 표라서 카드 조회 뒤에)"""
+    key = stock_key(page_tickers)
+    p.register(key, ratelimit.prioritized(ratelimit.TABLES, partial(sources.fetch_stocks, page_tickers)),
+               market_hours.QUOTES_US, default=pd.DataFrame())
+    return key
+
+def register_all(p, cfg: config.Config) -> list[str]:
+    """모든 탭 작업 등록 (스냅샷 생산자용)"""
+    keys = register_fear(p, cfg) + register_etfs(p, cfg)
+    return keys + [register_stocks(p, page) for page in stock_pages(cfg)]
@@ -0,0 +1,160 @@
+"""시장별 정규장 시간과 캐시 유효기간 정책 (KRX: KST / 미국: US Eastern)
+
+휴장일 / 조기 폐장 표는 연도별로 직접 관리한다. 표에 없는 연도는 주말만 휴장으로 보므로
+경고를 한 번 남기고 유효기간을 UNCOVERED_TTL 이내로 줄인다 (휴장일을 놓쳐도 곧 다시 받음).
+"""
+import datetime, logging, zoneinfo
+from dataclasses import dataclass
+
+KST = zoneinfo.ZoneInfo("Asia/Seoul")
+ET = zoneinfo.ZoneInfo("America/New_York")
+
+# 시장: (타임존, 개장, 마감)
+SESSIONS = {
+    "krx": (KST, datetime.time(9, 0), datetime.time(15, 30)),
+    "us": (ET, datetime.time(9, 30), datetime.time(16, 0)),
+}
+
+def _dates(*days: str) -> frozenset:
+    return frozenset(datetime.date.fromisoformat(d) for d in days)
+
+# 알려진 휴장일 (표에 없는 연도는 주말만 휴장으로 본다, COVERED_YEARS 참고)
+HOLIDAYS = {
+    "us": _dates(
+        "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26",
+        "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25",
+        "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+        "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+        "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31", "2027-06-18",
+        "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+    ),
+    "krx": _dates(
+        "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+        "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15",
+        "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25",
+        "2025-12-31",
+        "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01",
+        "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25",
+        "2026-10-05", "2026-10-09", "2026-12-25", "2026-12-31",
+        "2027-01-01", "2027-02-08", "2027-02-09", "2027-03-01", "2027-05-05", "2027-05-13",
+        "2027-08-16", "2027-09-14", "2027-09-15", "2027-09-16", "2027-10-04", "2027-10-11",
+        "2027-12-27", "2027-12-31",
+    ),
+}
+
+# 조기 폐장일: 마감 시각
+EARLY_CLOSES = {
+    "us": {
+        d: datetime.time(13, 0)
+        for d in _dates("2025-07-03", "2025-11-28", "2025-12-24", "2026-11-27", "2026-12-24", "2027-11-26")
+    },
+    "krx": {},
+}
+
+# 휴장일 표가 있는 연도
+COVERED_YEARS = {m: range(min(d.year for d in days), max(d.year for d in days) + 1) for m, days in HOLIDAYS.items()}
+
+# 표 밖 연도의 최대 유효기간
+UNCOVERED_TTL = datetime.timedelta(hours=1)
+
+# 마감 후 일봉 종가 확정까지 대기
+SETTLE = datetime.timedelta(minutes=20)
+
+log = logging.getLogger("fearindex.market_hours")
+_warned: set[tuple[str, int]] = set()
+
+@dataclass(frozen=True)
+class Policy:
+    """캐시 유효기간 정책
+
+    open_interval이 None이면 일봉 데이터: 다음 마감(+settle)까지 유효.
+    값이 있으면 장중 그 간격으로 갱신하고, 마감 후 한 번 더 받은 뒤 다음 개장까지 유효.
+    """
+    market: str
+    open_interval: datetime.timedelta | None = None
+    settle: datetime.timedelta = SETTLE
+
+# 일봉 (QQQM/VIX 히스토리, KRX ETF)
+DAILY_US = Policy("us")
+DAILY_KRX = Policy("krx")
+# 장중 시세 (tab3 현재가)
+QUOTES_US = Policy("us", open_interval=datetime.timedelta(minutes=5))
+# FGI: 미국 장중 1시간 간격, 마감 1시간 뒤 당일 확정치
+FGI = Policy("us", open_interval=datetime.timedelta(hours=1), settle=datetime.timedelta(hours=1))
+
+def _now(now: datetime.datetime | None) -> datetime.datetime:
+    return now if now is not None else datetime.datetime.now(datetime.timezone.utc)
+
+def covered(market: str, day: datetime.date) -> bool:
+    """day가 휴장일 표 범위 안인지 (밖이면 연도별로 한 번 경고)"""
+    if day.year in COVERED_YEARS[market]:
+        return True
+    if (market, day.year) not in _warned:
+        _warned.add((market, day.year))
+        log.warning("%s %d년 휴장일 표 없음: 주말만 휴장으로 보고 캐시 유효기간을 %s 이내로 제한", market, day.year, UNCOVERED_TTL)
+    return False
+
+def is_trading_day(market: str, day: datetime.date) -> bool:
+    return day.weekday() < 5 and day not in HOLIDAYS[market]
+
+def _session(market: str, day: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+    tz, open_t, close_t = SESSIONS[market]
+    close_t = EARLY_CLOSES[market].get(day, close_t)
+    return datetime.datetime.combine(day, open_t, tz), datetime.datetime.combine(day, close_t, tz)
+
+def is_open(market: str, now: datetime.datetime | None = None) -> bool:
+    """정규장 개장 여부"""
+    tz = SESSIONS[market][0]
+    local = _now(now).astimezone(tz)
+    if not is_trading_day(market, local.date()):
+        return False
+    start, end = _session(market, local.date())
+    return start <= local < end
+
+def _next_session_time(market: str, now: datetime.datetime, which: int) -> datetime.datetime:
+    tz = SESSIONS[market][0]
+    local = now.astimezone(tz)
+    day = local.date()
+    while True:
+        if is_trading_day(market, day):
+            t = _session(market, day)[which]
+            if t > local:
+                return t
+        day += datetime.timedelta(days=1)
+
+def next_open(market: str, now: datetime.datetime | None = None) -> datetime.datetime:
+    """now 이후 첫 정규장 개장 시각"""
+    return _next_session_time(market, _now(now), 0)
+
+def next_close(market: str, now: datetime.datetime | None = None) -> datetime.datetime:
+    """now 이후 첫 정규장 마감 시각"""
+    return _next_session_time(market, _now(now), 1)
+
+def valid_until(policy: Policy, now: datetime.datetime | None = None) -> datetime.datetime:
+    """now에 받은 데이터의 만료 시각 (휴장일 표 밖이면 UNCOVERED_TTL 이내)"""
+    now = _now(now)
+    until = _valid_until(policy, now)
+    tz = SESSIONS[policy.market][0]
+    if not (covered(policy.market, now.astimezone(tz).date()) and covered(policy.market, until.astimezone(tz).date())):
+        return min(until, now + UNCOVERED_TTL)
+    return until
+
+def _valid_until(policy: Policy, now: datetime.datetime) -> datetime.datetime:
+    market = policy.market
+    if is_open(market, now):
+        close = next_close(market, now)
+        if policy.open_interval is None:
+            return close + policy.settle
+        # 장중 마지막 갱신 뒤 마감 확정치도 한 번 더 받는다
+        return min(now + policy.open_interval, close + policy.settle)
+
+    # 마감 직후 확정치 대기 중
+    today = now.astimezone(SESSIONS[market][0]).date()
+    if is_trading_day(market, today):
+        last_close = _session(market, today)[1]
+        if last_close <= now < last_close + policy.settle:
+            return last_close + policy.settle
+
+    if policy.open_interval is None:
+        return next_close(market, now) + policy.settle
+    return next_open(market, now)
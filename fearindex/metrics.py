@@ -0,0 +1,167 @@
+"""조회 함수 계측 (소요 시간 / 캐시 적중 / 행 수 / 전송 바이트 / 오류 클래스)
+
+@timed로 감싼 함수는 호출마다 Call 하나를 남긴다. 함수 안쪽(HTTP 클라이언트, 일봉 캐시)에서
+note()로 캐시 적중 여부와 전송량을 현재 호출에 더하고, 예외를 삼키는 조회 함수는 error()로
+오류 클래스만 남긴다. 최근 기록은 메모리 링 버퍼에 두고(진단 패널), FEAR_INDEX_METRICS가
+설정되어 있으면 JSON Lines로도 덧붙인다(생산자 프로세스 등 다른 프로세스 분석용).
+
+    python -m fearindex.metrics .cache/metrics.jsonl
+"""
+import argparse, contextvars, datetime, functools, json, logging, os, threading, time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import pandas as pd
+
+METRICS_PATH = os.environ.get("FEAR_INDEX_METRICS")
+
+# 메모리에 보관하는 최근 호출 수
+HISTORY = 2000
+
+log = logging.getLogger("fearindex.metrics")
+
+@dataclass
+class Call:
+    name: str
+    arg: str | None              # 첫 번째 문자열 인자 (티커 / 표 제목)
+    at: str                      # 시작 시각 (UTC, ISO)
+    wall_ms: float = 0.0
+    cache: str | None = None     # hit / miss (캐시를 거치지 않으면 None)
+    rows: int | None = None      # 반환 행 수
+    nbytes: int = 0              # 업스트림에서 받은 바이트 (HTTP 본문 / 다운로드 프레임 크기)
+    error: str | None = None     # 예외 클래스 이름
+    thread: str = ""
+
+_calls: deque[Call] = deque(maxlen=HISTORY)
+_lock = threading.Lock()
+_current: contextvars.ContextVar[Call | None] = contextvars.ContextVar("fearindex_metrics_call", default=None)
+
+def _rows(value: Any) -> int | None:
+    """반환값 행 수 (프레임 / 튜플 첫 원소 / dict / None)"""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, tuple) and value and isinstance(value[0], pd.DataFrame):
+        return len(value[0])
+    if isinstance(value, dict):
+        return len(value)
+    if value is None:
+        return 0
+    return None
+
+def frame_bytes(df: pd.DataFrame | None) -> int:
+    """다운로드 프레임 크기 (전송 바이트를 알 수 없는 업스트림의 근사값)"""
+    if df is None or df.empty:
+        return 0
+    return int(df.memory_usage(index=True).sum())
+
+def note(cache: str | None = None, nbytes: int = 0) -> None:
+    """진행 중인 계측 호출에 캐시 적중 여부 / 전송 바이트 추가 (계측 밖이면 무시)"""
+    call = _current.get()
+    if call is None:
+        return
+    if cache is not None:
+        # 한 번이라도 전체 조회했으면 miss
+        call.cache = "miss" if "miss" in (call.cache, cache) else cache
+    call.nbytes += int(nbytes)
+
+def error(e: BaseException) -> None:
+    """예외를 삼키는 조회 함수에서 오류 클래스 기록"""
+    call = _current.get()
+    if call is not None:
+        call.error = type(e).__name__
+
+def _emit(call: Call) -> None:
+    with _lock:
+        _calls.append(call)
+    if log.isEnabledFor(logging.DEBUG) or METRICS_PATH:
+        line = json.dumps(asdict(call), ensure_ascii=False)
+        log.debug(line)
+        if METRICS_PATH:
+            try:
+                with open(METRICS_PATH, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+def timed(name: str | None = None) -> Callable:
+    """조회 함수 계측 데코레이터"""
+    def deco(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            arg = args[0] if args and isinstance(args[0], str) else None
+            call = Call(label, arg, datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+                        thread=threading.current_thread().name)
+            token = _current.set(call)
+            t0 = time.perf_counter()
+            try:
+                value = fn(*args, **kwargs)
+                call.rows = _rows(value)
+                return value
+            except BaseException as e:
+                call.error = type(e).__name__
+                raise
+            finally:
+                call.wall_ms = (time.perf_counter() - t0) * 1000
+                _current.reset(token)
+                _emit(call)
+        return wrapper
+    return deco
+
+def calls() -> list[Call]:
+    """최근 호출 기록 (오래된 순)"""
+    with _lock:
+        return list(_calls)
+
+def clear() -> None:
+    with _lock:
+        _calls.clear()
+
+def frame(records: list[Call] | list[dict] | None = None) -> pd.DataFrame:
+    """호출 기록 프레임"""
+    records = calls() if records is None else records
+    rows = [asdict(r) if isinstance(r, Call) else r for r in records]
+    return pd.DataFrame(rows, columns=[f for f in Call.__dataclass_fields__])
+
+def summary(records: list[Call] | list[dict] | None = None) -> pd.DataFrame:
+    """함수별 요약 (호출 수, 소요 시간 p50/p95/최대, 캐시 적중률, 반환 행, 전송량, 오류 수)"""
+    df = frame(records)
+    if df.empty:
+        return pd.DataFrame()
+    g = df.groupby("name", sort=False)
+    out = pd.DataFrame({
+        "calls": g.size(),
+        "p50_ms": g["wall_ms"].median(),
+        "p95_ms": g["wall_ms"].quantile(0.95),
+        "max_ms": g["wall_ms"].max(),
+        "total_ms": g["wall_ms"].sum(),
+        "hit_%": g["cache"].apply(lambda c: c.eq("hit").sum() / c.notna().sum() * 100 if c.notna().any() else float("nan")),
+        "rows": g["rows"].mean(),
+        "kib": g["nbytes"].sum() / 1024,
+        "errors": g["error"].apply(lambda e: e.notna().sum()),
+        "last_error": g["error"].apply(lambda e: e.dropna().iloc[-1] if e.notna().any() else None),
+    })
+    return out.sort_values("total_ms", ascending=False)
+
+def read_jsonl(path: str | os.PathLike) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.metrics", description="계측 로그(JSON Lines) 요약")
+    parser.add_argument("path", nargs="?", default=METRICS_PATH)
+    parser.add_argument("--since", default=None, help="이 시각(UTC, ISO) 이후 호출만")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("path 또는 FEAR_INDEX_METRICS 필요")
+
+    records = read_jsonl(args.path)
+    if args.since:
+        records = [r for r in records if r["at"] >= args.since]
+    pd.set_option("display.width", 200)
+    print(summary(records).round(1).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""독립 데이터 소스 동시 조회
+
+FGI / Yahoo / KRX 조회는 서로 독립이므로 한 번에 스레드 풀로 보내고
+소스별 제한시간까지만 기다린다. 전체 소요 시간은 가장 느린 소스 하나 수준이 된다.
+"""
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# 소스별 기본 제한시간 (초)
+DEFAULT_TIMEOUT = 30.0
+
+# 프로세스 공용 조회 풀 (제한시간을 넘긴 작업은 풀에서 끝까지 실행된다)
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fearindex-fetch")
+
+@dataclass
+class Result:
+    value: Any = None
+    error: str | None = None      # 예외 클래스 이름
+    elapsed: float | None = None  # 소요 시간 (초)
+    timed_out: bool = False
+
+def _timed(fn: Callable[[], Any]) -> Result:
+    t0 = time.monotonic()
+    try:
+        return Result(fn(), None, time.monotonic() - t0)
+    except Exception as e:
+        return Result(None, type(e).__name__, time.monotonic() - t0)
+
+def submit(fn: Callable[[], Any]) -> Future:
+    """작업 하나를 공용 풀로 보냄 (결과는 gather로 기다림)"""
+    return _POOL.submit(_timed, fn)
+
+def gather(futures: dict[str, Future],
+           timeout: float | dict[str, float] = DEFAULT_TIMEOUT) -> dict[str, Result]:
+    """보낸 작업들을 제한시간까지 기다려 {키: Result} 묶음 반환
+
+    timeout은 공통 값 또는 {키: 초}. 제한시간을 넘긴 작업은 timed_out으로 표시한다.
+    """
+    t0 = time.monotonic()
+    out = {}
+    for k, fut in futures.items():
+        limit = timeout.get(k, DEFAULT_TIMEOUT) if isinstance(timeout, dict) else timeout
+        try:
+            out[k] = fut.result(timeout=max(0.0, t0 + limit - time.monotonic()))
+        except FutureTimeout:
+            out[k] = Result(None, "TimeoutError", time.monotonic() - t0, True)
+    return out
+
+def fetch_all(tasks: dict[str, Callable[[], Any]],
+              timeout: float | dict[str, float] = DEFAULT_TIMEOUT) -> dict[str, Result]:
+    """모든 작업 동시 실행 후 {키: Result} 묶음 반환 (timeout은 gather와 같음)"""
+    return gather({k: submit(fn) for k, fn in tasks.items()}, timeout)
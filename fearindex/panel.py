@@ -0,0 +1,186 @@
+"""시장 간 날짜 정렬 패널 (FGI / VIX / QQQM / 국내 ETF를 미국 거래일 한 행으로)
+
+소스마다 날짜 기준이 다르다. Yahoo 일봉과 FGI는 미국 세션 날짜, FinanceDataReader ETF는 KRX 날짜다.
+패널은 미국 거래일(지수 종가가 있는 날)을 행으로 두고, 각 값은 그날 미국 마감 시각에
+이미 확정돼 있던 마지막 값(as-of)으로 채운다. KRX 세션 k는 KST 15:30에 마감해 같은 날짜
+미국 마감보다 앞서므로, 미국 거래일 d에는 k ≤ d인 마지막 KRX 값이 들어간다 (미래 값 사용 없음).
+
+휴장/누락으로 값이 없는 날은 FILL_DAYS(달력일) 안에서만 앞 값을 유지하고 그 이후는 NaN이다.
+파생 지표(전일/전주 대비, 1년 고점 대비)는 정렬 전에 각 소스 자체 거래일 기준으로 계산한다.
+
+패널은 시계열 저장소(timeseries)에서 만들어 float32 Parquet 한 파일로 캐시하고,
+저장소 내용이 바뀌지 않았으면(시리즈별 행 수 / 마지막 날짜 / 합계) 다시 만들지 않는다.
+
+    python -m fearindex.panel                                    # 기간 / 컬럼 요약
+    python -m fearindex.panel --where "vix_wow > 30" --cols etf_379810_mdd qqq_mdd
+    python -m fearindex.panel --corr vix_wow --lags 0 1 5 20
+    python -m fearindex.panel --regime etf_379810_mdd qqq_dod
+"""
+import argparse, json, os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fearindex import compact, config, market_hours, metrics, timeseries
+
+PANEL_PATH = Path(os.environ.get("FEAR_INDEX_PANEL", Path(__file__).resolve().parent.parent / ".cache" / "panel.parquet"))
+
+# 앞 값 유지 한도 (달력일): 미국 연휴 주말 / KRX 설·추석 연휴
+FILL_DAYS = {"us": 4, "krx": 10}
+
+# 고점 대비 하락률 기준 구간 (대시보드 QQQM MDD와 같은 1년)
+MDD_WINDOW = "365D"
+
+# 전주 대비 (거래일, 대시보드 VIX WoW와 같은 정의)
+WOW_SESSIONS = 5
+
+# FGI 구간 경계 (fgi_label과 같은 기준)
+REGIMES = ("Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed")
+_REGIME_BINS = (-np.inf, 24, 44, 55, 75, np.inf)
+
+def series_names(cfg: config.Config) -> dict[str, tuple[str, str]]:
+    """컬럼 접두어 -> (저장소 이름, 시장)"""
+    out = {"fgi": ("fgi", "us"), "qqq": (cfg.qqq, "us"), "vix": (cfg.vix, "us")}
+    out.update({f"etf_{code}": (code, "krx") for code, _ in cfg.etfs})
+    return out
+
+def _close_instants(dates: pd.DatetimeIndex, market: str) -> np.ndarray:
+    """세션 날짜 -> 정규장 마감 시각 (UTC ns, 조기 폐장은 무시: 시장 간 순서에는 영향 없음)"""
+    tz, _, close = market_hours.SESSIONS[market]
+    local = dates.normalize() + pd.Timedelta(hours=close.hour, minutes=close.minute)
+    # 인덱스 해상도(ns/us)와 무관하게 ns로 맞춘다 (FILL_DAYS 비교, 시장 간 searchsorted)
+    return local.tz_localize(tz).tz_convert("UTC").as_unit("ns").asi8
+
+def features(prefix: str, s: pd.Series) -> pd.DataFrame:
+    """소스 자체 거래일 기준 파생 지표 (FGI는 값 그대로)"""
+    if prefix == "fgi":
+        return pd.DataFrame({"fgi": s})
+    peak = s.rolling(MDD_WINDOW).max()
+    return pd.DataFrame({
+        f"{prefix}_close": s,
+        f"{prefix}_dod": s.pct_change() * 100,
+        f"{prefix}_wow": (s / s.shift(WOW_SESSIONS) - 1) * 100,
+        f"{prefix}_mdd": (s / peak - 1) * 100,
+    })
+
+def align(frames: dict[str, tuple[pd.DataFrame, str]], index: pd.DatetimeIndex) -> pd.DataFrame:
+    """소스별 프레임(자체 날짜 인덱스, 시장)을 미국 거래일 index에 as-of 정렬"""
+    rows = _close_instants(index, "us")
+    out = {}
+    for df, market in frames.values():
+        if df.empty:
+            out.update({c: np.full(len(index), np.nan) for c in df.columns})
+            continue
+        obs = _close_instants(df.index, market)
+        # 미국 마감 시각 이전에 마감한 마지막 관측 (searchsorted 한 번으로 전 컬럼)
+        pos = np.searchsorted(obs, rows, side="right") - 1
+        ok = (pos >= 0) & (rows - obs[np.maximum(pos, 0)] <= pd.Timedelta(days=FILL_DAYS[market]).value)
+        take = np.where(ok, pos, 0)
+        values = df.to_numpy(dtype=float)
+        picked = values[take]
+        picked[~ok] = np.nan
+        out.update({c: picked[:, i] for i, c in enumerate(df.columns)})
+    return pd.DataFrame(out, index=index)
+
+def build(cfg: config.Config, store: timeseries.TimeSeriesStore | None = None, start=None) -> pd.DataFrame:
+    """저장소 시계열 -> 미국 거래일 × 지표 패널 (float32)"""
+    store = store or timeseries.default_store()
+    frames, index = {}, pd.DatetimeIndex([], name="date")
+    for prefix, (name, market) in series_names(cfg).items():
+        s = store.range(name)
+        f = features(prefix, s)
+        if start is not None:
+            # 파생 지표는 start 이전 구간까지 보고 계산한 뒤 자른다
+            f = f[f.index >= pd.Timestamp(start)]
+        frames[prefix] = (f, market)
+        if market == "us" and prefix != "fgi":
+            # 행 = 미국 지수 종가가 있는 날 (휴장일 표가 없는 과거 연도도 실제 거래일 기준)
+            index = index.union(f.index)
+    index.name = "date"
+    return compact.shrink(align(frames, index))
+
+def fingerprint(cfg: config.Config, store: timeseries.TimeSeriesStore, start=None) -> str:
+    """패널 입력 식별값 (저장소 시리즈별 행 수 / 마지막 날짜 / 합계 + 정렬 규칙)"""
+    names = [name for name, _ in series_names(cfg).values()]
+    return json.dumps({"series": series_names(cfg), "stats": store.stats(names), "start": str(start),
+                       "fill": FILL_DAYS, "mdd": MDD_WINDOW, "wow": WOW_SESSIONS}, sort_keys=True)
+
+@metrics.timed("panel_load")
+def load(cfg: config.Config | None = None, store: timeseries.TimeSeriesStore | None = None, start=None,
+         path: str | os.PathLike | None = PANEL_PATH) -> pd.DataFrame:
+    """캐시된 패널 (입력이 바뀌었으면 다시 만들어 기록, path=None이면 캐시 없이)"""
+    cfg = cfg or config.load()
+    store = store or timeseries.default_store()
+    if path is None:
+        return build(cfg, store, start)
+    path = Path(path)
+    key = fingerprint(cfg, store, start)
+    if path.exists():
+        try:
+            table = pq.read_table(path)
+            if (table.schema.metadata or {}).get(b"fearindex") == key.encode():
+                metrics.note(cache="hit")
+                return table.to_pandas()
+        except Exception as e:
+            # 깨진 캐시 파일은 다시 만든다
+            metrics.error(e)
+    metrics.note(cache="miss")
+    df = build(cfg, store, start)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"fearindex": key.encode()})
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+    except OSError as e:
+        # 기록 실패는 캐시 없이 진행
+        metrics.error(e)
+    return df
+
+def regime(fgi: pd.Series) -> pd.Series:
+    """FGI -> 구간 이름 (범주형)"""
+    return pd.cut(fgi, _REGIME_BINS, labels=REGIMES)
+
+def regime_stats(panel: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """FGI 구간별 cols 평균 / 중앙값 / 일수"""
+    g = panel[cols].groupby(regime(panel["fgi"]), observed=False)
+    return pd.concat({"mean": g.mean(), "median": g.median(), "days": g.count()}, axis=1)
+
+def lag_corr(panel: pd.DataFrame, x: str, cols: list[str] | None = None, lags=(0, 1, 5, 20)) -> pd.DataFrame:
+    """x(t)와 각 컬럼(t + lag)의 상관계수 (행: lag, 열: 컬럼)"""
+    cols = [c for c in (cols or panel.columns) if c != x]
+    return pd.DataFrame({lag: panel[cols].shift(-lag).corrwith(panel[x]) for lag in lags}).T.rename_axis("lag")
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.panel", description="시장 간 날짜 정렬 패널 조회")
+    parser.add_argument("--config", default=None, help="watchlists.toml 경로")
+    parser.add_argument("--since", default=None, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--where", default=None, help="행 조건 (DataFrame.query 식)")
+    parser.add_argument("--cols", nargs="*", default=None, help="출력 컬럼")
+    parser.add_argument("--corr", default=None, metavar="COL", help="COL과 다른 컬럼의 시차 상관")
+    parser.add_argument("--lags", nargs="*", type=int, default=[0, 1, 5, 20])
+    parser.add_argument("--regime", nargs="*", default=None, metavar="COL", help="FGI 구간별 통계")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    cfg = config.load(args.config)
+    panel = load(cfg, start=args.since, path=None if args.no_cache else PANEL_PATH)
+    pd.set_option("display.width", 200)
+    if args.where:
+        panel = panel.query(args.where)
+    if args.corr:
+        print(lag_corr(panel, args.corr, args.cols, args.lags).round(3).to_string())
+    elif args.regime is not None:
+        print(regime_stats(panel, args.regime or [c for c in panel.columns if c != "fgi"]).round(2).to_string())
+    elif args.where or args.cols:
+        print(panel[args.cols or panel.columns].round(2).to_string())
+    else:
+        print(f"{len(panel)}행 · {panel.index.min():%Y-%m-%d} ~ {panel.index.max():%Y-%m-%d}" if len(panel) else "0행")
+        print(panel.notna().sum().rename("값 있는 날").to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""티커별 지표 선계산 프로세스 풀
+
+종목 수가 많을 때 증분 지표 상태의 배치 초기화(이동평균/누적 고점/RSI 윈도 채우기)를
+프로세스 풀에 티커 묶음 단위로 나눠 보낸다. 일봉은 종가/고가 배열만 Arrow IPC 버퍼로 보내고
+작업 프로세스는 작은 TickerState(윈도 버퍼 몇 개)만 돌려준다.
+이후 갱신은 새 봉만 반영하므로(indicators) 현재 프로세스에서 처리한다.
+
+초기화는 프로세스당 한 번이고 티커당 1ms 안팎이라, 풀 생성(작업 프로세스마다 pandas import,
+1초 안팎)을 넘길 만큼 종목이 많을 때만 이득이다 (python -m bench.run --only workers).
+"""
+import json, logging, multiprocessing, os, threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from fearindex import indicators, metrics
+
+log = logging.getLogger("fearindex.precompute")
+
+# 이보다 적은 티커는 현재 프로세스에서 바로 계산 (풀 생성 비용이 더 큼)
+PARALLEL_MIN = 1000
+
+# 작업 하나가 맡는 티커 수
+CHUNK = 25
+
+# 작업 프로세스 수 (FEAR_INDEX_WORKERS, 기본 CPU 수)
+WORKERS = int(os.environ.get("FEAR_INDEX_WORKERS", 0)) or os.cpu_count() or 1
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    """공용 풀 (스레드가 있는 서버 프로세스를 fork하지 않도록 spawn)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def to_arrow(bars: dict[str, pd.DataFrame]) -> bytes:
+    """{티커: 일봉} -> Arrow IPC 버퍼 (date/close/high 컬럼을 티커 순서로 이어 붙이고 티커별 행 수를 메타데이터로)"""
+    tickers, counts, dates, close, high = [], [], [], [], []
+    for t, df in bars.items():
+        c = df["Close"].astype(float).dropna()
+        h = df["High"].astype(float).reindex(c.index) if "High" in df.columns else c
+        tickers.append(t)
+        counts.append(len(c))
+        dates.append(c.index.to_numpy(dtype="datetime64[ns]"))
+        close.append(c.to_numpy())
+        high.append(h.to_numpy())
+    table = pa.table({
+        "date": np.concatenate(dates) if dates else np.array([], dtype="datetime64[ns]"),
+        "close": np.concatenate(close) if close else np.array([], dtype=float),
+        "high": np.concatenate(high) if high else np.array([], dtype=float),
+    }).replace_schema_metadata({"tickers": json.dumps(tickers), "counts": json.dumps(counts)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as w:
+        w.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def from_arrow(buf: bytes) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """to_arrow의 역변환 -> {티커: (날짜, 종가, 고가) 배열}"""
+    table = pa.ipc.open_stream(buf).read_all()
+    meta = table.schema.metadata
+    tickers, counts = json.loads(meta[b"tickers"]), json.loads(meta[b"counts"])
+    date, close, high = (table.column(c).to_numpy() for c in ("date", "close", "high"))
+    out, i = {}, 0
+    for t, n in zip(tickers, counts):
+        out[t] = (date[i:i + n], close[i:i + n], high[i:i + n])
+        i += n
+    return out
+
+def _init_chunk(buf: bytes, state_kwargs: dict) -> dict[str, indicators.TickerState]:
+    """작업 프로세스: 티커 묶음의 지표 상태 배치 초기화"""
+    out = {}
+    for t, (dates, close, high) in from_arrow(buf).items():
+        state = indicators.TickerState(**state_kwargs)
+        state.init_arrays(dates, close, high)
+        out[t] = state
+    return out
+
+def init_states(bars: dict[str, pd.DataFrame], state_kwargs: dict) -> dict[str, indicators.TickerState]:
+    """티커별 TickerState 배치 초기화 (PARALLEL_MIN 이상이면 프로세스 풀에 분산)"""
+    tickers = list(bars)
+    if len(tickers) < PARALLEL_MIN or WORKERS == 1:
+        out = {}
+        for t, df in bars.items():
+            out[t] = state = indicators.TickerState(**state_kwargs)
+            state.init(df)
+        return out
+    chunks = [tickers[i:i + CHUNK] for i in range(0, len(tickers), CHUNK)]
+    futures = [_get_pool().submit(_init_chunk, to_arrow({t: bars[t] for t in c}), state_kwargs) for c in chunks]
+    out = {}
+    for fut in futures:
+        try:
+            out.update(fut.result())
+        except Exception as e:
+            # 실패한 묶음은 호출한 쪽에서 순차 초기화
+            log.warning("지표 초기화 작업 실패, 순차 초기화로 대체 (%s: %s)", type(e).__name__, e)
+            metrics.error(e)
+    return out
@@ -0,0 +1,212 @@
+"""백그라운드 선조회 스케줄러
+
+등록된 조회 작업을 유효기간 정책(market_hours.Policy)에 맞춰 만료 시점에 미리 갱신해 두고,
+화면은 이미 채워진 스냅샷만 읽는다. 스냅샷이 없는 작업만 페이지 로드 시
+모든 소스를 동시에 조회하고(orchestrator), 소스별 제한시간까지만 기다린다.
+
+조회 실패 시 마지막 정상 값을 stale로 표시해 계속 보여 주고,
+실패 자체는 짧은 음성 TTL(지수 증가)만큼만 유지한 뒤 백그라운드에서 재시도한다.
+IDLE_TTL 동안 아무 화면도 읽지 않은 작업은 백그라운드 갱신을 멈추고, 다시 읽히면 재개한다.
+"""
+import threading, datetime, time
+from concurrent.futures import Future
+from functools import partial
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pandas as pd
+
+from fearindex import market_hours, orchestrator
+
+# 조회 실패(빈 결과) 유지 시간 (연속 실패마다 2배, 최대 MAX_NEGATIVE_TTL)
+NEGATIVE_TTL = datetime.timedelta(minutes=1)
+MAX_NEGATIVE_TTL = datetime.timedelta(minutes=15)
+
+# 이 시간 동안 읽히지 않은 작업은 백그라운드 갱신 중지
+IDLE_TTL = datetime.timedelta(minutes=30)
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def is_empty(value: Any) -> bool:
+    """조회 실패로 보는 결과 (None / 빈 프레임 / 첫 원소가 빈 값인 튜플)"""
+    if value is None:
+        return True
+    if isinstance(value, pd.DataFrame):
+        return value.empty
+    if isinstance(value, tuple) and value:
+        return is_empty(value[0])
+    return False
+
+@dataclass
+class Entry:
+    value: Any
+    as_of: datetime.datetime      # 조회 완료 시각 (UTC)
+    error: str | None = None      # 마지막 조회 오류 (예외 클래스 이름)
+    elapsed: float | None = None  # 마지막 조회 소요 시간 (초)
+    stale: bool = False           # 갱신 실패로 이전 정상 값을 보여 주는 중
+
+    @property
+    def age(self) -> datetime.timedelta:
+        return _utcnow() - self.as_of
+
+@dataclass
+class Job:
+    fetch: Callable[[], Any]
+    policy: market_hours.Policy
+    next_at: datetime.datetime
+    lock: threading.Lock
+    default: Any = None  # 최초 조회 실패 시 값
+    timeout: float = orchestrator.DEFAULT_TIMEOUT  # 페이지 로드 시 대기 한도 (초)
+    failures: int = 0  # 연속 실패 횟수
+    last_used: datetime.datetime | None = None  # 마지막으로 화면이 읽은 시각
+
+    def idle(self, now: datetime.datetime, ttl: datetime.timedelta | None = IDLE_TTL) -> bool:
+        return ttl is not None and self.last_used is not None and now - self.last_used > ttl
+
+class Prefetcher:
+    def __init__(self, on_update: Callable[[str, Entry], Any] | None = None,
+                 idle_ttl: datetime.timedelta | None = IDLE_TTL):
+        """on_update(key, entry): 항목이 바뀔 때마다 호출 (공유 스냅샷 기록 등)
+        idle_ttl: 읽히지 않은 작업의 갱신 중지 기준 (None이면 항상 갱신)
+        """
+        self._on_update = on_update
+        self._idle_ttl = idle_ttl
+        self._jobs: dict[str, Job] = {}
+        self._entries: dict[str, Entry] = {}
+        self._inflight: dict[str, Future] = {}  # 풀에 올라가 있는(대기·실행 중) 갱신
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """갱신 스레드 시작 (중복 호출 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="fearindex-prefetch", daemon=True)
+            self._thread.start()
+
+    def register(self, key: str, fetch: Callable[[], Any], policy: market_hours.Policy,
+                 default: Any = None, timeout: float = orchestrator.DEFAULT_TIMEOUT) -> None:
+        """조회 작업 등록 (이미 있으면 무시)"""
+        with self._lock:
+            if key in self._jobs:
+                return
+            now = _utcnow()
+            self._jobs[key] = Job(fetch, policy, now, threading.Lock(), default, timeout, last_used=now)
+        self._wake.set()
+
+    def restore(self, key: str, entry: Entry) -> None:
+        """저장해 둔 항목으로 스냅샷 채우기 (등록된 작업만, 정책상 만료 전이면 다시 조회하지 않음)"""
+        job = self._jobs[key]
+        if is_empty(entry.value):
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+        job.next_at = market_hours.valid_until(job.policy, entry.as_of)
+
+    def ensure(self, keys: list[str] | None = None) -> dict[str, orchestrator.Result]:
+        """스냅샷이 없는 작업만 동시 조회 (작업별 제한시간까지만 대기)"""
+        with self._lock:
+            keys = list(self._jobs) if keys is None else keys
+            missing = [k for k in keys if k not in self._entries]
+        return self.refresh_many(missing) if missing else {}
+
+    def get(self, key: str) -> Entry:
+        """스냅샷 조회 (없으면 제한시간까지 조회 대기, 그래도 없으면 기본값)"""
+        job = self._jobs[key]
+        now = _utcnow()
+        if job.idle(now, self._idle_ttl):
+            # 쉬던 작업: 이전 스냅샷을 먼저 보여 주고 백그라운드 갱신 재개
+            self._wake.set()
+        job.last_used = now
+        entry = self._entries.get(key)
+        if entry is None:
+            self.ensure([key])
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = Entry(job.default, _utcnow(), "TimeoutError")
+        return entry
+
+    def snapshot(self) -> dict[str, Entry]:
+        with self._lock:
+            return dict(self._entries)
+
+    def refresh_many(self, keys: list[str]) -> dict[str, orchestrator.Result]:
+        """여러 작업 동시 실행 (소스별 오류/소요 시간 묶음 반환)
+
+        이미 풀에 올라가 있는 작업은 다시 보내지 않고 그 결과를 기다린다.
+        조회가 멈춰도 재실행마다 막힌 작업이 공용 풀에 쌓이지 않는다.
+        """
+        futures, sent = {}, []
+        with self._lock:
+            for k in keys:
+                fut = self._inflight.get(k)
+                if fut is None:
+                    fut = self._inflight[k] = orchestrator.submit(partial(self.refresh, k))
+                    sent.append(k)
+                futures[k] = fut
+        for k in sent:
+            futures[k].add_done_callback(partial(self._done, k))
+        return orchestrator.gather(futures, {k: self._jobs[k].timeout for k in keys})
+
+    def _done(self, key: str, fut: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def refresh(self, key: str) -> Entry:
+        """작업 즉시 실행 (동시 호출은 한 번만 조회)"""
+        job = self._jobs[key]
+        with job.lock:
+            entry = self._entries.get(key)
+            if entry is not None and job.next_at > _utcnow():
+                # 대기 중 다른 스레드가 이미 갱신함
+                return entry
+            t0 = time.monotonic()
+            error = None
+            try:
+                value = job.fetch()
+            except Exception as e:
+                value, error = None, type(e).__name__
+            elapsed = time.monotonic() - t0
+            now = _utcnow()
+            if is_empty(value):
+                # 실패는 음성 TTL 동안만 유지 (연속 실패 시 간격 증가)
+                job.failures += 1
+                job.next_at = now + min(MAX_NEGATIVE_TTL, NEGATIVE_TTL * 2 ** (job.failures - 1))
+                error = error or "EmptyResult"
+                if entry is None or is_empty(entry.value):
+                    entry = Entry(job.default if value is None else value, now, error, elapsed)
+                else:
+                    # 마지막 정상 값을 stale로 계속 제공
+                    entry = Entry(entry.value, entry.as_of, error, elapsed, stale=True)
+            else:
+                job.failures = 0
+                job.next_at = market_hours.valid_until(job.policy, now)
+                entry = Entry(value, now, None, elapsed)
+            with self._lock:
+                self._entries[key] = entry
+            if self._on_update is not None:
+                self._on_update(key, entry)
+            return entry
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                jobs = dict(self._jobs)
+            busy = set(self._inflight)
+            now = _utcnow()
+            # 만료된 작업 동시 갱신 (이전 갱신이 아직 진행 중인 작업, 쉬는 작업은 제외)
+            due = [k for k, j in jobs.items() if j.next_at <= now and k not in busy and not j.lock.locked() and not j.idle(now, self._idle_ttl)]
+            if due:
+                self.refresh_many(due)
+            with self._lock:
+                now = _utcnow()
+                upcoming = [j.next_at for j in self._jobs.values() if not j.idle(now, self._idle_ttl)]
+            wait = (min(upcoming) - _utcnow()).total_seconds() if upcoming else 60
+            self._wake.wait(timeout=max(1.0, min(wait, 3600)))
+            self._wake.clear()
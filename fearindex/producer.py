@@ -0,0 +1,54 @@
+"""스냅샷 생산자: 모든 탭의 조회 작업을 한 프로세스에서 갱신해 공유 스냅샷에 기록
+
+    FEAR_INDEX_SNAPSHOT=.cache/snapshot.db python -m fearindex.producer
+
+대시보드 프로세스는 같은 FEAR_INDEX_SNAPSHOT을 지정하면 읽기 전용으로 동작하므로
+대시보드 인스턴스 수와 관계없이 외부 조회는 이 프로세스 한 곳에서만 일어난다.
+--alerts를 주면 갱신마다 임계값 알림(fearindex.alerts)도 평가한다.
+"""
+import argparse, time
+
+from fearindex import alerts, config, jobs, prefetch, snapshot_store
+
+# 설정 파일 변경 확인 주기 (초)
+CONFIG_POLL = 60
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.producer", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=snapshot_store.DEFAULT_PATH, help="스냅샷 SQLite 경로")
+    parser.add_argument("--config", default=None, help="watchlists.toml 경로")
+    parser.add_argument("--alerts", default=None, metavar="DB", help="알림 상태/이벤트 SQLite 경로 (지정 시 알림 평가)")
+    parser.add_argument("--alert-jsonl", default=None, help="알림 이벤트를 덧붙일 JSON Lines 파일")
+    parser.add_argument("--alert-webhook", default=None, help="알림 이벤트를 POST할 웹훅 URL")
+    args = parser.parse_args(argv)
+
+    store = snapshot_store.SnapshotStore(args.db)
+    cfg = config.load(args.config)
+    engine = None
+    if args.alerts or args.alert_jsonl or args.alert_webhook:
+        sinks = [alerts.LogSink()]
+        if args.alert_jsonl:
+            sinks.append(alerts.JsonlSink(args.alert_jsonl))
+        if args.alert_webhook:
+            sinks.append(alerts.WebhookSink(args.alert_webhook))
+        engine = alerts.AlertEngine(args.alerts or alerts.ALERTS_PATH, cfg, sinks)
+
+    def on_update(key, entry):
+        store.write(key, entry)
+        if engine is not None:
+            engine.on_update(key, entry)
+
+    # 읽는 화면이 없어도 계속 갱신 (idle_ttl=None)
+    p = prefetch.Prefetcher(on_update=on_update, idle_ttl=None)
+    p.ensure(jobs.register_all(p, cfg))
+    p.start()
+    while True:
+        time.sleep(CONFIG_POLL)
+        # 설정에 새로 생긴 종목/페이지 작업 추가 (이미 있는 키는 무시)
+        cfg = config.load(args.config)
+        if engine is not None:
+            engine.set_config(cfg)
+        jobs.register_all(p, cfg)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""업스트림별 호출 한도 (토큰 버킷 + 우선순위 대기열 + 중복 요청 합치기 + 적응형 감속)
+
+모든 조회 함수는 업스트림 호출을 call() / acquire()로 보낸다.
+- 업스트림(yahoo / krx / HTTP 호스트)마다 토큰 버킷 하나: 초당 rate개 충전, 최대 burst개
+- 토큰을 기다리는 호출은 우선순위(CARDS < TABLES < BACKGROUND) 순, 같은 순위는 도착 순
+- 같은 키(업스트림, 티커, 구간)의 호출이 진행 중이면 새로 보내지 않고 그 결과를 같이 받는다
+- 429 / 속도 제한 예외면 속도를 절반으로 줄이고 잠시 멈추며(Retry-After 우선), 빈 응답이면 조금 줄인다.
+  성공할 때마다 조금씩 올려 max_rate까지 업스트림이 허용하는 최대 속도를 찾아간다.
+
+한도는 프로세스 단위다. 여러 복제본이 같은 업스트림을 볼 때는 생산자 하나만 조회하고
+대시보드는 스냅샷을 읽게 한다(snapshot_store). FEAR_INDEX_RATE_LIMITS로 기본값을 바꾼다.
+
+    FEAR_INDEX_RATE_LIMITS="yahoo=5/20,krx=2/5"     # 이름=초당 요청/버스트
+"""
+import contextlib, contextvars, heapq, itertools, os, threading, time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+import pandas as pd
+
+# 우선순위 (작을수록 먼저): 첫 화면 카드 / 표 / 백필 등
+CARDS, TABLES, BACKGROUND = 0, 1, 2
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float                   # 시작 속도 (초당 요청)
+    burst: int                    # 버킷 크기
+    max_rate: float | None = None # 적응형 상한 (기본 rate의 2배)
+
+# 업스트림별 기본 한도 (HTTP는 호스트 이름)
+LIMITS = {
+    "yahoo": Limit(5.0, 20),
+    "krx": Limit(2.0, 5),
+    "feargreedmeter.com": Limit(0.5, 3),
+}
+DEFAULT_LIMIT = Limit(2.0, 5)
+
+# 적응형 조정: 성공마다 +rate×INCREASE, 제한 응답 ×DECREASE, 빈 응답 ×EMPTY_DECREASE (하한 rate×MIN_FRACTION)
+INCREASE = 0.05
+DECREASE = 0.5
+EMPTY_DECREASE = 0.8
+MIN_FRACTION = 1 / 16
+
+# 제한 응답 후 멈춤 (Retry-After가 없으면 연속 횟수에 따라 지수 증가, 초)
+COOLDOWN = 2.0
+MAX_COOLDOWN = 60.0
+
+# 토큰 대기 최대 시간 (초)
+ACQUIRE_TIMEOUT = 60.0
+
+# False면 토큰 대기 없이 통과 (오프라인 벤치마크 등, 중복 요청 합치기는 유지)
+ENABLED = True
+
+class RateLimited(TimeoutError):
+    """토큰 대기 시간 초과"""
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("fearindex_priority", default=TABLES)
+
+def parse(spec: str) -> dict[str, Limit]:
+    """'yahoo=5/20,krx=2' -> {이름: Limit} (버스트 생략 시 rate 올림)"""
+    out = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        rate, _, burst = value.partition("/")
+        try:
+            r = float(rate)
+            out[name.strip()] = Limit(r, int(burst) if burst else max(1, int(-(-r // 1))))
+        except ValueError:
+            raise ValueError(f"FEAR_INDEX_RATE_LIMITS: 해석할 수 없는 항목 {part!r} (예: yahoo=5/20)") from None
+    return out
+
+LIMITS.update(parse(os.environ.get("FEAR_INDEX_RATE_LIMITS", "")))
+
+class Bucket:
+    def __init__(self, name: str, limit: Limit):
+        self.name, self.limit = name, limit
+        self.rate = limit.rate
+        self.tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+        self._strikes = 0
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self.counts = {"requests": 0, "throttled": 0, "empty": 0, "coalesced": 0, "timeouts": 0}
+        self.waited = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cost: int = 1, priority: int = TABLES, timeout: float = ACQUIRE_TIMEOUT) -> float:
+        """토큰 cost개 사용 (버킷보다 큰 요청은 가득 찼을 때 보내고 빚으로 남김) -> 대기 시간 (초)"""
+        t0 = time.monotonic()
+        me = (priority, next(self._seq))
+        need = min(cost, self.limit.burst)
+        with self._cond:
+            heapq.heappush(self._waiters, me)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    first = self._waiters[0] == me
+                    if first and (not ENABLED or (now >= self._cooldown_until and self.tokens >= need)):
+                        heapq.heappop(self._waiters)
+                        if ENABLED:
+                            self.tokens -= cost
+                        self.counts["requests"] += 1
+                        self.waited += now - t0
+                        self._cond.notify_all()
+                        return now - t0
+                    if now - t0 >= timeout:
+                        self.counts["timeouts"] += 1
+                        raise RateLimited(f"{self.name}: {timeout:g}초 동안 호출 한도 대기")
+                    wait = t0 + timeout - now
+                    if first:
+                        wait = min(wait, max(self._cooldown_until - now, (need - self.tokens) / self.rate, 0.001))
+                    self._cond.wait(wait)
+            except BaseException:
+                if me in self._waiters:
+                    self._waiters.remove(me)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def feedback(self, outcome: str, retry_after: float | None = None) -> None:
+        """호출 결과 반영: ok / empty (빈 응답) / throttled (429, 속도 제한 예외)"""
+        with self._cond:
+            lo = self.limit.rate * MIN_FRACTION
+            hi = self.limit.max_rate or self.limit.rate * 2
+            if outcome == "ok":
+                self._strikes = 0
+                self.rate = min(hi, self.rate + self.limit.rate * INCREASE)
+            elif outcome == "empty":
+                self.counts["empty"] += 1
+                self.rate = max(lo, self.rate * EMPTY_DECREASE)
+            else:
+                self.counts["throttled"] += 1
+                self._strikes += 1
+                self.rate = max(lo, self.rate * DECREASE)
+                pause = retry_after if retry_after is not None else COOLDOWN * 2 ** (self._strikes - 1)
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + min(MAX_COOLDOWN, pause))
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill(time.monotonic())
+            return {"upstream": self.name, "rate": round(self.rate, 3), "tokens": round(self.tokens, 1),
+                    "waiting": len(self._waiters), "cooldown_s": round(max(0.0, self._cooldown_until - time.monotonic()), 1),
+                    **self.counts, "waited_s": round(self.waited, 2)}
+
+_buckets: dict[str, Bucket] = {}
+_lock = threading.Lock()
+
+def bucket(upstream: str) -> Bucket:
+    """업스트림별 공용 버킷"""
+    with _lock:
+        b = _buckets.get(upstream)
+        if b is None:
+            b = _buckets[upstream] = Bucket(upstream, LIMITS.get(upstream, DEFAULT_LIMIT))
+        return b
+
+def acquire(upstream: str, cost: int = 1, timeout: float = ACQUIRE_TIMEOUT) -> float:
+    """현재 우선순위로 토큰 대기 -> 대기 시간 (초)"""
+    return bucket(upstream).acquire(cost, _priority.get(), timeout)
+
+def feedback(upstream: str, outcome: str, retry_after: float | None = None) -> None:
+    bucket(upstream).feedback(outcome, retry_after)
+
+@contextlib.contextmanager
+def priority(level: int):
+    """이 블록 안의 업스트림 호출 우선순위"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def prioritized(level: int, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """fn을 level 우선순위로 실행하는 함수 (선조회 작업 등록용, 풀 스레드에서도 유지)"""
+    def run(*args, **kwargs):
+        with priority(level):
+            return fn(*args, **kwargs)
+    return run
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+_inflight: dict[Hashable, _Flight] = {}
+_inflight_lock = threading.Lock()
+
+def coalesce(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """같은 key(업스트림, ...) 호출이 진행 중이면 그 결과를 기다려 같이 받는다 (결과 객체 공유, 수정하지 말 것)"""
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+    if not leader:
+        bucket(key[0]).counts["coalesced"] += 1
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = fn()
+        return flight.value
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+
+def _empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series, dict)):
+        return len(value) == 0
+    return False
+
+def call(upstream: str, key: Hashable | None, fn: Callable[[], Any], cost: int = 1) -> Any:
+    """업스트림 라이브러리 호출 (중복 합치기 -> 토큰 대기 -> 실행 -> 결과로 속도 조정)
+
+    key가 None이면 합치지 않는다. 속도 제한 예외(이름에 RateLimit)는 throttled로 반영 후 다시 올린다.
+    """
+    def run():
+        b = bucket(upstream)
+        b.acquire(cost, _priority.get())
+        try:
+            value = fn()
+        except Exception as e:
+            if "RateLimit" in type(e).__name__:
+                b.feedback("throttled")
+            raise
+        b.feedback("empty" if _empty(value) else "ok")
+        return value
+    return run() if key is None else coalesce((upstream, key), run)
+
+def stats() -> pd.DataFrame:
+    """업스트림별 현재 속도 / 토큰 / 대기 / 누적 횟수"""
+    with _lock:
+        buckets = list(_buckets.values())
+    return pd.DataFrame([b.stats() for b in buckets])
@@ -0,0 +1,170 @@
+"""대시보드 지표 묶음 (Streamlit 없이 조회/계산해 JSON / Parquet으로 내보내기)
+
+탭별 조회 작업(jobs)을 Prefetcher나 공유 스냅샷(SnapshotReader)에서 읽어
+카드/표에 보이는 값과 같은 정의로 섹션별 지표를 만든다.
+"""
+import datetime, json, math, pathlib
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from fearindex import config, jobs, sources
+from fearindex.prefetch import Entry
+
+SECTIONS = ("fear", "etfs", "stocks")
+
+# JSON 실수 유효 자릿수 (스냅샷 가격은 float32라 그 이상은 잡음)
+JSON_DIGITS = 7
+
+def _meta(*entries: Entry) -> dict:
+    """섹션 기준 시각 (가장 오래된 항목) / 갱신 실패 여부 / 오류"""
+    if not entries:
+        return {"as_of": None, "stale": False, "errors": []}
+    return {
+        "as_of": min(e.as_of for e in entries).isoformat(timespec="seconds"),
+        "stale": any(e.stale for e in entries),
+        "errors": sorted({e.error for e in entries if e.error}),
+    }
+
+def _ratio(now, ma):
+    return None if now is None or ma in (None, 0) else now / ma * 100
+
+def fear(p, cfg: config.Config) -> dict:
+    """Fear 탭: FGI / QQQM / VIX 카드 값과 최근 20일 표"""
+    fgi_key, qqq_key, vix_key = jobs.register_fear(p, cfg)
+    p.ensure([fgi_key, qqq_key, vix_key])
+    fgi_e, qqq_e, vix_e = p.get(fgi_key), p.get(qqq_key), p.get(vix_key)
+
+    fgi_df = fgi_e.value if isinstance(fgi_e.value, pd.DataFrame) else pd.DataFrame()
+    fgi_now = int(fgi_df["FGI"].iloc[-1]) if not fgi_df.empty else None
+    qqq_now, qqq_chg = sources.daily_price(qqq_e.value)
+    vix_now, vix_chg = sources.daily_price(vix_e.value)
+    ma5, ma20 = sources.ma_daily(qqq_e.value)
+    qqq_df = sources.last20_daily(qqq_e.value)
+    vix_df = sources.last20_vix(vix_e.value)
+
+    return {
+        **_meta(fgi_e, qqq_e, vix_e),
+        "fgi": {
+            "value": fgi_now,
+            "label": sources.fgi_label(fgi_now) if fgi_now is not None else None,
+            "date": fgi_df["날짜"].iloc[-1] if not fgi_df.empty else None,
+            "history": fgi_df.rename(columns={"날짜": "date", "FGI": "fgi"}),
+        },
+        "qqq": {
+            "ticker": cfg.qqq, "price": qqq_now, "chg_pct": qqq_chg,
+            "ma5": ma5, "ma20": ma20, "ma5_ratio": _ratio(qqq_now, ma5), "ma20_ratio": _ratio(qqq_now, ma20),
+            "mdd_pct": float(qqq_df["MDD_%"].iloc[-1]) if not qqq_df.empty else None,
+            "history": qqq_df,
+        },
+        "vix": {
+            "ticker": cfg.vix, "price": vix_now, "chg_pct": vix_chg,
+            "wow_pct": float(vix_df["WoW"].iloc[-1]) if not vix_df.empty else None,
+            "history": vix_df,
+        },
+    }
+
+def etfs(p, cfg: config.Config) -> dict:
+    """Target 탭: ETF별 현재가 / 전일 대비 / 고점 대비 / ATH / 1달 최저가"""
+    keys = jobs.register_etfs(p, cfg)
+    p.ensure(keys)
+    rows, entries = [], []
+    for (code, name), key in zip(cfg.etfs, keys):
+        e = p.get(key)
+        entries.append(e)
+        try:
+            df, ath_date, low_1m, low_1m_date = e.value
+        except (TypeError, ValueError):
+            df, ath_date, low_1m, low_1m_date = pd.DataFrame(), None, None, None
+        last = df.iloc[-1] if df is not None and not df.empty else None
+        rows.append({
+            "code": code, "name": name,
+            "price": None if last is None else float(last["Close"]),
+            "dod_pct": None if last is None else float(last["DoD_%"]),
+            "mdd_pct": None if last is None else float(last["MDD_%"]),
+            "ath": None if last is None else float(last["ATH"]),
+            "ath_date": ath_date,
+            "low_1m": None if low_1m is None else float(low_1m),
+            "low_1m_date": low_1m_date,
+        })
+    return {**_meta(*entries), "table": pd.DataFrame(rows)}
+
+def stocks(p, cfg: config.Config) -> dict:
+    """AI전력 탭: 티커별 현재가 / 90일 고점 / 하락률 / RSI / 물타기 1단계 충족"""
+    entries, frames = [], []
+    for page in jobs.stock_pages(cfg):
+        if not page:
+            continue
+        key = jobs.register_stocks(p, page)
+        p.ensure([key])
+        e = p.get(key)
+        entries.append(e)
+        if isinstance(e.value, pd.DataFrame) and not e.value.empty:
+            frames.append(e.value)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["ticker", "current_price", "ath_90d", "drawdown", "rsi", "stale"])
+    step1 = df["ticker"].map(cfg.step1).astype(float)
+    out = pd.DataFrame({
+        "ticker": df["ticker"].astype(str),
+        "price": df["current_price"].astype(float),
+        "ath_90d": df["ath_90d"].astype(float),
+        "drawdown_pct": df["drawdown"].astype(float),
+        "rsi": df["rsi"].astype(float),
+        "step1_pct": step1,
+        "step1_hit": (df["drawdown"].astype(float) <= step1).to_numpy(),
+        # 조회 실패로 이전 값(없으면 빈 값)을 넣은 행
+        "stale": df["stale"].fillna(False).astype(bool) if "stale" in df else False,
+    })
+    return {**_meta(*entries), "table": out}
+
+def collect(p, cfg: config.Config, sections: tuple[str, ...] = SECTIONS) -> dict[str, dict]:
+    """섹션별 지표 (p: Prefetcher 또는 SnapshotReader)"""
+    build = {"fear": fear, "etfs": etfs, "stocks": stocks}
+    return {name: build[name](p, cfg) for name in sections}
+
+def _plain(v: Any) -> Any:
+    """JSON 직렬화 가능한 값 (NaN -> None, 날짜 -> ISO 문자열, 프레임 -> 레코드 목록)"""
+    if isinstance(v, pd.DataFrame):
+        return [{k: _plain(x) for k, x in r.items()} for r in v.to_dict("records")]
+    if isinstance(v, dict):
+        return {k: _plain(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_plain(x) for x in v]
+    if isinstance(v, (pd.Timestamp, datetime.date)):
+        return v.strftime("%Y-%m-%d") if isinstance(v, pd.Timestamp) and v == v.normalize() else v.isoformat()
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float):
+        return None if math.isnan(v) else float(f"{v:.{JSON_DIGITS}g}")
+    return v
+
+def to_json(report: dict, indent: int | None = None) -> str:
+    return json.dumps(_plain(report), ensure_ascii=False, indent=indent)
+
+def tables(report: dict) -> dict[str, pd.DataFrame]:
+    """Parquet용 평탄화: 표는 그대로, 카드 값은 한 행 프레임 (fear_fgi, fear_fgi_history, etfs, ...)"""
+    out = {}
+    for section, body in report.items():
+        meta = {k: body[k] for k in ("as_of", "stale")}
+        for name, v in body.items():
+            if isinstance(v, pd.DataFrame):
+                out[section if name == "table" else f"{section}_{name}"] = v
+            elif isinstance(v, dict):
+                scalars = {k: x for k, x in v.items() if not isinstance(x, pd.DataFrame)}
+                out[f"{section}_{name}"] = pd.DataFrame([{**scalars, **meta}])
+                for k, x in v.items():
+                    if isinstance(x, pd.DataFrame):
+                        out[f"{section}_{name}_{k}"] = x
+    return out
+
+def to_parquet(report: dict, directory: str | pathlib.Path) -> list[pathlib.Path]:
+    """표마다 {directory}/{이름}.parquet -> 기록한 경로"""
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, df in tables(report).items():
+        path = directory / f"{name}.parquet"
+        df.to_parquet(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,105 @@
+"""프로세스 간 공유 스냅샷 (SQLite)
+
+생산자(fearindex.producer) 하나가 조회 결과(Entry)를 키별로 기록하고,
+대시보드 프로세스들은 SnapshotReader로 읽기만 한다. 기록마다 버전이 1씩 올라가며
+읽는 쪽은 버전이 바뀐 키만 다시 역직렬화한다. WAL 모드라 읽기와 쓰기가 서로 막지 않는다.
+"""
+import datetime, os, pickle, sqlite3, threading
+from pathlib import Path
+from typing import Any, Callable
+
+from fearindex import market_hours, orchestrator
+from fearindex.prefetch import Entry
+
+# 설정되어 있으면 대시보드는 이 스냅샷만 읽는다 (직접 조회하지 않음)
+SNAPSHOT_PATH = os.environ.get("FEAR_INDEX_SNAPSHOT")
+
+# 생산자 / CLI 기본 경로 (실행 위치와 관계없이 저장소 .cache)
+DEFAULT_PATH = SNAPSHOT_PATH or os.path.join(Path(__file__).resolve().parent.parent, ".cache", "snapshot.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    as_of TEXT NOT NULL,
+    payload BLOB NOT NULL
+)
+"""
+
+class SnapshotStore:
+    def __init__(self, path: str | os.PathLike):
+        if str(path) != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def write(self, key: str, entry: Entry) -> int:
+        """항목 기록 -> 새 버전"""
+        payload = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM entries").fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO entries (key, version, as_of, payload) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET version=excluded.version, as_of=excluded.as_of, payload=excluded.payload",
+                    (key, version, entry.as_of.isoformat(), payload))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return version
+
+    def versions(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, version FROM entries"))
+
+    def version(self, key: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def read(self, key: str) -> tuple[int, Entry] | None:
+        """(버전, 항목) 또는 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT version, payload FROM entries WHERE key = ?", (key,)).fetchone()
+        return (row[0], pickle.loads(row[1])) if row else None
+
+class SnapshotReader:
+    """스냅샷 읽기 전용 (Prefetcher와 같은 register/ensure/get 인터페이스, 네트워크 조회 없음)"""
+
+    def __init__(self, store: SnapshotStore):
+        self._store = store
+        self._defaults: dict[str, Any] = {}
+        self._cache: dict[str, tuple[int, Entry]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, key: str, fetch: Callable[[], Any], policy: market_hours.Policy,
+                 default: Any = None, timeout: float = orchestrator.DEFAULT_TIMEOUT) -> None:
+        """조회 함수는 생산자가 실행하므로 기본값만 기억"""
+        self._defaults.setdefault(key, default)
+
+    def ensure(self, keys: list[str] | None = None) -> dict[str, orchestrator.Result]:
+        return {}
+
+    def get(self, key: str) -> Entry:
+        """스냅샷 항목 (버전이 같으면 역직렬화 생략, 아직 없으면 기본값)"""
+        version = self._store.version(key)
+        if version is None:
+            return Entry(self._defaults.get(key), datetime.datetime.now(datetime.timezone.utc), "NoSnapshot")
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        row = self._store.read(key)
+        if row is None:
+            return Entry(self._defaults.get(key), datetime.datetime.now(datetime.timezone.utc), "NoSnapshot")
+        with self._lock:
+            self._cache[key] = row
+        return row[1]
+
+    def snapshot(self) -> dict[str, Entry]:
+        return {k: self.get(k) for k in self._store.versions()}
@@ -0,0 +1,402 @@
+"""업스트림 데이터 수집 (FGI / Yahoo Finance / FinanceDataReader)
+
+Streamlit에 의존하지 않는 순수 조회/계산 함수 모음.
+캐시와 갱신 주기는 호출하는 쪽(prefetch)에서 관리한다.
+"""
+import re, datetime, threading, requests, numpy as np, pandas as pd
+
+from fearindex import bar_cache, compact, fgi, http_client, indicators, metrics, precompute, ratelimit, startup, timeseries
+
+ROOT="https://feargreedmeter.com"; PATH="/fear-and-greed-index"
+UA={"User-Agent":"Mozilla/5.0"}
+
+# yfinance / FinanceDataReader는 처음 조회할 때 임포트 (스냅샷만 읽는 프로세스는 불러오지 않음)
+def _yf():
+    return startup.lazy_import("yfinance")
+
+def _fdr():
+    return startup.lazy_import("FinanceDataReader")
+
+# yf.download는 모듈 전역 상태를 공유하므로 동시 호출 시 결과가 섞인다 (호출만 직렬화)
+_YF_LOCK = threading.Lock()
+
+def _yf_download(**kwargs) -> pd.DataFrame:
+    """yf.download (yahoo 호출 한도, 같은 인자 요청 합치기, 티커 수만큼 토큰 사용)"""
+    tickers = kwargs["tickers"]
+    def run():
+        with _YF_LOCK:
+            return _yf().download(**kwargs)
+    return ratelimit.call("yahoo", ("download", repr(sorted(kwargs.items()))), run,
+                          cost=1 if isinstance(tickers, str) else len(tickers))
+
+def fgi_label(v:int)->str:
+    if v<=24:return "Extreme Fear"
+    if v<=44:return "Fear"
+    if v<=55:return "Neutral"
+    if v<=75:return "Greed"
+    return "Extreme Greed"
+
+# 마지막으로 확인한 Next.js buildId (데이터 URL이 404가 되면 다시 확인)
+_build_id: str | None = None
+
+@metrics.timed()
+def _get_build_id(refresh: bool = False)->str:
+    global _build_id
+    if _build_id and not refresh:
+        metrics.note(cache="hit")
+        return _build_id
+    metrics.note(cache="miss")
+    r=http_client.request(ROOT+PATH,headers=UA,timeout=10)
+    m=re.search(r'"buildId"\s*:\s*"([A-Za-z0-9\-\_]+)"',r.text)
+    if not m:m=re.search(r'/_next/data/([A-Za-z0-9\-\_]+)/fear-and-greed-index\.json',r.text)
+    if not m:raise RuntimeError("buildId not found")
+    _build_id=m.group(1)
+    return _build_id
+
+def _fetch_fgi_json(build_id: str) -> bytes:
+    # 변경 없으면 304 (직전 본문 재사용)
+    body, _ = http_client.get_conditional(f"{ROOT}/_next/data/{build_id}{PATH}.json", headers=UA, timeout=10)
+    return body
+
+# 선조회 스냅샷에 남기는 FGI 행 수 (표 20일, 전체 히스토리는 시계열 저장소)
+FGI_ROWS = 20
+
+@metrics.timed()
+def fetch_fgi_history(n: int | None = FGI_ROWS)->pd.DataFrame:
+    """최근 n일 FGI (날짜 datetime64 / FGI uint8, n=None이면 저장소 전체)"""
+    try:
+        try:
+            body=_fetch_fgi_json(_get_build_id())
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code!=404:raise
+            # buildId 교체로 데이터 URL이 404 -> buildId 재확인 후 1회 재시도
+            body=_fetch_fgi_json(_get_build_id(refresh=True))
+        days,values=fgi.decode(body)
+        # 저장소에 없는 날짜만 추가하고(마지막 날짜 값은 바뀔 수 있어 포함), 표는 저장소에서 읽는다
+        store=timeseries.default_store()
+        last=store.last_date("fgi")
+        if last is not None:
+            keep=days>=np.datetime64(last,"D").astype(np.int32)
+            days,values=days[keep],values[keep]
+        if len(days):
+            store.append("fgi", pd.Series(values, index=pd.to_datetime(days.astype("datetime64[D]"))))
+        s=store.range("fgi")
+        if n is not None:s=s.iloc[-n:]
+        df=pd.DataFrame({"날짜":s.index,"FGI":s.to_numpy().astype("uint8")})
+        return df
+    except fgi.SchemaError:
+        # 형식 변경은 빈 결과와 구분되도록 그대로 올린다 (선조회는 이전 값 유지 + 오류 표시)
+        raise
+    except Exception as e:
+        metrics.error(e)
+        return pd.DataFrame()
+
+# 일봉 히스토리 보관 기간 (로컬 캐시 / 시계열 저장소)
+HISTORY_YEARS = 2
+
+# 선조회 스냅샷에 남기는 종가 구간 (QQQM 1년 MDD가 가장 넓다)
+HOT_YEARS = 1
+
+def _flatten_columns(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """yf.download 결과를 단일 티커 컬럼으로 평탄화"""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if isinstance(df.columns, pd.MultiIndex):
+        if ticker in df.columns.get_level_values(1):
+            df = df.xs(ticker, axis=1, level=1)
+        else:
+            df = df.droplevel(1, axis=1)
+    return df
+
+@metrics.timed()
+def fetch_history(ticker: str) -> pd.DataFrame:
+    """티커별 최근 HOT_YEARS년 종가 (float32 Close 컬럼, 파생 지표 공용 스냅샷)
+
+    다운로드/로컬 캐시는 HISTORY_YEARS년 OHLCV 전체, 반환값은 화면에 필요한 구간만.
+    """
+    try:
+        start = (pd.Timestamp.today() - pd.DateOffset(years=HISTORY_YEARS)).date()
+
+        # 로컬 캐시 이후 구간만 증분 다운로드
+        def download(since):
+            df = _yf_download(tickers=ticker, start=since, interval="1d", progress=False, threads=False, auto_adjust=False)
+            return _flatten_columns(df, ticker)
+
+        df = bar_cache.load_bars("yahoo", ticker, download, start)
+        if df.empty:
+            return pd.DataFrame()
+        df = df.dropna(subset=["Close"]).astype(float)
+        # 장기 분석용 종가 시계열에 새 점 추가
+        timeseries.default_store().append(ticker, df["Close"])
+        return compact.shrink(df[["Close"]].loc[df.index >= df.index[-1] - pd.DateOffset(years=HOT_YEARS)])
+    except Exception as e:
+        metrics.error(e)
+        return pd.DataFrame()
+
+@metrics.timed()
+def fetch_minute_bars(ticker: str, since: pd.Timestamp | None = None) -> pd.DataFrame:
+    """1분봉 종가 (since 이후만, None이면 당일 세션 전체) - 장중 실시간 모드 증분 조회"""
+    try:
+        if since is None:
+            df = _yf_download(tickers=ticker, period="1d", interval="1m", progress=False, threads=False, auto_adjust=False)
+        else:
+            df = _yf_download(tickers=ticker, start=since, interval="1m", progress=False, threads=False, auto_adjust=False)
+        df = _flatten_columns(df, ticker)
+        if df.empty:
+            return pd.DataFrame()
+        return df[["Close"]].dropna().astype(float)
+    except Exception as e:
+        metrics.error(e)
+        return pd.DataFrame()
+
+def _close_series(hist: pd.DataFrame, years: int | None = None) -> pd.Series:
+    """히스토리 프레임에서 종가 Series 추출 (years 지정 시 최근 n년 구간만)"""
+    if hist is None or hist.empty:
+        return pd.Series(dtype=float)
+    s = hist["Close"]
+    if years is not None and len(s) > 0:
+        s = s[s.index >= s.index[-1] - pd.DateOffset(years=years)]
+    return s
+
+@metrics.timed()
+def daily_price(hist: pd.DataFrame):
+    """최신 종가, 전일 대비 변동률"""
+    s = _close_series(hist)
+    if len(s) == 0:
+        return None, None
+
+    last = s.iloc[-1].item()
+    prev = s.iloc[-2].item() if len(s) >= 2 else None
+    chg = None if prev is None else (last/prev-1)*100
+    return last, chg
+
+@metrics.timed()
+def last20_daily(hist: pd.DataFrame) -> pd.DataFrame:
+    """최근 20일 일봉 데이터"""
+    # MDD는 최근 1년 고점 기준
+    s = _close_series(hist, years=1)
+    if len(s) == 0:
+        return pd.DataFrame()
+
+    date_idx = pd.to_datetime(s.index.date)
+    dod_pct = s.pct_change() * 100
+    ath = s.cummax()
+    mdd_pct = (s / ath - 1) * 100
+
+    out = pd.DataFrame({
+        "Date": date_idx,
+        "Close": s.values,
+        "DoD_%": dod_pct.values,
+        "MDD_%": mdd_pct.values
+    }, index=s.index)
+
+    return out.tail(20).reset_index(drop=True)[["Date", "Close", "DoD_%", "MDD_%"]]
+
+@metrics.timed()
+def last20_vix(hist: pd.DataFrame) -> pd.DataFrame:
+    """VIX 최근 20일 데이터"""
+    s = _close_series(hist)
+    if len(s) == 0:
+        return pd.DataFrame()
+
+    date_idx = pd.to_datetime(s.index.date)
+    dod_pct = s.pct_change() * 100
+    wow_pct = (s / s.shift(5) - 1) * 100
+
+    out = pd.DataFrame({
+        "Date": date_idx,
+        "Close": s.values,
+        "DoD": dod_pct.values,
+        "WoW": wow_pct.values
+    }, index=s.index)
+
+    return out.tail(20).reset_index(drop=True)[["Date", "Close", "DoD", "WoW"]]
+
+@metrics.timed()
+def ma_daily(hist: pd.DataFrame, w5: int = 5, w20: int = 20):
+    """이동평균 계산"""
+    s = _close_series(hist)
+    if len(s) == 0:
+        return None, None
+
+    ma5 = s.rolling(w5).mean().iloc[-1].item() if len(s) >= w5 else None
+    ma20 = s.rolling(w20).mean().iloc[-1].item() if len(s) >= w20 else None
+    return ma5, ma20
+
+@metrics.timed()
+def fetch_etf_data(ticker: str, n: int = 20) -> tuple[pd.DataFrame, str, float, str]:
+    """ETF 데이터, ATH 날짜, 최근 1달 최저가 및 날짜 반환"""
+    try:
+        # 1년 이상 데이터 (로컬 캐시 이후 구간만 증분 조회)
+        def download(since):
+            return ratelimit.call("krx", ("DataReader", ticker, str(since)), lambda: _fdr().DataReader(ticker, start=str(since)))
+
+        df = bar_cache.load_bars("krx", ticker, download, datetime.date(2023, 1, 1))
+        if df is None or df.empty:
+            return pd.DataFrame(), None, None, None
+
+        s = df['Close'].astype(float).dropna()
+        if len(s) == 0:
+            return pd.DataFrame(), None, None, None
+        # 시장 간 정렬 패널용 종가 시계열에 새 점 추가
+        timeseries.default_store().append(ticker, s)
+
+        ath_value = s.max()
+
+        # ATH 날짜 찾기 (전체 1년 데이터에서 가장 최근)
+        ath_dates = s[s == ath_value]
+        ath_date_str = pd.to_datetime(ath_dates.index[-1]).strftime('%m/%d') if not ath_dates.empty else None
+
+        # 최근 1달(30일) 최저가 및 날짜 찾기
+        recent_30d = s.tail(30)
+        if len(recent_30d) > 0:
+            low_1m_value = recent_30d.min()
+            low_1m_dates = recent_30d[recent_30d == low_1m_value]
+            low_1m_date_str = pd.to_datetime(low_1m_dates.index[-1]).strftime('%m/%d') if not low_1m_dates.empty else None
+        else:
+            low_1m_value = None
+            low_1m_date_str = None
+
+        # 최근 n일 데이터만 준비
+        out = pd.DataFrame(index=s.index)
+        out["Date"] = pd.to_datetime(s.index.date)
+        out["Close"] = s.values
+        out["DoD_%"] = s.pct_change() * 100
+        out["ATH"] = s.cummax()
+        out["MDD_%"] = (s / out["ATH"] - 1) * 100
+        out = out.tail(n).reset_index(drop=True)
+
+        return compact.shrink(out[["Date", "Close", "DoD_%", "ATH", "MDD_%"]]), ath_date_str, low_1m_value, low_1m_date_str
+    except Exception as e:
+        metrics.error(e)
+        return pd.DataFrame(), None, None, None
+
+def backfill_history(ticker: str, start: datetime.date) -> int:
+    """start 이후 종가 전체를 시계열 저장소에 기록 -> 기록한 행 수"""
+    with ratelimit.priority(ratelimit.BACKGROUND):
+        df = _yf_download(tickers=ticker, start=start, interval="1d", progress=False, threads=False, auto_adjust=False)
+    df = _flatten_columns(df, ticker)
+    if df.empty:
+        return 0
+    return timeseries.default_store().backfill(ticker, df["Close"].astype(float))
+
+# RSI 계산 함수
+def calculate_rsi(data, period=14):
+    delta = data.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# 주식 데이터 가져오기
+@metrics.timed()
+def get_stock_data(ticker):
+    try:
+        stock = _yf().Ticker(ticker)
+        end_date = datetime.datetime.now()
+        start_date = end_date - datetime.timedelta(days=120)
+
+        hist = ratelimit.call("yahoo", ("history", ticker, start_date.date()), lambda: stock.history(start=start_date, end=end_date))
+
+        if hist.empty:
+            return None
+
+        current_price = hist['Close'].iloc[-1]
+
+        ninety_days_ago = pd.Timestamp(end_date - datetime.timedelta(days=90)).tz_localize('America/New_York')
+        recent_data = hist[hist.index >= ninety_days_ago]
+        ath_90d = recent_data['High'].max()
+
+        drawdown = ((current_price - ath_90d) / ath_90d) * 100
+        rsi = calculate_rsi(hist['Close'], 14).iloc[-1]
+
+        return {
+            'ticker': ticker,
+            'current_price': current_price,
+            'ath_90d': ath_90d,
+            'drawdown': drawdown,
+            'rsi': rsi
+        }
+    except Exception as e:
+        metrics.error(e)
+        return None
+
+def _download_adjusted(symbols: list[str], since) -> dict[str, pd.DataFrame]:
+    """수정주가 일봉 일괄 다운로드 -> {티커: 일봉}"""
+    df = _yf_download(tickers=symbols, start=since, interval="1d", group_by="column",
+                      auto_adjust=True, progress=False, threads=min(len(symbols), 8))
+    if df is None or df.empty:
+        return {}
+    return {t: df.xs(t, axis=1, level=1).dropna(how="all") for t in df.columns.get_level_values(1).unique()}
+
+def fetch_adjusted_bars(tickers, start: datetime.date) -> dict[str, pd.DataFrame]:
+    """수정주가 일봉 (tab3 / 백테스트 공용 캐시, 캐시 이후 구간만 일괄 조회)"""
+    return bar_cache.load_bars_many("yahoo_adj", list(tickers), _download_adjusted, start)
+
+# tab3 티커별 증분 지표 상태 (갱신 간 유지)
+_STOCK_BOOK = indicators.IndicatorBook(rsi_period=14, high_days=90)
+
+# 여러 티커 일괄 다운로드 후 지표 계산
+@metrics.timed()
+def get_stocks_data(tickers: tuple) -> pd.DataFrame:
+    try:
+        end_date = datetime.datetime.now()
+        start_date = end_date - datetime.timedelta(days=120)
+
+        # 로컬 캐시 이후 구간만 한 번에 증분 다운로드
+        bars = fetch_adjusted_bars(tickers, start_date.date())
+        if not bars:
+            return pd.DataFrame()
+
+        # 티커별 증분 지표: 지난 갱신 이후 새 봉만 반영 (최초 1회 배치 초기화는 종목이 많으면 프로세스 풀)
+        states = _STOCK_BOOK.sync_many(bars, precompute.init_states)
+        rows = []
+        for t, state in states.items():
+            v = state.values(end_date)
+            rows.append({
+                'ticker': t,
+                'current_price': v['close'],
+                'ath_90d': v['high_window'],
+                'drawdown': v['drawdown_pct'],
+                'rsi': v['rsi']
+            })
+        out = pd.DataFrame(rows, columns=['ticker', 'current_price', 'ath_90d', 'drawdown', 'rsi'])
+        # 다운로드 실패 티커는 결과에서 제외 (개별 조회로 재시도)
+        return out.dropna(subset=['current_price', 'ath_90d']).reset_index(drop=True)
+    except Exception as e:
+        metrics.error(e)
+        return pd.DataFrame()
+
+# 티커별 마지막 정상 행 (조회 실패 시 stale로 대신 보여 줌)
+_LAST_STOCK_ROWS: dict[str, dict] = {}
+
+def fetch_stocks(tickers: tuple) -> pd.DataFrame:
+    """티커 목록 지표 (일괄 조회 + 빠진 티커만 개별 조회, 입력 순서 유지)
+
+    둘 다 실패한 티커는 빠뜨리지 않고 마지막 정상 행(없으면 값이 빈 행)을 stale=True로 넣는다.
+    전부 실패하면 빈 프레임 (Prefetcher가 이전 스냅샷을 stale로 유지).
+    """
+    stock_df = get_stocks_data(tuple(tickers))
+    stock_data = stock_df.to_dict('records') if not stock_df.empty else []
+
+    # 일괄 조회에서 빠진 티커만 개별 조회
+    fetched = {d['ticker'] for d in stock_data}
+    for ticker in tickers:
+        if ticker in fetched:
+            continue
+        data = get_stock_data(ticker)
+        if data:
+            stock_data.append(data)
+
+    if not stock_data:
+        return pd.DataFrame()
+    for d in stock_data:
+        d['stale'] = False
+        _LAST_STOCK_ROWS[d['ticker']] = d
+    fetched = {d['ticker'] for d in stock_data}
+    for ticker in tickers:
+        if ticker not in fetched:
+            stock_data.append({**_LAST_STOCK_ROWS.get(ticker, {'ticker': ticker}), 'stale': True})
+    df = pd.DataFrame(stock_data, columns=['ticker', 'current_price', 'ath_90d', 'drawdown', 'rsi', 'stale'])
+    return compact.shrink(df.sort_values('ticker', key=lambda c: c.map(list(tickers).index)).reset_index(drop=True))
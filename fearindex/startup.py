@@ -0,0 +1,66 @@
+"""시작 비용 측정 (지연 임포트 / 스크립트 구간별 실행 시간)
+
+무거운 데이터 라이브러리(yfinance, FinanceDataReader)는 lazy_import로
+처음 필요한 시점에 불러오고, 그때 걸린 시간을 기록한다. 대시보드를 ?profile=1로 열면
+이번 실행의 구간별 시간과 지금까지의 지연 임포트 비용을 보여 준다.
+
+    python -m fearindex.startup          # 새 인터프리터에서 모듈별 임포트 시간
+"""
+import argparse, importlib, re, subprocess, sys, threading, time
+
+# 스크립트 첫 실행 때 불러오는 모듈 / 처음 필요할 때 불러오는 모듈
+EAGER = ("pandas", "streamlit", "fearindex.sources", "fearindex.prefetch", "fearindex.tables")
+LAZY = ("yfinance", "FinanceDataReader")
+
+# 지연 임포트 기록: 모듈 -> 처음 불러오는 데 걸린 시간 (초)
+imports: dict[str, float] = {}
+_lock = threading.Lock()
+
+def lazy_import(name: str):
+    """모듈을 처음 쓸 때 임포트 (이미 불러온 모듈은 sys.modules에서 바로 반환)"""
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return mod
+    with _lock:
+        t0 = time.perf_counter()
+        mod = importlib.import_module(name)
+        imports.setdefault(name, time.perf_counter() - t0)
+    return mod
+
+class RunTimer:
+    """스크립트 한 번 실행의 구간별 시간 (mark 사이 경과)"""
+
+    def __init__(self):
+        self.t0 = self._last = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+
+    def mark(self, label: str) -> None:
+        now = time.perf_counter()
+        self.marks.append((label, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.t0
+
+def import_cost(module: str, python: str = sys.executable) -> float | None:
+    """새 인터프리터에서 module 임포트 누적 시간 (초, -X importtime 기준)"""
+    out = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        return None
+    m = re.search(r"\|\s*(\d+)\s*\|\s*" + re.escape(module) + r"\s*$", out.stderr.strip().splitlines()[-1])
+    return int(m.group(1)) / 1e6 if m else None
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.startup", description="모듈별 콜드 임포트 시간")
+    parser.add_argument("modules", nargs="*", help="기본: 즉시 임포트 + 지연 임포트 모듈")
+    args = parser.parse_args(argv)
+
+    for group, modules in (("eager", EAGER), ("lazy", LAZY)) if not args.modules else (("", args.modules),):
+        for m in modules:
+            cost = import_cost(m)
+            print(f"{group:<6} {m:<24} {'not installed' if cost is None else f'{cost * 1000:8.1f} ms'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""HTML 표 렌더링 (컬럼 단위 벡터 포맷 + CSS 클래스, 내용 해시 캐시)
+
+셀 문자열을 행 단위 루프 대신 컬럼(Series) 단위로 만들고,
+같은 입력 프레임이면 이전에 만든 HTML을 그대로 돌려준다.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from fearindex import metrics
+
+EMPTY = "—"
+
+# 표/셀 스타일 (페이지 <style>에 한 번만 넣는다)
+CSS = (
+    ".tbl{width:100%;border-collapse:collapse;font-size:16px;border:1px solid #e5e7eb;table-layout:fixed}"
+    ".tbl th{border-bottom:1px solid #e5e7eb;text-align:center;padding:6px 8px}"
+    ".tbl td{padding:6px 8px}"
+    ".tbl .c{text-align:center}.tbl .r{text-align:right}"
+    ".tbl .hl{background:#FFF3C4;border-radius:4px}"
+    ".pos{color:green}.neg{color:red}"
+    ".dd{font-weight:500}.dd1{color:#F8B6AB}.dd2{color:#E76E62}.dd3{color:#DE5143}"
+    ".pill{color:#fff;padding:2px 8px;border-radius:999px;font-size:14px;font-weight:600}"
+    ".fgi-eg{background:#4CB43C}.fgi-g{background:#AEB335}.fgi-n{background:#FDB737}"
+    ".fgi-f{background:#FF9E9E}.fgi-ef{background:#FF8A65}"
+    ".hit{background:#DE5143;color:#fff;padding:2px 8px;border-radius:999px;font-size:12px;font-weight:600;margin-left:4px}"
+    ".badge-block.hit{padding:2px 6px;font-size:10px;margin-left:0}"
+    ".stale{color:#999;font-size:12px;margin-left:4px}"
+)
+
+# 렌더링 결과 캐시 (입력 해시 -> HTML)
+CACHE_SIZE = 128
+_cache: OrderedDict[str, str] = OrderedDict()
+
+def _arr(values) -> np.ndarray:
+    """위치 기준 object 배열 (인덱스 정렬 없이 컬럼끼리 이어 붙이기 위함)"""
+    return np.asarray(values, dtype=object)
+
+def fmt_num(s: pd.Series, spec: str = ".2f") -> pd.Series:
+    """숫자 컬럼 포맷 (NaN은 —)"""
+    s = pd.Series(s, copy=False)
+    out = s.map(("{:" + spec + "}").format, na_action="ignore")
+    return out.fillna(EMPTY).astype(object)
+
+def fmt_date(s: pd.Series, fmt: str = "%y-%m-%d") -> pd.Series:
+    return pd.to_datetime(pd.Series(s, copy=False)).dt.strftime(fmt).fillna(EMPTY).astype(object)
+
+def span_signed_pct(s: pd.Series) -> pd.Series:
+    """부호 색 퍼센트 (양수 pos / 음수 neg / 0은 색 없음)"""
+    v = pd.Series(s, copy=False).astype(float).to_numpy()
+    zero = np.abs(v) < 1e-12
+    text = np.char.mod("%+.2f%%", np.nan_to_num(v))
+    text = np.where(zero, "0.00%", text)
+    cls = np.where(v > 0, " class='pos'", np.where(v < 0, " class='neg'", ""))
+    out = np.char.add(np.char.add(np.char.add("<span", cls), ">"), np.char.add(text, "</span>"))
+    return _arr(np.where(np.isnan(v), f"<span>{EMPTY}</span>", out))
+
+def span_mdd(s: pd.Series) -> pd.Series:
+    """고점 대비 하락률 (음수만 빨강)"""
+    v = pd.Series(s, copy=False).astype(float).to_numpy()
+    zero = np.abs(v) < 1e-12
+    text = np.where(zero, "0.00%", np.char.mod("%.2f%%", np.nan_to_num(v)))
+    cls = np.where((v < 0) & ~zero, " class='neg'", "")
+    out = np.char.add(np.char.add(np.char.add("<span", cls), ">"), np.char.add(text, "</span>"))
+    return _arr(np.where(np.isnan(v), f"<span>{EMPTY}</span>", out))
+
+def td(content, align: str = "c", cls=None) -> np.ndarray:
+    """<td> 셀 컬럼 (align: c/r, cls: 추가 클래스 컬럼 또는 공통 값)"""
+    content = _arr(content)
+    if cls is None:
+        return f"<td class='{align}'>" + content + "</td>"
+    if isinstance(cls, str):
+        return f"<td class='{align} {cls}'>" + content + "</td>"
+    extra = _arr(pd.Series(_arr(cls)).fillna(""))
+    return f"<td class='{align} " + extra + "'>" + content + "</td>"
+
+def table_html(title: str, columns: list[str], cells: list[np.ndarray]) -> str:
+    """셀 컬럼 목록으로 표 HTML 생성"""
+    width = 100 / len(columns)
+    head = "".join(f"<th style='width:{width}%'>{c}</th>" for c in columns)
+    if cells and len(cells[0]):
+        rows = cells[0]
+        for c in cells[1:]:
+            rows = rows + c
+        body = "<tr>" + "</tr><tr>".join(rows) + "</tr>"
+    else:
+        body = ""
+    return (f"<div><div class='card-title'>{title}</div><table class='tbl'>"
+            f"<thead><tr>{head}</tr></thead><tbody>{body}</tbody></table></div>")
+
+def frame_key(df: pd.DataFrame, *extra) -> str:
+    """프레임 내용 해시 (값 + 인덱스 + 컬럼명 + 추가 인자)"""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(repr((list(df.columns), extra)).encode())
+    return h.hexdigest()
+
+@metrics.timed()
+def cached_table(title: str, columns: list[str], df: pd.DataFrame,
+                 build: Callable[..., list[np.ndarray]], *extra) -> str:
+    """내용이 같은 프레임이면 이전 HTML 재사용
+
+    build(df, *extra)는 셀 컬럼 목록을 만든다. extra도 캐시 키에 포함된다.
+    """
+    key = frame_key(df, title, columns, getattr(build, "__qualname__", ""), *extra)
+    html = _cache.get(key)
+    if html is not None:
+        _cache.move_to_end(key)
+        metrics.note(cache="hit")
+        return html
+    metrics.note(cache="miss")
+    html = table_html(title, columns, build(df, *extra))
+    _cache[key] = html
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return html
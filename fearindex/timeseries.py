@@ -0,0 +1,165 @@
+"""날짜 인덱스 시계열 저장소 (SQLite, (이름, 날짜) 클러스터드 기본키)
+
+FGI / VIX / 종가 히스토리를 날짜별 한 행으로 보관한다. 새 점은 마지막 날짜 이후만 추가하고
+(마지막 날짜는 장중 값이 바뀔 수 있어 덮어쓴다), 조회는 기본키 범위 검색이라
+"2020년 이후 FGI ≤ 24인 날"과 그 뒤 N거래일 수익률 같은 분석이 전체 재다운로드 없이 끝난다.
+
+    python -m fearindex.timeseries backfill QQQM ^VIX --start 2011-01-01
+    python -m fearindex.timeseries fear --le 24 --since 2020-01-01
+"""
+import argparse, datetime, os, sqlite3, threading
+from pathlib import Path
+
+import pandas as pd
+
+TS_PATH = os.environ.get("FEAR_INDEX_TS", os.path.join(Path(__file__).resolve().parent.parent, ".cache", "timeseries.db"))
+
+# 선행 수익률 기본 구간 (거래일)
+HORIZONS = (5, 20, 60)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,  -- YYYY-MM-DD
+    value REAL NOT NULL,
+    PRIMARY KEY (name, date)
+) WITHOUT ROWID
+"""
+
+def _date_str(d) -> str:
+    return pd.Timestamp(d).strftime("%Y-%m-%d")
+
+class TimeSeriesStore:
+    def __init__(self, path: str | os.PathLike = TS_PATH):
+        if str(path) != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def last_date(self, name: str) -> str | None:
+        with self._lock:
+            return self._conn.execute("SELECT MAX(date) FROM points WHERE name = ?", (name,)).fetchone()[0]
+
+    def stats(self, names: list[str]) -> dict[str, tuple[int, str | None, float]]:
+        """이름별 (행 수, 마지막 날짜, 값 합계) - 내용 변경 여부 확인용"""
+        marks = ", ".join("?" * len(names))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT name, COUNT(*), MAX(date), TOTAL(value) FROM points WHERE name IN ({marks}) GROUP BY name",
+                names).fetchall()
+        found = {r[0]: tuple(r[1:]) for r in rows}
+        return {n: found.get(n, (0, None, 0.0)) for n in names}
+
+    def _upsert(self, name: str, s: pd.Series) -> int:
+        s = s.dropna()
+        rows = [(name, _date_str(d), float(v)) for d, v in s.items()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO points (name, date, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name, date) DO UPDATE SET value=excluded.value", rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def append(self, name: str, s: pd.Series) -> int:
+        """마지막 저장 날짜 이후 점만 추가 (마지막 날짜 값은 갱신) -> 기록한 행 수"""
+        last = self.last_date(name)
+        if last is not None:
+            s = s[pd.to_datetime(s.index) >= pd.Timestamp(last)]
+        return self._upsert(name, s)
+
+    def backfill(self, name: str, s: pd.Series) -> int:
+        """과거 구간 전체 기록 (겹치는 날짜는 덮어씀)"""
+        return self._upsert(name, s)
+
+    def range(self, name: str, start=None, end=None) -> pd.Series:
+        """[start, end] 구간 Series (날짜 인덱스)"""
+        q, args = "SELECT date, value FROM points WHERE name = ?", [name]
+        if start is not None:
+            q += " AND date >= ?"; args.append(_date_str(start))
+        if end is not None:
+            q += " AND date <= ?"; args.append(_date_str(end))
+        with self._lock:
+            rows = self._conn.execute(q + " ORDER BY date", args).fetchall()
+        idx = pd.to_datetime([r[0] for r in rows])
+        return pd.Series([r[1] for r in rows], index=idx, name=name, dtype=float)
+
+    def where(self, name: str, lo: float | None = None, hi: float | None = None, since=None) -> pd.Series:
+        """값이 [lo, hi] 안에 드는 날 (since 이후)"""
+        q, args = "SELECT date, value FROM points WHERE name = ?", [name]
+        if since is not None:
+            q += " AND date >= ?"; args.append(_date_str(since))
+        if lo is not None:
+            q += " AND value >= ?"; args.append(lo)
+        if hi is not None:
+            q += " AND value <= ?"; args.append(hi)
+        with self._lock:
+            rows = self._conn.execute(q + " ORDER BY date", args).fetchall()
+        return pd.Series([r[1] for r in rows], index=pd.to_datetime([r[0] for r in rows]), name=name, dtype=float)
+
+    def forward_returns(self, signal: str, price: str, lo: float | None = None, hi: float | None = None,
+                        since=None, horizons: tuple[int, ...] = HORIZONS) -> pd.DataFrame:
+        """signal 값이 [lo, hi]인 날의 price 종가와 h거래일 뒤 수익률(%)
+
+        같은 날짜의 price 종가가 없는 날은 제외한다. 아직 h거래일이 지나지 않았으면 NaN.
+        """
+        leads = ", ".join(f"LEAD(value, {int(h)}) OVER (ORDER BY date) AS f{int(h)}" for h in horizons)
+        rets = ", ".join(f"(px.f{int(h)} / px.close - 1) * 100" for h in horizons)
+        q = (f"WITH px AS (SELECT date, value AS close, {leads} FROM points WHERE name = ?) "
+             f"SELECT s.date, s.value, px.close, {rets} FROM points s JOIN px ON px.date = s.date "
+             f"WHERE s.name = ?")
+        args: list = [price, signal]
+        if since is not None:
+            q += " AND s.date >= ?"; args.append(_date_str(since))
+        if lo is not None:
+            q += " AND s.value >= ?"; args.append(lo)
+        if hi is not None:
+            q += " AND s.value <= ?"; args.append(hi)
+        with self._lock:
+            rows = self._conn.execute(q + " ORDER BY s.date", args).fetchall()
+        cols = [signal, price] + [f"{h}d_%" for h in horizons]
+        df = pd.DataFrame([r[1:] for r in rows], columns=cols, dtype=float)
+        df.index = pd.to_datetime([r[0] for r in rows])
+        return df
+
+# 프로세스 공용 저장소 (첫 사용 시 연결)
+_store: TimeSeriesStore | None = None
+_store_lock = threading.Lock()
+
+def default_store() -> TimeSeriesStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TimeSeriesStore(TS_PATH)
+        return _store
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fearindex.timeseries", description="시계열 저장소 백필 / 조회")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("backfill", help="종가 히스토리 백필 (Yahoo)")
+    b.add_argument("tickers", nargs="+")
+    b.add_argument("--start", default="2011-01-01")
+    f = sub.add_parser("fear", help="FGI 구간 날짜와 이후 수익률")
+    f.add_argument("--le", type=float, default=24)
+    f.add_argument("--since", default="2020-01-01")
+    f.add_argument("--price", default="QQQM")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "backfill":
+        from fearindex import sources
+        for t in args.tickers:
+            print(t, sources.backfill_history(t, datetime.date.fromisoformat(args.start)))
+    else:
+        df = default_store().forward_returns("fgi", args.price, hi=args.le, since=args.since)
+        print(df.to_string())
+        print(df.iloc[:, 2:].describe().loc[["count", "mean", "50%"]].round(2).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""대시보드 공용 표시 도우미 (스크립트 재실행마다 다시 정의하지 않도록 모듈로 분리)"""
+import zoneinfo
+from datetime import timedelta
+
+import streamlit as st
+
+from fearindex import tables
+
+KST = zoneinfo.ZoneInfo("Asia/Seoul")
+
+CSS = (
+    "<style>.grid{display:grid;grid-template-columns:1fr;gap:12px}"
+    "@media (min-width: 768px) {.grid{grid-template-columns:repeat(3,1fr)}}"
+    ".card{background:#eee;border:1px solid #e5e7eb;border-radius:16px;padding:10px 20px}"
+    ".card-title{font-weight:600;font-size:20px;color:#444}"
+    ".card-value{font-weight:700;font-size:32px}"
+    ".desktop-inline{display:inline}"
+    ".mobile-block{display:none}"
+    ".badge-inline{display:inline}"
+    ".badge-block{display:none}"
+    "@media (max-width: 767px) {"
+    ".desktop-inline{display:none}"
+    ".mobile-block{display:block}"
+    ".badge-inline{display:none}"
+    ".badge-block{display:block;margin-top:2px}"
+    "}"
+    + tables.CSS +
+    "</style>"
+)
+
+def age_str(age: timedelta) -> str:
+    minutes = int(age.total_seconds() // 60)
+    if minutes < 60:
+        return f"{minutes}분 전"
+    if minutes < 60 * 24:
+        return f"{minutes // 60}시간 전"
+    return f"{minutes // (60 * 24)}일 전"
+
+def as_of_str(*entries) -> str:
+    """스냅샷 기준 시각 (가장 오래된 항목 기준, 갱신 실패 중이면 경과 시간 표시)"""
+    if not entries:
+        return "—"
+    oldest = min(entries, key=lambda e: e.as_of)
+    out = oldest.as_of.astimezone(KST).strftime("%m-%d %H:%M KST")
+    stale = [e for e in entries if e.stale]
+    if stale:
+        out += f" · ⚠ 갱신 실패, {age_str(max(e.age for e in stale))} 데이터"
+    return out
+
+def render_table(title, columns, df, build, *extra):
+    """표 렌더링 (입력 내용이 같으면 캐시된 HTML 재사용)"""
+    st.markdown(tables.cached_table(title, columns, df, build, *extra), unsafe_allow_html=True)
@@ -0,0 +1,80 @@
+"""임계값 알림(alerts): 발생/해제 히스테리시스가 재시작 후에도 유지되는지"""
+import datetime
+
+import pandas as pd
+
+from fearindex import alerts, config, prefetch
+
+CFG = config.Config(etfs=(("379810", "KODEX 미국나스닥100"),), dca_rules={"GEV": ("-10%", "-15%")})
+T0 = datetime.datetime(2026, 10, 16, 20, 0, tzinfo=datetime.timezone.utc)
+
+class Feed:
+    """항목마다 as_of를 1분씩 늘려 on_update 호출"""
+    def __init__(self):
+        self.n = 0
+
+    def __call__(self, engine: alerts.AlertEngine, key: str, value, **kw) -> list[alerts.Event]:
+        self.n += 1
+        return engine.on_update(key, prefetch.Entry(value, T0 + datetime.timedelta(minutes=self.n), **kw))
+
+def fgi(v: int) -> pd.DataFrame:
+    return pd.DataFrame({"날짜": [pd.Timestamp("2026-10-16")], "FGI": [v]})
+
+def etf(mdd: float) -> tuple:
+    return pd.DataFrame({"Close": [100.0], "MDD_%": [mdd]}), None, None, None
+
+def stocks(dd: float, stale: bool = False) -> pd.DataFrame:
+    return pd.DataFrame({"ticker": ["GEV"], "drawdown": [dd], "stale": [stale]})
+
+def rules(events: list[alerts.Event]) -> list[tuple[str, int]]:
+    return [(e.rule, e.level) for e in events]
+
+def test_fgi_fires_once_and_clears_silently(tmp_path):
+    feed, engine = Feed(), alerts.AlertEngine(tmp_path / "a.db", CFG)
+    assert rules(feed(engine, "fgi", fgi(30))) == []
+    assert rules(feed(engine, "fgi", fgi(20))) == [("fgi", 1)]
+    assert feed(engine, "fgi", fgi(18)) == []   # 같은 단계 유지
+    assert feed(engine, "fgi", fgi(40)) == []   # 해제는 조용히
+    assert rules(feed(engine, "fgi", fgi(22))) == [("fgi", 1)]
+    assert len(engine.events()) == 2
+
+def test_state_survives_restart(tmp_path):
+    db, feed = tmp_path / "a.db", Feed()
+    engine = alerts.AlertEngine(db, CFG)
+    assert rules(feed(engine, "fgi", fgi(20))) == [("fgi", 1)]
+    assert rules(feed(engine, "etf:379810", etf(-12.0))) == [("etf:379810", 2)]
+
+    # 재시작: 이미 발생한 단계는 다시 울리지 않음
+    engine = alerts.AlertEngine(db, CFG)
+    assert feed(engine, "fgi", fgi(19)) == []
+    assert feed(engine, "etf:379810", etf(-11.0)) == []
+    # 해제 / 한 단계 완화도 상태로 남음
+    assert feed(engine, "fgi", fgi(35)) == []
+    assert feed(engine, "etf:379810", etf(-7.0)) == []
+
+    engine = alerts.AlertEngine(db, CFG)
+    assert dict(zip(engine.state()["rule"], engine.state()["level"])) == {"fgi": 0, "etf:379810": 1}
+    assert rules(feed(engine, "fgi", fgi(24))) == [("fgi", 1)]
+    assert rules(feed(engine, "etf:379810", etf(-10.0))) == [("etf:379810", 2)]
+    assert rules(feed(engine, "etf:379810", etf(-16.0))) == [("etf:379810", 3)]
+
+def test_step1_ignores_stale_rows_and_bad_entries(tmp_path):
+    feed, engine = Feed(), alerts.AlertEngine(tmp_path / "a.db", CFG)
+    assert rules(feed(engine, "stocks:GEV", stocks(-11.0))) == [("step1:GEV", 1)]
+    # 조회 실패 행(빈 값)으로 발생 중인 알림이 해제되지 않음
+    assert feed(engine, "stocks:GEV", stocks(float("nan"), stale=True)) == []
+    assert feed(engine, "stocks:GEV", stocks(-3.0), stale=True) == []
+    assert feed(engine, "stocks:GEV", stocks(-3.0), error="TimeoutError") == []
+    assert engine.state().set_index("rule")["level"]["step1:GEV"] == 1
+
+def test_same_entry_is_evaluated_once(tmp_path):
+    engine = alerts.AlertEngine(tmp_path / "a.db", CFG)
+    entry = prefetch.Entry(fgi(10), T0)
+    assert rules(engine.on_update("fgi", entry)) == [("fgi", 1)]
+    assert engine.on_update("fgi", entry) == []
+
+def test_step1_threshold_change_reevaluates(tmp_path):
+    feed, engine = Feed(), alerts.AlertEngine(tmp_path / "a.db", CFG)
+    assert feed(engine, "stocks:GEV", stocks(-9.0)) == []
+    engine.set_config(config.Config(etfs=CFG.etfs, dca_rules={"GEV": ("-8%", "-12%")}))
+    assert rules(feed(engine, "stocks:GEV", stocks(-9.0))) == [("step1:GEV", 1)]
@@ -0,0 +1,70 @@
+"""물타기 기준 백테스트(backtest): 손으로 계산한 작은 시계열로 체결 규칙 / 평균 단가 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from fearindex import backtest
+
+# 고점 100 유지, 하락률 = 종가 - 100 (%)
+CLOSE = [100.0, 95.0, 89.0, 100.0, 88.0, 85.0, 100.0]
+
+def bars(close, start="2026-01-05") -> pd.DataFrame:
+    idx = pd.date_range(start, periods=len(close), freq="D")
+    return pd.DataFrame({"Close": close, "High": close}, index=idx)
+
+def row(result: pd.DataFrame, ticker: str, step1: float, step2: float) -> pd.Series:
+    r = result[(result["ticker"] == ticker) & (result["step1"] == step1) & (result["step2"] == step2)]
+    assert len(r) == 1
+    return r.iloc[0]
+
+def test_fills_on_new_crossings_only():
+    result = backtest.sweep({"A": bars(CLOSE)}, [(-10.0, -14.0), (-5.0, -14.0)], horizons=(1,), workers=1)
+    r = row(result, "A", -10.0, -14.0)
+    # -10%: 89(새로 밑돎), 88(다시 밑돎) 체결, 85는 전날도 기준 아래라 제외 / -14%: 85
+    assert (r["fills1"], r["fills2"], r["fills"]) == (2, 1, 3)
+    r = row(result, "A", -5.0, -14.0)
+    # -5%: 95, 88 체결 (89는 전날 95가 이미 기준 아래)
+    assert (r["fills1"], r["fills2"]) == (2, 1)
+
+def test_average_cost_is_harmonic_mean_of_fill_prices():
+    result = backtest.sweep({"A": bars(CLOSE)}, [(-10.0, -14.0)], horizons=(1,), workers=1)
+    r = row(result, "A", -10.0, -14.0)
+    # 같은 금액 매수 -> 체결가 89, 88, 85의 조화평균
+    avg = 3 / (1 / 89 + 1 / 88 + 1 / 85)
+    assert r["avg_cost"] == pytest.approx(avg)
+    assert r["last"] == 100.0
+    assert r["pnl_%"] == pytest.approx((100 / avg - 1) * 100)
+    # 1거래일 뒤 수익률: 89->100, 88->85, 85->100
+    assert r["1d_%"] == pytest.approx(np.mean([100 / 89 - 1, 85 / 88 - 1, 100 / 85 - 1]) * 100)
+
+def test_no_fill_leaves_cost_empty():
+    result = backtest.sweep({"A": bars(CLOSE)}, [(-20.0, -30.0)], horizons=(1,), workers=1)
+    r = row(result, "A", -20.0, -30.0)
+    assert r["fills"] == 0
+    assert np.isnan(r["avg_cost"]) and np.isnan(r["pnl_%"])
+
+def test_high_window_expires():
+    # 100 뒤 80 유지: HIGH_DAYS 동안은 -20%, 고점이 구간을 벗어나면 0%
+    close = [100.0] + [80.0] * (backtest.HIGH_DAYS + 5)
+    close, high = backtest._frames({"A": bars(close)})
+    dd = backtest.drawdown(close, high)["A"].to_numpy()
+    assert dd[backtest.HIGH_DAYS - 1] == pytest.approx(-20.0)
+    assert dd[backtest.HIGH_DAYS + 1] == 0.0
+
+def test_late_listing_and_evaluate_rules():
+    late = bars([50.0, 44.0, 50.0], start="2026-01-08")
+    result = backtest.sweep({"A": bars(CLOSE), "B": late}, [(-10.0, -14.0), (-5.0, -14.0)], horizons=(1,), workers=1)
+    # B는 상장 전 NaN 구간에서 체결 없음, 44(-12%)만 체결
+    assert row(result, "B", -10.0, -14.0)["fills"] == 1
+    picked = backtest.evaluate_rules(result, {"A": ("-5%", "-14%"), "B": ("-10%", "-14%")})
+    assert sorted(zip(picked["ticker"], picked["step1"])) == [("A", -5.0), ("B", -10.0)]
+
+def test_chunked_pool_matches_single_process(monkeypatch):
+    rng = np.random.default_rng(0)
+    data = {f"T{i}": bars(list(100 * np.exp(np.cumsum(rng.normal(0, 0.03, 200))))) for i in range(4)}
+    pairs = [(-5.0, -10.0), (-10.0, -20.0)]
+    single = backtest.sweep(data, pairs, horizons=(5,), workers=1)
+    monkeypatch.setattr(backtest, "CHUNK", 2)
+    pooled = backtest.sweep(data, pairs, horizons=(5,), workers=2)
+    pd.testing.assert_frame_equal(single.sort_values(["ticker", "step1"]).reset_index(drop=True),
+                                  pooled.sort_values(["ticker", "step1"]).reset_index(drop=True))
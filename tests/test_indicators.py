@@ -0,0 +1,74 @@
+"""증분 지표 엔진(indicators)과 pandas 배치 계산(get_stock_data / ma_daily) 비교"""
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fearindex import indicators
+from fearindex.sources import calculate_rsi
+
+# 합산 순서 차이(ulp) 수준 허용 오차
+RTOL = 1e-12
+
+NOW = datetime.datetime(2026, 10, 16, 16, 0)
+
+def bars(n: int = 150, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=NOW.date(), periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({"Close": close, "High": close * (1 + np.abs(rng.normal(0, 0.01, n)))}, index=idx)
+
+def batch(df: pd.DataFrame, now: datetime.datetime) -> dict:
+    close = df["Close"]
+    high = df["High"][df.index >= pd.Timestamp(now) - pd.Timedelta(days=90)].max()
+    return {
+        "close": close.iloc[-1],
+        "ath": close.cummax().iloc[-1],
+        "high_window": high,
+        "drawdown_pct": (close.iloc[-1] - high) / high * 100,
+        "rsi": calculate_rsi(close, 14).iloc[-1],
+        "ma5": close.rolling(5).mean().iloc[-1],
+        "ma20": close.rolling(20).mean().iloc[-1],
+    }
+
+def assert_same(state: indicators.TickerState, df: pd.DataFrame, now: datetime.datetime) -> None:
+    got, want = state.values(now), batch(df, now)
+    for k, v in want.items():
+        assert got[k] == pytest.approx(v, rel=RTOL, nan_ok=True), k
+
+@pytest.mark.parametrize("seed", range(5))
+def test_init_matches_batch(seed):
+    df = bars(seed=seed)
+    state = indicators.TickerState(rsi_period=14, high_days=90)
+    state.init(df)
+    assert_same(state, df, NOW)
+
+def test_appended_bars_match_batch():
+    df = bars(seed=7)
+    book = indicators.IndicatorBook(rsi_period=14, high_days=90)
+    book.sync("T", df.iloc[:100])
+    for i in range(101, len(df) + 1):
+        cur = df.iloc[:i]
+        # 장중 값이 먼저 오고 같은 날짜의 확정 값으로 교체
+        intraday = cur.copy()
+        intraday.iloc[-1, intraday.columns.get_loc("Close")] *= 1.03
+        book.sync("T", intraday)
+        state = book.sync("T", cur)
+        assert_same(state, cur, (cur.index[-1] + pd.Timedelta(hours=16)).to_pydatetime())
+
+def test_revised_history_reinitializes():
+    df = bars(seed=3)
+    book = indicators.IndicatorBook(rsi_period=14, high_days=90)
+    book.sync("T", df)
+    # 배당 조정처럼 과거 봉 전체가 바뀐 경우
+    adjusted = df * 0.97
+    assert_same(book.sync("T", adjusted), adjusted, NOW)
+
+def test_short_history_is_nan():
+    df = bars(n=10)
+    state = indicators.TickerState(rsi_period=14, high_days=90)
+    state.init(df)
+    v = state.values(NOW)
+    assert np.isnan(v["ma20"]) and np.isnan(v["rsi"])
+    assert v["ma5"] == pytest.approx(df["Close"].iloc[-5:].mean(), rel=RTOL)
@@ -0,0 +1,89 @@
+"""시장 간 정렬 패널(panel): KRX 휴장일을 건너는 as-of 정렬, 캐시 파일 재사용"""
+import numpy as np
+import pandas as pd
+
+from fearindex import config, market_hours, metrics, panel, timeseries
+
+CFG = config.Config(etfs=(("379810", "KODEX 미국나스닥100"),))
+
+def sessions(market: str, start: str = "2026-09-01", end: str = "2026-10-30") -> pd.DatetimeIndex:
+    return pd.DatetimeIndex([d for d in pd.bdate_range(start, end) if market_hours.is_trading_day(market, d.date())])
+
+def stamp(days: pd.DatetimeIndex) -> pd.Series:
+    """값 = MMDD (정렬 결과에서 어느 날 값인지 바로 보이도록)"""
+    return pd.Series((days.month * 100 + days.day).astype(float), index=days)
+
+def aligned(krx: pd.Series) -> pd.Series:
+    us = sessions("us")
+    frame = pd.DataFrame({"etf": krx})
+    return panel.align({"etf": (frame, "krx")}, us)["etf"]
+
+def test_krx_holidays_carry_last_session():
+    krx = stamp(sessions("krx"))
+    out = aligned(krx)
+    # 추석 연휴(9/24~25): 미국 거래일에는 직전 KRX 세션(9/23) 값
+    assert out["2026-09-24"] == 923 and out["2026-09-25"] == 923
+    # 개천절 대체휴일(10/5) / 한글날(10/9)
+    assert out["2026-10-05"] == 1002 and out["2026-10-09"] == 1008
+    # 같은 날짜 KRX 세션은 미국 마감 전에 끝나므로 그날 값
+    assert out["2026-09-28"] == 928
+
+def test_no_lookahead():
+    krx = stamp(sessions("krx"))
+    out = aligned(krx)
+    # 모든 행의 값은 그 날짜 이전(같은 날 포함) KRX 세션 값
+    picked = pd.to_datetime([f"2026-{int(v) // 100:02d}-{int(v) % 100:02d}" for v in out.to_numpy()])
+    assert (picked <= out.index).all()
+
+def test_us_holiday_is_not_a_row():
+    us = sessions("us")
+    assert pd.Timestamp("2026-09-07") not in us  # Labor Day
+    krx = stamp(sessions("krx"))
+    out = aligned(krx)
+    assert pd.Timestamp("2026-09-07") not in out.index
+    assert out["2026-09-08"] == 908
+
+def test_gap_beyond_fill_days_is_nan():
+    krx = stamp(sessions("krx"))
+    gap = krx[(krx.index < "2026-10-01") | (krx.index > "2026-10-20")]
+    out = aligned(gap)
+    limit = pd.Timestamp("2026-09-30") + pd.Timedelta(days=panel.FILL_DAYS["krx"])
+    held = out["2026-10-01":"2026-10-20"]
+    assert (held[held.index <= limit] == 930).all()
+    assert held[held.index > limit].isna().all()
+
+def _store(tmp_path) -> timeseries.TimeSeriesStore:
+    store = timeseries.TimeSeriesStore(tmp_path / "ts.db")
+    us = sessions("us")
+    rng = np.random.default_rng(0)
+    store.backfill(CFG.qqq, pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(us)))), index=us))
+    store.backfill(CFG.vix, pd.Series(20 + rng.normal(0, 1, len(us)), index=us))
+    store.backfill("fgi", pd.Series(rng.integers(0, 100, len(us)).astype(float), index=us))
+    store.backfill("379810", stamp(sessions("krx")))
+    return store
+
+def _last_call(name: str) -> metrics.Call:
+    return [c for c in metrics.calls() if c.name == name][-1]
+
+def test_load_reuses_cache_and_rebuilds_broken_file(tmp_path):
+    store, path = _store(tmp_path), tmp_path / "panel.parquet"
+    first = panel.load(CFG, store, path=path)
+    assert _last_call("panel_load").cache == "miss"
+    assert first.loc["2026-09-25", "etf_379810_close"] == 923
+
+    again = panel.load(CFG, store, path=path)
+    assert _last_call("panel_load").cache == "hit"
+    pd.testing.assert_frame_equal(first, again, check_freq=False)
+
+    path.write_bytes(b"not parquet")
+    rebuilt = panel.load(CFG, store, path=path)
+    call = _last_call("panel_load")
+    assert call.cache == "miss" and call.error is not None
+    pd.testing.assert_frame_equal(first, rebuilt, check_freq=False)
+
+def test_mixed_index_resolution():
+    # 저장소(us 해상도)와 다른 소스(ns 해상도)가 섞여도 같은 정렬
+    krx = stamp(sessions("krx"))
+    gap = krx[(krx.index < "2026-10-01") | (krx.index > "2026-10-20")]
+    ns = gap.set_axis(gap.index.as_unit("ns"))
+    pd.testing.assert_series_equal(aligned(gap), aligned(ns))
@@ -0,0 +1,71 @@
+"""지표 선계산 풀(precompute): Arrow 왕복, 풀 초기화 = 순차 초기화, 실패 묶음 대체"""
+import datetime
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fearindex import indicators, precompute
+
+NOW = datetime.datetime(2026, 10, 16, 16, 0)
+KWARGS = {"rsi_period": 14, "high_days": 90}
+
+def bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({"Close": close, "High": close * 1.01}, index=pd.bdate_range(end=NOW.date(), periods=n))
+
+def universe(n: int = 6) -> dict[str, pd.DataFrame]:
+    return {f"T{i}": bars(60 + 10 * i, i) for i in range(n)}
+
+def assert_same_states(a: dict, b: dict) -> None:
+    assert a.keys() == b.keys()
+    for t in a:
+        va, vb = a[t].values(NOW), b[t].values(NOW)
+        num = [k for k, v in va.items() if isinstance(v, float)]
+        assert [va[k] for k in num] == pytest.approx([vb[k] for k in num], rel=1e-12, nan_ok=True), t
+        assert {k: v for k, v in va.items() if k not in num} == {k: v for k, v in vb.items() if k not in num}, t
+
+def test_arrow_round_trip():
+    data = universe(3)
+    data["T1"].iloc[5, 0] = np.nan  # 결측 종가는 빠진다
+    data["C"] = data["T2"][["Close"]]  # 고가 없는 프레임은 종가로 대체
+    out = precompute.from_arrow(precompute.to_arrow(data))
+    assert list(out) == list(data)
+    dates, close, high = out["T1"]
+    assert len(close) == len(data["T1"]) - 1
+    np.testing.assert_array_equal(dates, data["T1"]["Close"].dropna().index.to_numpy())
+    np.testing.assert_array_equal(out["C"][2], data["C"]["Close"].to_numpy())
+
+def test_pool_matches_in_process(monkeypatch):
+    data = universe()
+    local = precompute.init_states(data, KWARGS)
+    monkeypatch.setattr(precompute, "PARALLEL_MIN", 0)
+    monkeypatch.setattr(precompute, "WORKERS", 2)
+    monkeypatch.setattr(precompute, "CHUNK", 2)
+    monkeypatch.setattr(precompute, "_pool", None)
+    try:
+        pooled = precompute.init_states(data, KWARGS)
+    finally:
+        if precompute._pool is not None:
+            precompute._pool.shutdown()
+    assert_same_states(local, pooled)
+
+class _FailingPool:
+    def submit(self, fn, *args):
+        fut = Future()
+        fut.set_exception(RuntimeError("worker died"))
+        return fut
+
+def test_failed_chunk_falls_back_to_sequential(monkeypatch, caplog):
+    data = universe()
+    expected = precompute.init_states(data, KWARGS)
+    monkeypatch.setattr(precompute, "PARALLEL_MIN", 0)
+    monkeypatch.setattr(precompute, "WORKERS", 2)
+    monkeypatch.setattr(precompute, "_get_pool", lambda: _FailingPool())
+    book = indicators.IndicatorBook(**KWARGS)
+    with caplog.at_level("WARNING", logger="fearindex.precompute"):
+        states = book.sync_many(data, precompute.init_states)
+    assert "RuntimeError" in caplog.text
+    assert_same_states(states, expected)
@@ -0,0 +1,56 @@
+"""선조회 스케줄러(prefetch): 멈춘 조회가 공용 풀을 막지 않는지"""
+import threading, time
+
+import pandas as pd
+
+from fearindex import market_hours, orchestrator, prefetch
+
+def test_hung_fetch_is_not_resubmitted():
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(10)
+        return pd.DataFrame({"Close": [1.0]})
+
+    p = prefetch.Prefetcher(idle_ttl=None)
+    p.register("hung", hung, market_hours.DAILY_US, default="기본값", timeout=0.05)
+    try:
+        # 풀 크기보다 많이 재실행해도 막힌 조회는 하나뿐
+        for _ in range(orchestrator._POOL._max_workers * 2):
+            entry = p.get("hung")
+            assert entry.value == "기본값" and entry.error == "TimeoutError"
+            p.ensure()
+        assert len(calls) == 1
+        # 풀이 막히지 않았으면 새 작업은 바로 끝난다
+        p.register("fast", lambda: pd.DataFrame({"Close": [2.0]}), market_hours.DAILY_US, timeout=2)
+        assert p.get("fast").value["Close"].iloc[0] == 2.0
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while "hung" not in p.snapshot() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert p.get("hung").value["Close"].iloc[0] == 1.0
+    assert len(calls) == 1
+
+def test_concurrent_ensure_fetches_once():
+    gate = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        gate.wait(5)
+        return pd.DataFrame({"Close": [3.0]})
+
+    p = prefetch.Prefetcher(idle_ttl=None)
+    p.register("slow", slow, market_hours.DAILY_US, timeout=5)
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(p.get("slow"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert [e.value["Close"].iloc[0] for e in out] == [3.0] * 4
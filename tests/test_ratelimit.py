@@ -0,0 +1,91 @@
+"""업스트림 호출 한도(ratelimit): 토큰 충전, 우선순위 순서, 적응형 속도, 중복 요청 합치기"""
+import threading, time, types
+
+import pytest
+
+from fearindex import ratelimit
+
+class Clock:
+    """Bucket이 보는 time.monotonic 대역"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def test_refill_rate_and_burst_cap(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    b = ratelimit.Bucket("t", ratelimit.Limit(10.0, 2))
+    assert b.acquire() == 0 and b.acquire() == 0
+    with pytest.raises(ratelimit.RateLimited):
+        b.acquire(timeout=0)
+    clock.now += 0.1  # 10/초 -> 토큰 1개
+    assert b.acquire(timeout=0) == 0
+    clock.now += 60   # 오래 쉬어도 burst까지만
+    assert b.stats()["tokens"] == 2
+    # 버킷보다 큰 요청은 가득 찼을 때 보내고 빚으로 남는다
+    b.acquire(cost=5, timeout=0)
+    assert b.stats()["tokens"] == -3
+    clock.now += 0.5
+    assert b.stats()["tokens"] == 2
+    assert b.counts["requests"] == 4 and b.counts["timeouts"] == 1
+
+def test_waiters_served_by_priority_then_arrival():
+    b = ratelimit.Bucket("t", ratelimit.Limit(10.0, 1))
+    b.acquire()
+    # 잠시 멈춤(속도 절반 -> 토큰 간격 0.2초) 동안 대기열을 채운다
+    b.feedback("throttled", retry_after=0.3)
+    order, threads = [], []
+    arrivals = [("bg", ratelimit.BACKGROUND), ("t1", ratelimit.TABLES), ("cards", ratelimit.CARDS), ("t2", ratelimit.TABLES)]
+    for name, level in arrivals:
+        t = threading.Thread(target=lambda n=name, lv=level: (b.acquire(priority=lv, timeout=5), order.append(n)))
+        t.start()
+        threads.append(t)
+        deadline = time.monotonic() + 1
+        while len(b._waiters) < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.001)
+    assert len(b._waiters) == 4
+    for t in threads:
+        t.join()
+    assert order == ["cards", "t1", "t2", "bg"]
+
+def test_adaptive_rate_bounds():
+    limit = ratelimit.Limit(4.0, 4)
+    b = ratelimit.Bucket("t", limit)
+    for _ in range(100):
+        b.feedback("ok")
+    assert b.rate == limit.rate * 2
+    b.feedback("throttled", retry_after=0)
+    assert b.rate == limit.rate
+    b.feedback("empty")
+    assert b.rate == pytest.approx(limit.rate * ratelimit.EMPTY_DECREASE)
+    for _ in range(20):
+        b.feedback("throttled", retry_after=0)
+    assert b.rate == limit.rate * ratelimit.MIN_FRACTION
+    assert b.counts["throttled"] == 21 and b.counts["empty"] == 1
+
+def test_coalesce_runs_once():
+    gate, calls, out = threading.Event(), [], []
+
+    def fetch():
+        calls.append(1)
+        gate.wait(5)
+        return "value"
+
+    threads = [threading.Thread(target=lambda: out.append(ratelimit.coalesce(("test-coalesce", "K"), fetch)))
+               for _ in range(3)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 1
+    while ratelimit.bucket("test-coalesce").counts["coalesced"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert calls == [1] and out == ["value"] * 3
+
+def test_parse():
+    assert ratelimit.parse("yahoo=5/20, krx=2.5") == {"yahoo": ratelimit.Limit(5.0, 20), "krx": ratelimit.Limit(2.5, 3)}
+    with pytest.raises(ValueError):
+        ratelimit.parse("yahoo=fast")